@@ -40,10 +40,12 @@ class AvotBase:
         avot_id: str,
         header: Dict[str, Any],
         registry_entry: Dict[str, Any],
+        aggregates: Optional[Any] = None,
     ):
         self.avot_id = avot_id
         self.header = header
         self.registry_entry = registry_entry
+        self.aggregates = aggregates  # e.g. a SignalAggregates counting emitted signals
 
     # --- Identity & State ---
 
@@ -121,15 +123,19 @@ class AvotBase:
     ) -> Dict[str, Any]:
         """
         Emit a non-binding signal.
-        This implementation simply returns the signal object.
+        This implementation returns the signal object, after counting it
+        in ``aggregates`` when one was given.
         Adapters may persist or forward it.
         """
-        return {
+        signal = {
             "avot_id": self.avot_id,
             "signal_type": signal_type,
             "payload": payload or {},
             "timestamp": datetime.utcnow().isoformat() + "Z",
         }
+        if self.aggregates is not None:
+            self.aggregates.observe(signal)
+        return signal
 
     # --- Guarded Attempt Helper ---
 
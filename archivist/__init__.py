@@ -0,0 +1,6 @@
+"""Archivist: the repository knowledge index and its search API."""
+from archivist.index_store import open_index
+from archivist.search_index import archival_context, search
+from archivist.vector_index import search as semantic_search
+
+__all__ = ["archival_context", "open_index", "search", "semantic_search"]
@@ -0,0 +1,110 @@
+"""
+Atomic file replacement for the Archivist outputs.
+
+A file is written to a temp file in its target directory and moved into
+place with ``os.replace``, so readers see either the old or the new
+contents, never a partial file. ``tempfile.mkstemp`` creates temp files
+with mode 0600. The replacement therefore takes the mode of the file it
+replaces, or ``DEFAULT_MODE`` for a new file, so the index stays readable
+to other users and services.
+
+Outputs made of several files are built in a fresh generation directory
+(``gen-NNNNNN/``) and published by atomically replacing a ``CURRENT``
+file that names it, so readers never mix files from two builds.
+"""
+import os
+import re
+import shutil
+import stat
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+DEFAULT_MODE = 0o644
+
+CURRENT = "CURRENT"
+GENERATION_PATTERN = re.compile(r"^gen-(\d{6})$")
+KEEP_GENERATIONS = 2
+
+
+def _target_mode(path):
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        return DEFAULT_MODE
+
+
+@contextmanager
+def atomic_path(path):
+    """Yield a temp path next to ``path``; it replaces ``path`` on success."""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        yield tmp
+        os.chmod(tmp, _target_mode(path))
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+@contextmanager
+def atomic_open(path, mode="w"):
+    """Open a temp file for writing; it replaces ``path`` once closed cleanly."""
+    with atomic_path(path) as tmp:
+        with open(tmp, mode) as f:
+            yield f
+
+
+def write_bytes(path, chunks):
+    """Atomically replace ``path`` with the concatenated byte ``chunks``."""
+    with atomic_open(path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+
+def current_generation(directory):
+    """The published generation under ``directory``, or None if there is none."""
+    directory = Path(directory)
+    try:
+        name = (directory / CURRENT).read_text().strip()
+    except OSError:
+        return None
+    return directory / name if GENERATION_PATTERN.match(name) else None
+
+
+def _generations(directory):
+    return sorted(p for p in directory.iterdir() if GENERATION_PATTERN.match(p.name))
+
+
+def new_generation(directory):
+    """Create and claim the next generation directory under ``directory``."""
+    directory = Path(directory)
+    existing = _generations(directory)
+    number = int(GENERATION_PATTERN.match(existing[-1].name).group(1)) + 1 if existing else 1
+    while True:
+        path = directory / f"gen-{number:06d}"
+        try:
+            path.mkdir()
+            return path
+        except FileExistsError:  # a concurrent build claimed it
+            number += 1
+
+
+def publish_generation(directory, generation, legacy=()):
+    """Point ``CURRENT`` at ``generation`` and prune older generations.
+
+    The previous generation is kept for readers still opening it. Files
+    named in ``legacy`` (a flat layout of earlier versions) are removed.
+    """
+    directory = Path(directory)
+    write_bytes(directory / CURRENT, [generation.name.encode()])
+    for old in _generations(directory)[:-KEEP_GENERATIONS]:
+        if old != generation:
+            shutil.rmtree(old, ignore_errors=True)
+    for name in legacy:
+        try:
+            (directory / name).unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,383 @@
+"""
+Archivist content extraction.
+
+Pulls titles, headings, front-matter, Python docstrings and JSON/YAML
+top-level keys out of indexed files and derives a short summary. Files are
+read as streams: markdown and YAML line by line, Python through
+``tokenize``, and JSON through an incremental key scanner. The scan stops
+after ``MAX_SCAN_BYTES``, so large files never load whole.
+
+:func:`extract_many` fans extraction out over a process pool, keeping only
+a bounded number of files in flight. :func:`summarize_with_agent`
+optionally asks AVOT-Archivist for summaries. It sends several files per
+request through the model bridge, so replies are cached by content and
+calls share the rate limiter.
+"""
+import ast
+import json
+import os
+import re
+import tokenize
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - optional dependency
+    yaml = None
+
+MAX_SCAN_BYTES = 256 * 1024
+MAX_HEADINGS = 20
+MAX_KEYS = 30
+SUMMARY_CHARS = 240
+EXCERPT_CHARS = 1200
+PARALLEL_THRESHOLD = 16  # below this, a process pool costs more than it saves
+SUMMARY_SECTIONS = ("summary", "overview", "purpose", "abstract")
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_YAML_KEY = re.compile(r"""^(?:"([^"]+)"|'([^']+)'|([^\s#'"][^:#]*?))\s*:(?:\s|$)""")
+_STATUS = re.compile(r"^\**status\**\s*:\s*\**\s*(.+?)\s*\**$", re.IGNORECASE)
+
+
+def _lines(path, limit=MAX_SCAN_BYTES):
+    """Yield decoded lines from ``path`` until ``limit`` bytes have been read."""
+    read = 0
+    with open(path, "rb") as f:
+        for raw in f:
+            read += len(raw)
+            yield raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            if read >= limit:
+                return
+
+
+def _clip(text, limit=SUMMARY_CHARS):
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    return text[:limit - 1].rsplit(" ", 1)[0] + "…"
+
+
+def _front_matter(lines):
+    """Parse a leading ``---`` block into a dict (YAML when available)."""
+    block = []
+    for line in lines:
+        if line.strip() == "---":
+            break
+        block.append(line)
+    else:
+        return {}
+    text = "\n".join(block)
+    if yaml is not None:
+        try:
+            data = yaml.safe_load(text)
+        except yaml.YAMLError:
+            data = None
+        if isinstance(data, dict):
+            return {str(k): v for k, v in data.items()}
+    data = {}
+    for line in block:
+        key, sep, value = line.partition(":")
+        if sep and key.strip() and not key.startswith(" "):
+            data[key.strip()] = value.strip()
+    return data
+
+
+def extract_markdown(path):
+    lines = _lines(path)
+    info = {"title": None, "headings": [], "front_matter": {}}
+    first = next(lines, None)
+    if first is not None and first.strip() == "---":
+        info["front_matter"] = _front_matter(lines)
+        first = None
+
+    paragraphs = {}  # section heading (lowercase, "" before any) -> first paragraph
+    section, current, in_code = "", [], False
+
+    def close_paragraph():
+        if current and section not in paragraphs:
+            paragraphs[section] = " ".join(current)
+        current.clear()
+
+    for line in ([first] if first is not None else []) + list(lines):
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            in_code = not in_code
+            close_paragraph()
+            continue
+        if in_code:
+            continue
+        match = _HEADING.match(stripped)
+        if match:
+            close_paragraph()
+            level, text = len(match.group(1)), match.group(2)
+            if level == 1 and info["title"] is None:
+                info["title"] = text
+            if len(info["headings"]) < MAX_HEADINGS:
+                info["headings"].append(text)
+            section = text.lower()
+            continue
+        status = _STATUS.match(stripped)
+        if status and "status" not in info:
+            info["status"] = status.group(1)
+        if stripped:
+            current.append(stripped.lstrip("-*> ").strip())
+        else:
+            close_paragraph()
+    close_paragraph()
+
+    front = info["front_matter"]
+    info["title"] = front.get("title") or info["title"]
+    if "status" in front:
+        info["status"] = front["status"]
+    summary = front.get("summary") or front.get("description")
+    if not summary:
+        for name in SUMMARY_SECTIONS:
+            if paragraphs.get(name):
+                summary = paragraphs[name]
+                break
+        else:
+            summary = next((p for s, p in paragraphs.items() if p), "")
+    info["summary"] = _clip(str(summary))
+    return info
+
+
+def extract_python(path):
+    """Module docstring via ``tokenize``, stopping at the first code token."""
+    docstring = None
+    with open(path, "rb") as f:
+        try:
+            for tok in tokenize.tokenize(f.readline):
+                if tok.type in (tokenize.ENCODING, tokenize.COMMENT, tokenize.NL,
+                                tokenize.NEWLINE):
+                    continue
+                if tok.type == tokenize.STRING:
+                    try:
+                        docstring = _literal(tok.string)
+                    except (ValueError, SyntaxError):
+                        docstring = None
+                break
+        except (tokenize.TokenError, SyntaxError):
+            pass
+    info = {"docstring": bool(docstring)}
+    if docstring:
+        first_paragraph = docstring.strip().split("\n\n", 1)[0]
+        info["summary"] = _clip(first_paragraph)
+    else:
+        info["summary"] = "Python module without a docstring."
+    return info
+
+
+def _literal(token):
+    value = ast.literal_eval(token)
+    return value if isinstance(value, str) else None
+
+
+def json_top_level_keys(path, limit=MAX_SCAN_BYTES, max_keys=MAX_KEYS):
+    """Stream ``path`` and return ``(kind, keys)`` for its top-level value.
+
+    ``kind`` is ``"object"``, ``"array"``, ``"scalar"`` or None if empty;
+    keys are collected for objects only.
+    """
+    kind, keys = None, []
+    depth, in_string, escape = 0, False, False
+    token, expect_key, after_colon = [], False, False
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        read = 0
+        while read < limit and len(keys) < max_keys:
+            chunk = f.read(8192)
+            if not chunk:
+                break
+            read += len(chunk)
+            for char in chunk:
+                if in_string:
+                    if escape:
+                        escape = False
+                    elif char == "\\":
+                        escape = True
+                    elif char == '"':
+                        in_string = False
+                        if expect_key:
+                            keys.append("".join(token))
+                            expect_key = False
+                    elif expect_key:
+                        token.append(char)
+                    continue
+                if char.isspace():
+                    continue
+                if kind is None:
+                    kind = {"{": "object", "[": "array"}.get(char, "scalar")
+                    if kind == "scalar":
+                        return kind, keys
+                if char == '"':
+                    in_string = True
+                    # A string directly inside the top-level object, after "{" or ","
+                    expect_key = depth == 1 and kind == "object" and not after_colon
+                    token = []
+                elif char in "{[":
+                    depth += 1
+                elif char in "}]":
+                    depth -= 1
+                elif char == ":" and depth == 1:
+                    after_colon = True
+                elif char == "," and depth == 1:
+                    after_colon = False
+    return kind, keys
+
+
+def extract_json(path):
+    kind, keys = json_top_level_keys(path)
+    info = {"keys": keys}
+    if kind == "object":
+        info["summary"] = _clip("JSON object with keys: " + ", ".join(keys)) if keys else "Empty JSON object."
+    elif kind == "array":
+        info["summary"] = "JSON array."
+    else:
+        info["summary"] = "JSON document."
+    return info
+
+
+def extract_yaml(path):
+    keys = []
+    for line in _lines(path):
+        if not line or line[0] in " \t#-" or line.startswith("---"):
+            continue
+        match = _YAML_KEY.match(line)
+        if match:
+            keys.append(next(g for g in match.groups() if g).strip())
+            if len(keys) >= MAX_KEYS:
+                break
+    summary = "YAML document with keys: " + ", ".join(keys) if keys else "YAML document."
+    return {"keys": keys, "summary": _clip(summary)}
+
+
+EXTRACTORS = {
+    ".md": extract_markdown,
+    ".markdown": extract_markdown,
+    ".py": extract_python,
+    ".json": extract_json,
+    ".yml": extract_yaml,
+    ".yaml": extract_yaml,
+}
+
+
+def extract(path):
+    """Return extracted metadata for ``path`` (always includes ``summary``)."""
+    path = Path(path)
+    extractor = EXTRACTORS.get(path.suffix.lower())
+    if extractor is None:
+        return {"summary": "Unparsed"}
+    try:
+        return extractor(path)
+    except (OSError, UnicodeError) as exc:
+        return {"summary": f"Unreadable: {exc.__class__.__name__}"}
+
+
+def _extract_job(job):
+    rel, full = job
+    return rel, extract(full)
+
+
+def extract_many(root, rel_paths, workers=None):
+    """Extract ``rel_paths`` under ``root``; yields ``(rel_path, info)``.
+
+    Runs inline for small batches and on a process pool otherwise, with at
+    most ``4 * workers`` files in flight so memory stays bounded.
+    """
+    jobs = [(rel, str(Path(root) / rel)) for rel in rel_paths]
+    workers = workers or min(8, os.cpu_count() or 1)
+    if workers <= 1 or len(jobs) < PARALLEL_THRESHOLD:
+        for job in jobs:
+            yield _extract_job(job)
+        return
+
+    window = workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        queue = iter(jobs)
+        for job in queue:
+            pending.add(pool.submit(_extract_job, job))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in pending:
+            yield future.result()
+
+
+def read_excerpt(path, limit=EXCERPT_CHARS):
+    """First ``limit`` characters of ``path`` for agent summaries."""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read(limit)
+
+
+def build_summary_task(items):
+    """Archivist task summarizing ``(path, excerpt)`` items in one request."""
+    sections = "\n\n".join(
+        f"FILE {path}\n{excerpt}" for path, excerpt in items
+    )
+    return {
+        "intent": "index_knowledge",
+        "payload": (
+            "Summarize each file below in one or two sentences for the knowledge index.\n\n"
+            f"{sections}\n\n"
+            'Return a JSON array: [{"path": "<file path>", "summary": "..."}]'
+        ),
+    }
+
+
+def parse_summary_output(raw, paths):
+    """Map paths to summaries from an Archivist reply (missing ones omitted)."""
+    if not isinstance(raw, str):
+        return {}
+    start, end = raw.find("["), raw.rfind("]")
+    if start == -1 or end <= start:
+        return {}
+    try:
+        entries = json.loads(raw[start:end + 1])
+    except ValueError:
+        return {}
+    summaries = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if isinstance(entry, dict) and entry.get("path") in paths and isinstance(entry.get("summary"), str):
+            summaries[entry["path"]] = _clip(entry["summary"])
+    return summaries
+
+
+def summarize_with_agent(root, rel_paths, batch_size=8, concurrency=4):
+    """Ask AVOT-Archivist for summaries of ``rel_paths``; returns ``{path: summary}``.
+
+    Files are sent ``batch_size`` per request with at most ``concurrency``
+    requests in flight. Requests go through the model bridge with caching
+    forced on, so unchanged excerpts are never re-summarized. Files the
+    reply does not cover are left out, and callers keep the extracted
+    summary for them.
+    """
+    import asyncio
+
+    from avot_engine import call_agent_async
+    from core.event_loop import run_sync
+    from core.registry import get_registry
+
+    cfg = get_registry().agent("AVOT-Archivist")
+    if cfg is None or not rel_paths:
+        return {}
+    cfg = dict(cfg, cache=True)
+    batches = [rel_paths[i:i + batch_size] for i in range(0, len(rel_paths), batch_size)]
+
+    async def run():
+        slots = asyncio.Semaphore(concurrency)
+
+        async def one(batch):
+            items = await asyncio.to_thread(
+                lambda: [(rel, read_excerpt(Path(root) / rel)) for rel in batch]
+            )
+            async with slots:
+                raw = await call_agent_async(cfg, build_summary_task(items))
+            return parse_summary_output(raw, set(batch))
+
+        summaries = {}
+        for result in await asyncio.gather(*(one(b) for b in batches)):
+            summaries.update(result)
+        return summaries
+
+    return run_sync(run())
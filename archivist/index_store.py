@@ -0,0 +1,173 @@
+"""
+Archivist index store.
+
+The knowledge index kept in SQLite (``knowledge_index.sqlite``), one row
+per file with the entry stored as compact JSON (minus its ``path``, which
+is the row key). Lookups by path hit the
+primary key. Categories (scrolls, repo_files, tips, decision_logs) are read
+lazily, only when first asked for, and :meth:`IndexStore.iter` streams rows
+without building the whole index in memory. The indexer applies changes
+row by row, so a rescan that touches three files writes three rows. The
+pretty-printed ``knowledge_index.json`` is still produced for
+compatibility (:meth:`IndexStore.export_json`).
+"""
+import json
+import sqlite3
+from pathlib import Path
+
+from archivist.atomic import atomic_open, atomic_path
+
+ROOT = Path(__file__).resolve().parents[1]
+STORE_FILE = ROOT / "archivist" / "knowledge_index.sqlite"
+STORE_VERSION = 1
+FETCH_SIZE = 512
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE entries (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    entry TEXT NOT NULL
+);
+CREATE INDEX entries_kind ON entries (kind);
+"""
+
+
+def _dumps(entry):
+    entry = {k: v for k, v in entry.items() if k != "path"}
+    return json.dumps(entry, separators=(",", ":"), ensure_ascii=False)
+
+
+def _loads(path, text):
+    return {"path": path, **json.loads(text)}
+
+
+def _rows(files, paths):
+    for rel in paths:
+        record = files[rel]
+        yield rel, record["kind"], _dumps(record["entry"])
+
+
+def write_store(files, path=None, kinds=()):
+    """Write a fresh store from manifest records, replacing any old one.
+
+    ``kinds`` lists categories to report even when empty.
+    """
+    with atomic_path(path or STORE_FILE) as tmp:
+        conn = sqlite3.connect(tmp)
+        try:
+            with conn:
+                conn.executescript(_SCHEMA)
+                conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+                    ("version", str(STORE_VERSION)),
+                    ("kinds", json.dumps(list(kinds))),
+                ])
+                conn.executemany("INSERT INTO entries VALUES (?, ?, ?)", _rows(files, sorted(files)))
+        finally:
+            conn.close()
+
+
+def apply_changes(files, changes, path=None):
+    """Upsert added/changed entries and drop removed ones in one transaction."""
+    conn = sqlite3.connect(Path(path or STORE_FILE))
+    try:
+        with conn:
+            conn.executemany("DELETE FROM entries WHERE path = ?",
+                             [(rel,) for rel in changes["removed"]])
+            conn.executemany(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?)",
+                _rows(files, changes["added"] + changes["changed"]),
+            )
+    finally:
+        conn.close()
+
+
+def store_version(path=None):
+    """Version of the store at ``path``, or None if missing or unreadable."""
+    try:
+        with IndexStore(path) as store:
+            return store.version
+    except (OSError, sqlite3.Error):
+        return None
+
+
+class IndexStore:
+    """Read-only view of the index store.
+
+    ``store["scrolls"]`` loads one category on first use and caches it;
+    :meth:`get` and :meth:`iter` never load more than they return.
+    """
+
+    def __init__(self, path=None):
+        path = Path(path or STORE_FILE)
+        if not path.exists():
+            raise FileNotFoundError(f"No index store at {path}")
+        self._conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True,
+                                     check_same_thread=False)
+        meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+        self.version = int(meta.get("version", 0))
+        self._kinds = json.loads(meta.get("kinds", "[]"))
+        self._categories = {}
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def keys(self):
+        stored = [kind for (kind,) in self._conn.execute("SELECT DISTINCT kind FROM entries")]
+        return list(self._kinds) + sorted(set(stored) - set(self._kinds))
+
+    def counts(self):
+        counts = dict.fromkeys(self._kinds, 0)
+        counts.update(self._conn.execute("SELECT kind, COUNT(*) FROM entries GROUP BY kind"))
+        return counts
+
+    def get(self, path):
+        """The entry for ``path`` (posix, relative to the repo), or None."""
+        row = self._conn.execute("SELECT entry FROM entries WHERE path = ?", (path,)).fetchone()
+        return _loads(path, row[0]) if row else None
+
+    def iter(self, kind=None):
+        """Stream entries in path order, optionally for one category."""
+        if kind is None:
+            cursor = self._conn.execute("SELECT path, entry FROM entries ORDER BY path")
+        else:
+            cursor = self._conn.execute(
+                "SELECT path, entry FROM entries WHERE kind = ? ORDER BY path", (kind,)
+            )
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                return
+            for path, entry in rows:
+                yield _loads(path, entry)
+
+    def __getitem__(self, kind):
+        if kind not in self._categories:
+            self._categories[kind] = list(self.iter(kind))
+        return self._categories[kind]
+
+    def __contains__(self, kind):
+        return kind in self.keys()
+
+    def to_dict(self):
+        return {kind: self[kind] for kind in self.keys()}
+
+    def export_json(self, path, indent=2):
+        """Write the classic ``knowledge_index.json`` layout to ``path``."""
+        with atomic_open(path) as f:
+            json.dump(self.to_dict(), f, indent=indent)
+            f.write("\n")
+
+
+def open_index(path=None):
+    """Open the index store for reading (see :class:`IndexStore`)."""
+    return IndexStore(path)
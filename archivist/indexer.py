@@ -2,56 +2,333 @@
 Archivist Indexer
 Scans repo directories for scrolls (.md), code files, and TIPs
 and maintains the lightweight JSON index.
+
+Indexing is incremental. A manifest records the size, mtime and sha256 of
+every indexed file, so a rescan only hashes files whose size or mtime
+moved and only rebuilds entries whose content changed. Ignored directories
+(``IGNORED_DIRS`` and paths matched by ``.gitignore``) are pruned during
+the walk rather than filtered afterwards. Both files are replaced
+atomically. The manifest also records, for each output, the source digest
+it was built from and its own sha256, so a missing, outdated or hand-edited
+output is rebuilt even when no source file changed.
+
+Added and changed files are passed through ``archivist.extract``, which
+summarizes them in parallel. With ``summarize=True``, AVOT-Archivist
+writes the summaries instead. Unchanged files keep the summary stored
+in the manifest.
+
+The BM25 search index (``archivist.search_index``) is stored in a
+``postings/`` directory next to the index, and the chunk embeddings for
+semantic search (``archivist.vector_index``) in ``vectors/``. Both are
+rebuilt whenever the index changes, re-reading only changed files.
+
+The primary index is ``knowledge_index.sqlite`` (``archivist.index_store``).
+Changes are applied to it row by row, and readers open it for lookups by
+path and per-category loading. ``knowledge_index.json`` is still written as
+a compatibility export unless ``export_json=False``.
 """
 import os, json
+import fnmatch
+import hashlib
 from pathlib import Path
 
+from archivist.atomic import atomic_open
+from archivist.extract import extract_many, summarize_with_agent
+from archivist.index_store import STORE_VERSION, apply_changes, store_version, write_store
+from archivist.search_index import build_search_index
+from archivist.vector_index import build_vector_index
+
 ROOT = Path(__file__).resolve().parents[1]
 INDEX_FILE = ROOT / "archivist" / "knowledge_index.json"
+MANIFEST_FILE = ROOT / "archivist" / "index_manifest.json"
+MANIFEST_VERSION = 2
+
+IGNORED_DIRS = {
+    ".git", "artifacts", "__pycache__", "node_modules",
+    ".pytest_cache", ".mypy_cache", ".ruff_cache", ".tox", ".nox", ".venv", "venv",
+}
+INDEX_KINDS = ("scrolls", "repo_files", "decision_logs", "tips")
+HASH_CHUNK = 1 << 20
+
 
-def scan_files():
-    index = {
-        "scrolls": [],
-        "repo_files": [],
-        "decision_logs": [],
-        "tips": []
-    }
+def load_gitignore(root=ROOT):
+    """Parse ``.gitignore`` into ``(pattern, anchored, dir_only)`` rules.
 
-    for path in ROOT.rglob("*"):
-        if not path.is_file():
+    Supports the common subset: globs, leading ``/`` anchors and trailing
+    ``/`` for directories. Negations (``!``) are ignored.
+    """
+    rules = []
+    path = Path(root) / ".gitignore"
+    if not path.exists():
+        return rules
+    for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or line.startswith("!"):
             continue
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        anchored = line.startswith("/") or "/" in line
+        rules.append((line.lstrip("/"), anchored, dir_only))
+    return rules
+
+
+def is_ignored(rel_path, is_dir, rules):
+    """True if ``rel_path`` (posix, relative to ROOT) matches a gitignore rule."""
+    name = rel_path.rsplit("/", 1)[-1]
+    for pattern, anchored, dir_only in rules:
+        if dir_only and not is_dir:
+            continue
+        target = rel_path if anchored else name
+        if fnmatch.fnmatchcase(target, pattern):
+            return True
+    return False
+
+
+def walk_files(root=ROOT, rules=None, skip=()):
+    """Yield ``(rel_path, stat)`` for indexable files, pruning ignored dirs.
+
+    ``skip`` holds absolute file or directory paths to leave out (the
+    index's own outputs).
+    """
+    root = Path(root)
+    rules = load_gitignore(root) if rules is None else rules
+    skip = {Path(p) for p in skip}
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+        rel_dir = "" if rel_dir == "." else rel_dir + "/"
+        dirnames[:] = [
+            d for d in dirnames
+            if d not in IGNORED_DIRS and not is_ignored(rel_dir + d, True, rules)
+            and Path(dirpath) / d not in skip
+        ]
+        for filename in filenames:
+            rel = rel_dir + filename
+            full = Path(dirpath) / filename
+            if full in skip or is_ignored(rel, False, rules):
+                continue
+            try:
+                yield rel, full.stat()
+            except OSError:
+                continue  # vanished or unreadable between listing and stat
+
+
+def classify(rel_path):
+    """Return ``(kind, entry)`` for an indexable path, or None."""
+    path = Path(rel_path)
+
+    if path.suffix == ".md" and "docs" in path.parts:
+        return "scrolls", {
+            "title": path.stem,
+            "path": rel_path,
+            "tags": ["scroll"],
+            "summary": "Unparsed"
+        }
+
+    elif path.suffix in [".py", ".json", ".yml", ".yaml"]:
+        return "repo_files", {
+            "path": rel_path,
+            "language": path.suffix.lstrip("."),
+            "summary": "Unparsed"
+        }
+
+    elif "TIP" in rel_path:
+        return "tips", {
+            "id": path.stem,
+            "path": rel_path,
+            "summary": "Unparsed"
+        }
+
+    return None
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_hash(path):
+    """Content hash of a source file."""
+    return _sha256(path)
+
+
+def read_manifest(path=MANIFEST_FILE):
+    """The whole manifest (``files`` and ``outputs``), or {} if unusable."""
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def load_manifest(path=MANIFEST_FILE):
+    return read_manifest(path).get("files", {})
+
+
+def source_hash(files):
+    """Digest of everything the outputs are built from (content and entries)."""
+    digest = hashlib.sha256()
+    for rel in sorted(files):
+        record = files[rel]
+        digest.update(json.dumps([rel, record["sha256"], record["kind"], record["entry"]],
+                                 sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def output_stale(path, recorded, source):
+    """Whether the output at ``path`` must be rebuilt.
+
+    It must if it is missing, was built from a different source, or was
+    changed on disk since it was written.
+    """
+    if not recorded or recorded.get("source") != source:
+        return True
+    try:
+        return _sha256(path) != recorded.get("sha256")
+    except OSError:
+        return True
+
+
+def write_json_atomic(path, data):
+    """Write ``data`` as JSON to ``path`` via a temp file and ``os.replace``."""
+    with atomic_open(path) as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def enrich(kind, entry, info):
+    """Fold extracted metadata into an index entry of the given kind."""
+    entry = dict(entry, summary=info.get("summary") or entry["summary"])
+    if kind == "scrolls":
+        entry["headings"] = info.get("headings", [])
+        if info.get("front_matter"):
+            entry["front_matter"] = info["front_matter"]
+    elif kind == "tips":
+        entry["title"] = info.get("title") or entry["id"]
+        entry["status"] = info.get("status", "unknown")
+    elif info.get("keys"):
+        entry["keys"] = info["keys"]
+    return entry
+
+
+def build_index(files):
+    """Group manifest records into the index layout, ordered by path."""
+    index = {kind: [] for kind in INDEX_KINDS}
+    for rel in sorted(files):
+        record = files[rel]
+        index[record["kind"]].append(record["entry"])
+    return index
+
+
+def update_index(full=False, root=ROOT, index_file=None, manifest_file=None,
+                 workers=None, summarize=False, search_dir=None, vector_dir=None,
+                 store_file=None, export_json=True):
+    """Bring the index up to date; returns ``(index, changes)``.
+
+    ``changes`` lists ``added``, ``changed`` and ``removed`` paths plus the
+    number of ``unchanged`` files. With ``full=True`` the manifest is
+    ignored and every file is rehashed. Only added and changed files are
+    extracted, on up to ``workers`` processes.
+    """
+    index_file = Path(index_file or INDEX_FILE)
+    manifest_file = Path(manifest_file or MANIFEST_FILE)
+    search_dir = Path(search_dir or index_file.parent / "postings")
+    vector_dir = Path(vector_dir or index_file.parent / "vectors")
+    store_file = Path(store_file or index_file.with_suffix(".sqlite"))
+    manifest = read_manifest(manifest_file)
+    previous = {} if full else manifest.get("files", {})
+    recorded = manifest.get("outputs", {})
+    files = {}
+    changes = {"added": [], "changed": [], "removed": [], "unchanged": 0}
+
+    for rel, st in walk_files(root, skip=(index_file, manifest_file, store_file, search_dir, vector_dir)):
+        classified = classify(rel)
+        if classified is None:
+            continue
+        kind, entry = classified
+        old = previous.get(rel)
+
+        if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+            files[rel] = old
+            changes["unchanged"] += 1
+            continue
+
+        try:
+            digest = file_hash(Path(root) / rel)
+        except OSError:
+            continue
+        if old and old["sha256"] == digest:
+            # Touched but not edited: keep the entry, refresh the stamp
+            files[rel] = dict(old, size=st.st_size, mtime_ns=st.st_mtime_ns)
+            changes["unchanged"] += 1
+            continue
+
+        files[rel] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": digest,
+            "kind": kind,
+            "entry": entry,
+        }
+        changes["changed" if old else "added"].append(rel)
+
+    fresh = changes["added"] + changes["changed"]
+    for rel, info in extract_many(root, fresh, workers=workers):
+        record = files[rel]
+        record["entry"] = enrich(record["kind"], record["entry"], info)
+    if summarize:
+        for rel, summary in summarize_with_agent(root, fresh).items():
+            files[rel]["entry"].update(summary=summary, summary_source="agent")
+
+    changes["removed"] = sorted(set(previous) - set(files))
+    index = build_index(files)
+
+    # Each output is rebuilt only when it is missing, was built from other
+    # sources, or was edited since; otherwise it (and its mtime) is left alone
+    dirty = full or files != previous
+    source = source_hash(files)
+    outputs = dict(recorded)
+    if full or not previous or store_version(store_file) != STORE_VERSION:
+        write_store(files, store_file, INDEX_KINDS)
+    elif dirty:
+        apply_changes(files, changes, store_file)
+    built = [
+        ("knowledge_index.json", index_file,
+         lambda: write_json_atomic(index_file, index), export_json),
+        ("postings", search_dir / "CURRENT",
+         lambda: build_search_index(files, root=root, search_dir=search_dir), True),
+        ("vectors", vector_dir / "CURRENT",
+         lambda: build_vector_index(files, root=root, vector_dir=vector_dir), True),
+    ]
+    for name, marker, build, wanted in built:
+        if wanted and (full or output_stale(marker, recorded.get(name), source)):
+            build()
+            outputs[name] = {"source": source, "sha256": _sha256(marker)}
+    # Written last, so an interrupted run is redone in full next time
+    if dirty or outputs != recorded or not manifest_file.exists():
+        write_json_atomic(manifest_file, {"version": MANIFEST_VERSION, "files": files,
+                                          "outputs": outputs})
+
+    return index, changes
 
-        rel_path = path.relative_to(ROOT)
-        rel_str = str(rel_path)
-
-        if path.suffix == ".md" and "docs" in rel_path.parts:
-            index["scrolls"].append({
-                "title": path.stem,
-                "path": rel_str,
-                "tags": ["scroll"],
-                "summary": "Unparsed"
-            })
-
-        elif path.suffix in [".py", ".json", ".yml", ".yaml"]:
-            index["repo_files"].append({
-                "path": rel_str,
-                "language": path.suffix.lstrip("."),
-                "summary": "Unparsed"
-            })
-
-        elif "TIP" in rel_str:
-            index["tips"].append({
-                "id": path.stem,
-                "path": rel_str,
-                "summary": "Unparsed"
-            })
-
-    with open(INDEX_FILE, "w") as f:
-        json.dump(index, f, indent=2)
 
+def scan_files(full=False, summarize=False):
+    """Update ``knowledge_index.json`` and return the index."""
+    index, _ = update_index(full=full, summarize=summarize)
     return index
 
 if __name__ == "__main__":
-    result = scan_files()
+    import sys
+    result, changes = update_index(
+        full="--full" in sys.argv,
+        summarize="--summarize" in sys.argv,
+        export_json="--no-json" not in sys.argv,
+    )
     print("Archivist index updated.")
-    print(json.dumps(result, indent=2))
+    print(json.dumps({k: v if isinstance(v, int) else len(v) for k, v in changes.items()}))
@@ -0,0 +1,291 @@
+"""
+Archivist full-text search.
+
+A BM25 inverted index over the files in ``knowledge_index.json``, kept on
+disk next to the index. Each build writes a new generation directory
+(``gen-NNNNNN/``):
+
+  postings.bin  little-endian uint32 ``(doc, tf)`` pairs, grouped by term
+  lexicon.json  term -> ``[offset, df]`` into postings.bin (in pairs)
+  docs.json     document table plus the corpus stats BM25 needs
+  terms.json    per-file term counts keyed by sha256, so a rebuild only
+                re-tokenizes files whose content changed
+
+and then publishes it by atomically replacing the ``CURRENT`` file, which
+names the live generation. Readers therefore always see the files of one
+build together. The previous generation is kept for readers still opening
+it; older ones are removed.
+
+The postings file is memory-mapped at query time, and only the posting
+lists of the query terms are touched. The loaded index is cached until
+``CURRENT`` names a new generation. :func:`archival_context` turns hits
+into snippet dicts for ``convergence.engine.converge``.
+"""
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import shutil
+import sys
+import threading
+from array import array
+from collections import Counter
+from pathlib import Path
+
+from archivist import atomic
+from archivist.atomic import KEEP_GENERATIONS, new_generation, publish_generation  # noqa: F401
+
+ROOT = Path(__file__).resolve().parents[1]
+SEARCH_DIR = ROOT / "archivist" / "postings"
+FORMAT_VERSION = 1
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 3  # title and heading tokens count this many times
+MAX_INDEX_BYTES = 1 << 20
+SNIPPET_CHARS = 240
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have if in into is it its of on or
+so that the their then there these this to was were will with
+""".split())
+
+_WORD = re.compile(r"[A-Za-z0-9]+(?:[-_.][A-Za-z0-9]+)*")
+_CAMEL = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+
+def tokenize(text):
+    """Split ``text`` into index terms.
+
+    Compound identifiers (``TIP-002``, ``run_chat``, ``core.tcop``) are kept
+    whole and also split into their parts, and camelCase words are split,
+    so both ``guardian_review`` and ``guardian review`` match.
+    """
+    terms = []
+    for match in _WORD.finditer(text):
+        word = match.group(0)
+        parts = [p for chunk in re.split(r"[-_.]", word) for p in _CAMEL.findall(chunk)]
+        lowered = word.lower()
+        if len(parts) > 1 and lowered not in STOPWORDS:
+            terms.append(lowered)
+        for part in parts:
+            part = part.lower()
+            if part not in STOPWORDS and (len(part) > 1 or part.isdigit()):
+                terms.append(part)
+    return terms
+
+
+def _read_text(path, limit=MAX_INDEX_BYTES):
+    with open(path, "rb") as f:
+        return f.read(limit).decode("utf-8", errors="replace")
+
+
+def document_terms(path, entry):
+    """Term counts for one file; title and headings are weighted up."""
+    counts = Counter(tokenize(_read_text(path)))
+    fields = [entry.get("title") or "", *entry.get("headings", [])]
+    for term in tokenize(" ".join(fields)):
+        counts[term] += TITLE_WEIGHT - 1
+    return dict(counts)
+
+
+LEGACY_FILES = ("postings.bin", "lexicon.json", "docs.json", "terms.json")  # pre-generation layout
+
+
+def current_generation(search_dir=None):
+    """The published generation directory, or None if nothing is published."""
+    return atomic.current_generation(search_dir or SEARCH_DIR)
+
+
+def _load_json(path, default):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def build_search_index(files, root=ROOT, search_dir=None):
+    """Rebuild the on-disk search index from indexer manifest records.
+
+    ``files`` maps relative paths to manifest records (``sha256``, ``kind``,
+    ``entry``). Term counts are reused from ``terms.json`` for files whose
+    hash is unchanged. Returns the number of indexed documents.
+    """
+    search_dir = Path(search_dir or SEARCH_DIR)
+    search_dir.mkdir(parents=True, exist_ok=True)
+    previous = current_generation(search_dir)
+    cached = _load_json(previous / "terms.json", {}) if previous else {}
+    if cached.get("version") != FORMAT_VERSION:
+        cached = {}
+    cached = cached.get("files", {})
+
+    docs, terms_cache, postings = [], {}, {}
+    for rel in sorted(files):
+        record = files[rel]
+        old = cached.get(rel)
+        if old and old["sha256"] == record["sha256"]:
+            counts = old["tf"]
+        else:
+            try:
+                counts = document_terms(Path(root) / rel, record["entry"])
+            except OSError:
+                continue
+        terms_cache[rel] = {"sha256": record["sha256"], "tf": counts}
+        doc_id = len(docs)
+        entry = record["entry"]
+        docs.append({
+            "path": rel,
+            "kind": record["kind"],
+            "title": entry.get("title") or entry.get("id") or rel,
+            "length": sum(counts.values()),
+        })
+        for term, tf in counts.items():
+            postings.setdefault(term, []).append((doc_id, tf))
+
+    blob, lexicon = array("I"), {}
+    for term in sorted(postings):
+        lexicon[term] = [len(blob) // 2, len(postings[term])]
+        for doc_id, tf in postings[term]:
+            blob.append(doc_id)
+            blob.append(tf)
+    if sys.byteorder != "little":  # pragma: no cover
+        blob.byteswap()
+
+    total = sum(d["length"] for d in docs)
+    meta = {
+        "version": FORMAT_VERSION,
+        "count": len(docs),
+        "avgdl": total / len(docs) if docs else 0.0,
+        "docs": docs,
+    }
+    generation = new_generation(search_dir)
+    try:
+        (generation / "postings.bin").write_bytes(blob.tobytes())
+        (generation / "lexicon.json").write_text(json.dumps(lexicon))
+        (generation / "terms.json").write_text(
+            json.dumps({"version": FORMAT_VERSION, "files": terms_cache}))
+        (generation / "docs.json").write_text(json.dumps(meta))
+    except BaseException:
+        shutil.rmtree(generation, ignore_errors=True)
+        raise
+    publish_generation(search_dir, generation, LEGACY_FILES)
+    return len(docs)
+
+
+class SearchIndex:
+    """A loaded search index with memory-mapped postings."""
+
+    def __init__(self, generation):
+        generation = Path(generation)
+        meta = _load_json(generation / "docs.json", {})
+        if meta.get("version") != FORMAT_VERSION:
+            raise FileNotFoundError(f"No search index in {generation}")
+        self.docs = meta["docs"]
+        self.avgdl = meta["avgdl"] or 1.0
+        self.lexicon = _load_json(generation / "lexicon.json", {})
+        self._postings = None
+        with open(generation / "postings.bin", "rb") as f:
+            if not os.fstat(f.fileno()).st_size:
+                return
+            if sys.byteorder == "little":
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._postings = memoryview(self._map).cast("I")
+            else:  # pragma: no cover - the file is little-endian: swap a copy
+                postings = array("I")
+                postings.frombytes(f.read())
+                postings.byteswap()
+                self._postings = memoryview(postings)
+
+    def postings(self, term):
+        """``(doc, tf)`` pairs for ``term`` as a flat uint32 view."""
+        found = self.lexicon.get(term)
+        if found is None or self._postings is None:
+            return ()
+        offset, df = found
+        return self._postings[offset * 2:(offset + df) * 2]
+
+    def search(self, query, k=10):
+        """Top ``k`` documents for ``query`` as ``(score, doc)`` pairs."""
+        n = len(self.docs)
+        scores = {}
+        for term in set(tokenize(query)):
+            pairs = self.postings(term)
+            df = len(pairs) // 2
+            if not df:
+                continue
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for i in range(0, len(pairs), 2):
+                doc_id, tf = pairs[i], pairs[i + 1]
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.docs[doc_id]["length"] / self.avgdl)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+        best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(score, self.docs[doc_id]) for doc_id, score in best]
+
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+def load(search_dir=None):
+    """Return the cached :class:`SearchIndex`, reloading when it is rebuilt."""
+    search_dir = Path(search_dir or SEARCH_DIR)
+    generation = current_generation(search_dir)
+    if generation is None:
+        raise FileNotFoundError(f"No search index in {search_dir}")
+    with _lock:
+        cached = _loaded.get(search_dir)
+        if cached is None or cached[0] != generation:
+            cached = (generation, SearchIndex(generation))
+            _loaded[search_dir] = cached
+        return cached[1]
+
+
+def snippet(path, query, limit=SNIPPET_CHARS):
+    """The passage of ``path`` that mentions the most query terms."""
+    wanted = set(tokenize(query))
+    try:
+        lines = _read_text(path).splitlines()
+    except OSError:
+        return ""
+    best, best_hits = 0, 0
+    for i, line in enumerate(lines):
+        hits = len(wanted.intersection(tokenize(line)))
+        if hits > best_hits:
+            best, best_hits = i, hits
+    text = " ".join(" ".join(line.split()) for line in lines[best:best + 3] if line.strip())
+    if len(text) <= limit:
+        return text
+    return text[:limit - 1].rsplit(" ", 1)[0] + "…"
+
+
+def search(query, k=10, root=ROOT, search_dir=None):
+    """Search the knowledge index; returns hit dicts, best first.
+
+    Each hit carries ``path``, ``kind``, ``title``, ``score`` and a
+    ``snippet``. Returns an empty list when no index has been built.
+    """
+    try:
+        index = load(search_dir)
+    except (OSError, ValueError):
+        return []
+    hits = []
+    for score, doc in index.search(query, k):
+        hits.append({
+            "path": doc["path"],
+            "kind": doc["kind"],
+            "title": doc["title"],
+            "score": round(score, 4),
+            "snippet": snippet(Path(root) / doc["path"], query),
+        })
+    return hits
+
+
+def archival_context(query, k=5, **kwargs):
+    """Search hits shaped for the ``archival_context`` list of ``converge``."""
+    return [
+        {"source": hit["path"], "title": hit["title"], "snippet": hit["snippet"]}
+        for hit in search(query, k, **kwargs)
+    ]
@@ -0,0 +1,480 @@
+"""
+Archivist semantic search.
+
+Scrolls and TIPs are split into chunks, and each chunk is embedded into a
+unit vector. The vectors are stored as one row-major float32 matrix on
+disk, next to the index. Each build writes a generation directory
+(``gen-NNNNNN/``):
+
+  matrix.f32    ``rows x dim`` little-endian float32, memory-mapped
+  chunks.json   embedder name, dimension, and per-row path/sha256/snippet
+  centroids.f32 IVF cluster centroids (only with an approximate index)
+  ivf_ids.u32   row ids grouped by cluster; offsets live in chunks.json
+
+and publishes it through the ``CURRENT`` file, as the search index does,
+so readers always see the four files of one build together.
+
+Queries score rows in blocks with one matrix product per block, and many
+queries can share a block (:func:`search_many`). With an IVF index only the
+``nprobe`` nearest clusters are scanned. NumPy is used when it is
+installed; otherwise the same files are read through ``mmap`` with plain
+Python arithmetic, which is fine for repository-sized corpora.
+
+Embedders are pluggable (:func:`register_embedder`). The default
+``hashing`` embedder is deterministic and works offline. Rebuilds reuse
+the rows of files whose sha256 is unchanged, so only edited files are
+re-embedded.
+"""
+import heapq
+import json
+import math
+import mmap
+import operator
+import os
+import random
+import re
+import shutil
+import sys
+import threading
+import zlib
+from array import array
+from pathlib import Path
+
+from archivist.atomic import current_generation, new_generation, publish_generation, write_bytes
+from archivist.search_index import MAX_INDEX_BYTES, tokenize
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+ROOT = Path(__file__).resolve().parents[1]
+VECTOR_DIR = ROOT / "archivist" / "vectors"
+FORMAT_VERSION = 1
+LEGACY_FILES = ("matrix.f32", "chunks.json", "centroids.f32", "ivf_ids.u32")  # pre-generation layout
+
+VECTOR_KINDS = ("scrolls", "tips")
+EMBEDDER = os.getenv("AVOT_EMBEDDER", "hashing")
+HASHING_DIM = 256
+CHUNK_CHARS = 800
+SNIPPET_CHARS = 240
+BLOCK_ROWS = 65536  # rows scored per matrix product
+IVF_MIN_ROWS = 50_000  # build an IVF index automatically at this size (NumPy only)
+IVF_NPROBE = 8
+IVF_TRAIN_PER_LIST = 64
+IVF_ITERATIONS = 10
+
+_HEADING = re.compile(r"^#{1,6}\s")
+
+
+# ---------------------------------------------------------------------------
+# Embedders
+# ---------------------------------------------------------------------------
+
+class HashingEmbedder:
+    """Feature-hashed bag of terms and term bigrams, L2-normalized.
+
+    Uses ``crc32`` rather than ``hash()`` so vectors are identical across
+    processes and runs.
+    """
+
+    def __init__(self, dim=HASHING_DIM):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text):
+        terms = tokenize(text)
+        yield from ((t, 1.0) for t in terms)
+        yield from ((f"{a} {b}", 0.5) for a, b in zip(terms, terms[1:]))
+
+    def embed(self, texts):
+        vectors = []
+        for text in texts:
+            vec = [0.0] * self.dim
+            for feature, weight in self._features(text):
+                h = zlib.crc32(feature.encode())
+                vec[h % self.dim] += weight if (h >> 31) & 1 else -weight
+            vectors.append(normalize(vec))
+        return vectors
+
+
+_EMBEDDERS = {"hashing": HashingEmbedder}
+_embedders = {}
+_lock = threading.Lock()
+
+
+def register_embedder(name, factory):
+    """Make ``name`` selectable; ``factory()`` returns an object with
+    ``name``, ``dim`` and ``embed(texts) -> list of vectors``."""
+    with _lock:
+        _EMBEDDERS[name] = factory
+        _embedders.pop(name, None)
+
+
+def get_embedder(name=None):
+    """Process-wide embedder ``name`` (default ``EMBEDDER``)."""
+    name = name or EMBEDDER
+    with _lock:
+        if name not in _embedders:
+            if name not in _EMBEDDERS:
+                raise ValueError(f"Unknown embedder '{name}'")
+            _embedders[name] = _EMBEDDERS[name]()
+        return _embedders[name]
+
+
+def normalize(vec):
+    norm = math.sqrt(sum(x * x for x in vec))
+    return [x / norm for x in vec] if norm else list(vec)
+
+
+# ---------------------------------------------------------------------------
+# Chunking
+# ---------------------------------------------------------------------------
+
+def chunk_text(text, size=CHUNK_CHARS):
+    """Split ``text`` into chunks of about ``size`` characters.
+
+    Breaks fall between paragraphs, and a heading always starts a new
+    chunk, so each chunk stays within one section.
+    """
+    chunks, current = [], []
+    length = 0
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if current and (length + len(paragraph) > size or _HEADING.match(paragraph)):
+            chunks.append("\n\n".join(current))
+            current, length = [], 0
+        current.append(paragraph)
+        length += len(paragraph)
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _snippet(text, limit=SNIPPET_CHARS):
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    return text[:limit - 1].rsplit(" ", 1)[0] + "…"
+
+
+# ---------------------------------------------------------------------------
+# Matrix storage and scoring
+# ---------------------------------------------------------------------------
+
+def _packed(values, typecode):
+    packed = array(typecode, values)
+    if sys.byteorder != "little":  # pragma: no cover
+        packed.byteswap()
+    return packed.tobytes()
+
+
+class VectorMatrix:
+    """A ``rows x dim`` float32 matrix, memory-mapped or in memory."""
+
+    def __init__(self, data, rows, dim):
+        self._data, self.rows, self.dim = data, rows, dim
+
+    @classmethod
+    def open(cls, path, dim):
+        rows = os.path.getsize(path) // (4 * dim)
+        if not rows:
+            return cls.from_rows([], dim)
+        if np is not None:
+            return cls(np.memmap(path, dtype="<f4", mode="r", shape=(rows, dim)), rows, dim)
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(memoryview(mapped).cast("f"), rows, dim)
+
+    @classmethod
+    def from_rows(cls, vectors, dim):
+        if np is not None:
+            data = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), dim)
+        else:
+            data = array("f", (x for vec in vectors for x in vec))
+        return cls(data, len(vectors), dim)
+
+    def row(self, i):
+        if np is not None:
+            return self._data[i].tolist()
+        return list(self._data[i * self.dim:(i + 1) * self.dim])
+
+    def topk(self, queries, k, ids=None):
+        """Best ``k`` ``(score, row)`` pairs per query, by dot product.
+
+        Only rows in ``ids`` are scored when it is given.
+        """
+        if np is not None:
+            return self._topk_numpy(queries, k, ids)
+        candidates = range(self.rows) if ids is None else ids
+        d, data = self.dim, self._data
+        return [
+            heapq.nlargest(k, (
+                (sum(map(operator.mul, data[i * d:(i + 1) * d], q)), i) for i in candidates
+            ))
+            for q in queries
+        ]
+
+    def _topk_numpy(self, queries, k, ids):
+        q = np.asarray(queries, dtype=np.float32).reshape(len(queries), self.dim)
+        full = ids is None
+        ids = np.arange(self.rows) if full else np.asarray(ids, dtype=np.int64)
+        best_scores = np.full((len(q), 0), -np.inf, dtype=np.float32)
+        best_ids = np.zeros((len(q), 0), dtype=np.int64)
+        for start in range(0, len(ids), BLOCK_ROWS):
+            block = ids[start:start + BLOCK_ROWS]
+            # Contiguous slices of the memmap avoid a fancy-indexing copy
+            rows = self._data[start:start + BLOCK_ROWS] if full else self._data[block]
+            scores = q @ rows.T
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+            best_ids = np.concatenate([best_ids, np.broadcast_to(block, scores.shape)], axis=1)
+            if best_scores.shape[1] > k:
+                keep = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_ids = np.take_along_axis(best_ids, keep, axis=1)
+        order = np.argsort(-best_scores, axis=1)
+        return [
+            [(float(best_scores[r, c]), int(best_ids[r, c])) for c in order[r]]
+            for r in range(len(q))
+        ]
+
+
+def _assign(matrix, centroids):
+    """Index of the nearest centroid for every row of ``matrix``."""
+    if np is not None:
+        c = np.asarray(centroids._data)
+        return np.concatenate([
+            np.argmax(np.asarray(matrix._data[s:s + BLOCK_ROWS]) @ c.T, axis=1)
+            for s in range(0, matrix.rows, BLOCK_ROWS)
+        ]).tolist()
+    return [centroids.topk([matrix.row(i)], 1)[0][0][1] for i in range(matrix.rows)]
+
+
+def train_ivf(matrix, nlist, iterations=IVF_ITERATIONS, seed=0):
+    """Spherical k-means over a sample of rows.
+
+    Returns ``(centroids, lists)``; ``lists[c]`` holds the row ids in
+    cluster ``c``.
+    """
+    rng = random.Random(seed)
+    nlist = max(1, min(nlist, matrix.rows))
+    sample_ids = rng.sample(range(matrix.rows), min(matrix.rows, nlist * IVF_TRAIN_PER_LIST))
+    sample = VectorMatrix.from_rows([matrix.row(i) for i in sample_ids], matrix.dim)
+    centroids = VectorMatrix.from_rows([sample.row(i) for i in range(nlist)], matrix.dim)
+    for _ in range(iterations):
+        assigned = _assign(sample, centroids)
+        if np is not None:
+            sums = np.zeros((nlist, matrix.dim), dtype=np.float64)
+            np.add.at(sums, assigned, sample._data)
+            sums = sums.tolist()
+        else:
+            sums = [[0.0] * matrix.dim for _ in range(nlist)]
+            for i, c in enumerate(assigned):
+                sums[c] = list(map(operator.add, sums[c], sample.row(i)))
+        centroids = VectorMatrix.from_rows(
+            [normalize(s) if any(s) else centroids.row(c) for c, s in enumerate(sums)],
+            matrix.dim,
+        )
+    lists = [[] for _ in range(nlist)]
+    for i, c in enumerate(_assign(matrix, centroids)):
+        lists[c].append(i)
+    return centroids, lists
+
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+
+def _load_meta(vector_dir):
+    try:
+        with open(Path(vector_dir) / "chunks.json") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == FORMAT_VERSION else None
+
+
+_write_atomic = write_bytes
+
+
+def write_ivf(vector_dir, matrix, nlist):
+    """Train an IVF index over ``matrix``; returns its ``chunks.json`` entry."""
+    centroids, lists = train_ivf(matrix, nlist)
+    offsets = [0]
+    for ids in lists:
+        offsets.append(offsets[-1] + len(ids))
+    _write_atomic(Path(vector_dir) / "centroids.f32",
+                  (_packed(centroids.row(c), "f") for c in range(centroids.rows)))
+    _write_atomic(Path(vector_dir) / "ivf_ids.u32", (_packed(ids, "I") for ids in lists))
+    return {"nlist": centroids.rows, "offsets": offsets}
+
+
+def build_vector_index(files, root=ROOT, vector_dir=None, embedder=None, nlist=None):
+    """Rebuild the vector index from indexer manifest records.
+
+    Only ``VECTOR_KINDS`` files are embedded. Files whose sha256 matches
+    the previous build keep their rows. ``nlist`` forces an IVF index with
+    that many clusters; by default one is built once the matrix reaches
+    ``IVF_MIN_ROWS`` rows and NumPy is available. Returns the row count.
+    """
+    vector_dir = Path(vector_dir or VECTOR_DIR)
+    vector_dir.mkdir(parents=True, exist_ok=True)
+    embedder = embedder or get_embedder()
+
+    previous = current_generation(vector_dir)
+    old = _load_meta(previous) if previous else None
+    reuse = {}
+    if (old and old["embedder"] == embedder.name and old["dim"] == embedder.dim
+            and (previous / "matrix.f32").exists()):
+        old_matrix = VectorMatrix.open(previous / "matrix.f32", embedder.dim)
+        for i, chunk in enumerate(old["chunks"]):
+            reuse.setdefault((chunk["path"], chunk["sha256"]), []).append(i)
+    else:
+        old_matrix = None
+
+    rows = []  # (chunk meta, vector or old row id)
+    pending = []  # (position in rows, text) still to embed
+    for rel in sorted(files):
+        record = files[rel]
+        if record["kind"] not in VECTOR_KINDS:
+            continue
+        entry = record["entry"]
+        title = entry.get("title") or entry.get("id") or rel
+        kept = reuse.get((rel, record["sha256"]))
+        if kept:
+            rows.extend((old["chunks"][i], i) for i in kept)
+            continue
+        try:
+            with open(Path(root) / rel, "rb") as f:
+                text = f.read(MAX_INDEX_BYTES).decode("utf-8", errors="replace")
+        except OSError:
+            continue
+        for chunk in chunk_text(text):
+            pending.append((len(rows), f"{title}\n{chunk}"))
+            rows.append(({"path": rel, "sha256": record["sha256"], "title": title,
+                          "snippet": _snippet(chunk)}, None))
+
+    vectors = dict(zip(
+        (pos for pos, _ in pending),
+        embedder.embed([text for _, text in pending]) if pending else [],
+    ))
+
+    def packed_rows():
+        for pos, (_, source) in enumerate(rows):
+            yield _packed(vectors[pos] if source is None else old_matrix.row(source), "f")
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "embedder": embedder.name,
+        "dim": embedder.dim,
+        "chunks": [chunk for chunk, _ in rows],
+        "ivf": None,
+    }
+    if nlist is None and np is not None and len(rows) >= IVF_MIN_ROWS:
+        nlist = int(math.sqrt(len(rows)))
+    generation = new_generation(vector_dir)
+    try:
+        _write_atomic(generation / "matrix.f32", packed_rows())
+        if nlist and rows:
+            matrix = VectorMatrix.open(generation / "matrix.f32", embedder.dim)
+            meta["ivf"] = write_ivf(generation, matrix, nlist)
+        _write_atomic(generation / "chunks.json", [json.dumps(meta).encode()])
+    except BaseException:
+        shutil.rmtree(generation, ignore_errors=True)
+        raise
+    publish_generation(vector_dir, generation, LEGACY_FILES)
+    return len(rows)
+
+
+# ---------------------------------------------------------------------------
+# Query
+# ---------------------------------------------------------------------------
+
+class VectorIndex:
+    """A loaded vector index: the mapped matrix plus optional IVF lists.
+
+    ``vector_dir`` is the directory holding the files of one build, such
+    as a published generation.
+    """
+
+    def __init__(self, vector_dir):
+        vector_dir = Path(vector_dir)
+        meta = _load_meta(vector_dir)
+        if meta is None:
+            raise FileNotFoundError(f"No vector index in {vector_dir}")
+        self.embedder_name = meta["embedder"]
+        self.chunks = meta["chunks"]
+        self.matrix = VectorMatrix.open(vector_dir / "matrix.f32", meta["dim"])
+        self.ivf = meta.get("ivf")
+        if self.ivf:
+            self.centroids = VectorMatrix.open(vector_dir / "centroids.f32", meta["dim"])
+            with open(vector_dir / "ivf_ids.u32", "rb") as f:
+                self.ivf_ids = array("I", f.read())
+            if sys.byteorder != "little":  # pragma: no cover
+                self.ivf_ids.byteswap()
+
+    def _candidates(self, query, nprobe):
+        probes = self.centroids.topk([query], min(nprobe, self.ivf["nlist"]))[0]
+        offsets = self.ivf["offsets"]
+        ids = []
+        for _, c in probes:
+            ids.extend(self.ivf_ids[offsets[c]:offsets[c + 1]])
+        return sorted(ids)
+
+    def search_vectors(self, queries, k=10, nprobe=None, approximate=None):
+        """Top ``k`` ``(score, row)`` pairs per query vector."""
+        approximate = bool(self.ivf) if approximate is None else approximate and bool(self.ivf)
+        if not approximate:
+            return self.matrix.topk(queries, k)
+        nprobe = nprobe or IVF_NPROBE
+        return [self.matrix.topk([q], k, self._candidates(q, nprobe))[0] for q in queries]
+
+
+_loaded = {}
+
+
+def load(vector_dir=None):
+    """Return the cached :class:`VectorIndex`, reloading when it is rebuilt."""
+    vector_dir = Path(vector_dir or VECTOR_DIR)
+    generation = current_generation(vector_dir)
+    if generation is None:
+        raise FileNotFoundError(f"No vector index in {vector_dir}")
+    with _lock:
+        cached = _loaded.get(vector_dir)
+        if cached is None or cached[0] != generation:
+            cached = (generation, VectorIndex(generation))
+            _loaded[vector_dir] = cached
+        return cached[1]
+
+
+def search_many(queries, k=10, vector_dir=None, nprobe=None, approximate=None):
+    """Semantic search for several queries at once; one hit list per query.
+
+    Hits carry ``path``, ``title``, ``score`` and the chunk's ``snippet``.
+    Returns empty lists when no index has been built.
+    """
+    try:
+        index = load(vector_dir)
+    except (OSError, ValueError):
+        return [[] for _ in queries]
+    embedder = get_embedder()
+    if embedder.name != index.embedder_name:
+        raise ValueError(
+            f"Vector index was built with '{index.embedder_name}', not '{embedder.name}'"
+        )
+    results = index.search_vectors(embedder.embed(queries), k, nprobe, approximate)
+    return [
+        [
+            dict(path=index.chunks[row]["path"], title=index.chunks[row]["title"],
+                 score=round(score, 4), snippet=index.chunks[row]["snippet"])
+            for score, row in hits if score > 0
+        ]
+        for hits in results
+    ]
+
+
+def search(query, k=10, **kwargs):
+    """Semantic search of the Archivist corpus; returns hit dicts, best first."""
+    return search_many([query], k, **kwargs)[0]
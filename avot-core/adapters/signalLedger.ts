@@ -1,14 +1,23 @@
 import fs from "fs";
+import path from "path";
 import yaml from "js-yaml";
 import { v4 as uuidv4 } from "uuid";
 
+// Same layout as signal_ledger.py: the YAML file holds the header and any
+// legacy signals; new signals are JSON lines in <ledger>.segments/.
+const SEGMENT_MAX_BYTES = 16 * 1024 * 1024;
+const SEGMENT_PATTERN = /^segment-(\d{6})\.jsonl$/;
+
 export class SignalLedgerError extends Error {}
 
 export class SignalLedger {
   private ledgerPath: string;
+  private segmentDir: string;
 
   constructor(ledgerPath: string) {
     this.ledgerPath = ledgerPath;
+    const parsed = path.parse(ledgerPath);
+    this.segmentDir = path.join(parsed.dir, `${parsed.name}.segments`);
 
     if (!fs.existsSync(this.ledgerPath)) {
       throw new SignalLedgerError(
@@ -28,23 +37,56 @@ export class SignalLedger {
     }
   }
 
-  private write(data: any): void {
-    try {
-      fs.writeFileSync(
-        this.ledgerPath,
-        yaml.dump(data, { sortKeys: false }),
-        "utf-8"
-      );
-    } catch (err) {
-      throw new SignalLedgerError(
-        `Failed to write signal ledger: ${(err as Error).message}`
-      );
+  private segmentPath(num: number): string {
+    return path.join(
+      this.segmentDir,
+      `segment-${String(num).padStart(6, "0")}.jsonl`
+    );
+  }
+
+  private segmentNumbers(): number[] {
+    if (!fs.existsSync(this.segmentDir)) {
+      return [];
     }
+    return fs
+      .readdirSync(this.segmentDir)
+      .map((name) => SEGMENT_PATTERN.exec(name))
+      .filter((match): match is RegExpExecArray => match !== null)
+      .map((match) => Number(match[1]))
+      .sort((a, b) => a - b);
+  }
+
+  private readSegment(file: string): any[] {
+    const raw = fs.readFileSync(file, "utf-8");
+    // Only newline-terminated records: the tail may still be in flight
+    const lines = raw.slice(0, raw.lastIndexOf("\n") + 1).split("\n");
+    const signals: any[] = [];
+    for (const line of lines) {
+      if (!line) {
+        continue;
+      }
+      try {
+        signals.push(JSON.parse(line));
+      } catch {
+        // sealed torn record
+      }
+    }
+    return signals;
   }
 
   readSignals(): any[] {
     const ledger = this.load();
-    return ledger?.signal_ledger?.signals ?? [];
+    const signals: any[] = [...(ledger?.signal_ledger?.signals ?? [])];
+    try {
+      for (const num of this.segmentNumbers()) {
+        signals.push(...this.readSegment(this.segmentPath(num)));
+      }
+    } catch (err) {
+      throw new SignalLedgerError(
+        `Failed to read signal ledger: ${(err as Error).message}`
+      );
+    }
+    return signals;
   }
 
   appendSignal(
@@ -72,9 +114,48 @@ export class SignalLedger {
       metadata,
     };
 
-    ledger.signal_ledger.signals.push(signal);
-    this.write(ledger);
+    this.appendRecord(JSON.stringify(signal) + "\n");
 
     return signal;
   }
+
+  // Node has no flock, so the record goes out as a single O_APPEND write,
+  // which cannot interleave with other appenders. A torn tail left by a
+  // crashed writer is sealed in the same write; at worst a race adds an
+  // empty line, which readers skip.
+  private appendRecord(record: string): void {
+    try {
+      fs.mkdirSync(this.segmentDir, { recursive: true });
+      const numbers = this.segmentNumbers();
+      let num = numbers.length ? numbers[numbers.length - 1] : 1;
+      let size = fs.existsSync(this.segmentPath(num))
+        ? fs.statSync(this.segmentPath(num)).size
+        : 0;
+      const bytes = Buffer.byteLength(record, "utf-8");
+      if (size && size + bytes > SEGMENT_MAX_BYTES) {
+        num += 1;
+        size = 0;
+      }
+
+      const fd = fs.openSync(this.segmentPath(num), "a+");
+      try {
+        let data = record;
+        if (size) {
+          const last = Buffer.alloc(1);
+          fs.readSync(fd, last, 0, 1, size - 1);
+          if (last.toString("utf-8") !== "\n") {
+            data = "\n" + record;
+          }
+        }
+        fs.writeSync(fd, data);
+        fs.fsyncSync(fd);
+      } finally {
+        fs.closeSync(fd);
+      }
+    } catch (err) {
+      throw new SignalLedgerError(
+        `Failed to write signal ledger: ${(err as Error).message}`
+      );
+    }
+  }
 }
@@ -0,0 +1,370 @@
+from typing import Dict, Any, List, Optional, Tuple
+from pathlib import Path
+from datetime import datetime, timezone
+import importlib.util
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+
+
+def _load_adapter(name: str) -> Any:
+    """Import a sibling adapter module from its file, once (as core.tcop does)."""
+    module = sys.modules.get(name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(name, Path(__file__).with_name(f"{name}.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+    return module
+
+
+_signal_ledger = _load_adapter("signal_ledger")
+SignalLedger = _signal_ledger.SignalLedger
+epoch_seconds = _signal_ledger.epoch_seconds
+
+
+# Counts are kept per BUCKET_SECONDS bucket for RETENTION_SECONDS; window
+# queries are answered to bucket granularity.
+BUCKET_SECONDS = 60
+RETENTION_SECONDS = 24 * 3600
+SNAPSHOT_INTERVAL = 60.0
+SNAPSHOT_VERSION = 1
+
+# What summary() reports: sliding windows, the trend window, and the
+# number of (avot_id, signal_type) rows
+SUMMARY_WINDOWS = (300, 3600)
+TREND_WINDOW = 3600
+SUMMARY_TOP = 20
+
+KEY_FIELDS = ("avot_id", "signal_type", "severity")
+
+Key = Tuple[Any, Any, Any]  # (avot_id, signal_type, severity)
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class SignalAggregates:
+    """
+    Rolling signal counts, maintained incrementally.
+
+    Every signal is counted under (avot_id, signal_type, severity) in a
+    time bucket of ``bucket_seconds``; buckets older than ``retention``
+    are dropped. From the buckets it answers:
+    - sliding windows: counts over the last N seconds
+    - tumbling windows: counts per aligned period (e.g. per hour)
+    - severity histograms
+    and keeps all-time totals.
+
+    Sources:
+    - given a ``ledger``, :meth:`refresh` counts the signals appended
+      since the last refresh straight from the ledger's
+      :class:`SignalIndex`, without decoding records
+    - otherwise signals are fed one at a time through :meth:`observe`
+      (``AvotBase.emit_signal`` does this when given an aggregator)
+
+    With a ``snapshot_path`` the counts are written there at most every
+    ``snapshot_interval`` seconds and reloaded on construction.
+    """
+
+    def __init__(
+        self,
+        ledger: Optional[SignalLedger] = None,
+        bucket_seconds: int = BUCKET_SECONDS,
+        retention: int = RETENTION_SECONDS,
+        snapshot_path: Optional[str] = None,
+        snapshot_interval: float = SNAPSHOT_INTERVAL,
+    ):
+        if bucket_seconds <= 0 or retention < bucket_seconds:
+            raise ValueError("retention must cover at least one positive bucket")
+        self.ledger = ledger
+        self.bucket_seconds = bucket_seconds
+        self.retention = retention
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.snapshot_interval = snapshot_interval
+
+        self._lock = threading.RLock()
+        self._reset()
+        self._last_snapshot = time.monotonic()
+        if self.snapshot_path is not None and self.snapshot_path.exists():
+            self._restore()
+
+    def _reset(self) -> None:
+        self._buckets: Dict[int, Dict[Key, int]] = {}
+        self._totals: Dict[Key, int] = {}
+        self._newest = None  # newest bucket seen
+        self._consumed = 0  # ledger signals counted
+        self._last_signal_id: Optional[str] = None
+        self._header_ref: Any = None
+        self._verified = True  # consumed position matches the ledger
+
+    # --- Counting ---
+
+    def _count(self, key: Key, stamp: Optional[float]) -> None:
+        self._totals[key] = self._totals.get(key, 0) + 1
+        if stamp is None or math.isnan(stamp):
+            return  # untimed: totals only
+        bucket = int(stamp // self.bucket_seconds)
+        if self._newest is not None and bucket <= self._newest - self.retention // self.bucket_seconds:
+            return  # already expired
+        counts = self._buckets.setdefault(bucket, {})
+        counts[key] = counts.get(key, 0) + 1
+        if self._newest is None or bucket > self._newest:
+            self._newest = bucket
+            self._expire()
+
+    def _expire(self) -> None:
+        oldest = self._newest - self.retention // self.bucket_seconds
+        for bucket in [b for b in self._buckets if b <= oldest]:
+            del self._buckets[bucket]
+
+    def observe(self, signal: Dict[str, Any]) -> None:
+        """Count one signal."""
+        severity = signal.get("severity")
+        if severity is None:
+            severity = (signal.get("payload") or {}).get("severity")
+        key = (signal.get("avot_id"), signal.get("signal_type"), severity)
+        with self._lock:
+            self._count(key, epoch_seconds(signal.get("timestamp")))
+            self._maybe_snapshot()
+
+    def refresh(self) -> "SignalAggregates":
+        """Count the ledger signals appended since the last refresh."""
+        if self.ledger is None:
+            return self
+        index = self.ledger.index()
+        with self._lock:
+            if not self._verified:
+                # Restored from a snapshot: resume only if the ledger still
+                # has the last counted signal at the same position
+                resumed = index.ids.get(self._last_signal_id) == self._consumed - 1
+                if not resumed and self._consumed:
+                    self._reset()
+                self._verified = True
+                self._header_ref = index._header_ref
+            elif index._header_ref is not self._header_ref:
+                if self._header_ref is not None:
+                    self._reset()  # header rewritten: positions changed
+                self._header_ref = index._header_ref
+
+            end = len(index)
+            names = [list(index.values[field]) for field in KEY_FIELDS]
+            columns = [index.codes[field] for field in KEY_FIELDS]
+            stamps = index.timestamps
+            for ordinal in range(self._consumed, end):
+                key = tuple(name[column[ordinal]] for name, column in zip(names, columns))
+                self._count(key, stamps[ordinal])
+            if end > self._consumed:
+                self._last_signal_id = index.fetch([end - 1])[0].get("signal_id")
+                self._consumed = end
+            self._maybe_snapshot()
+        return self
+
+    # --- Queries ---
+
+    def _now_bucket(self, now: Optional[float]) -> int:
+        return int((time.time() if now is None else now) // self.bucket_seconds)
+
+    def _span(self, window: float) -> int:
+        if window <= 0:
+            raise ValueError("window must be positive")
+        return max(1, math.ceil(window / self.bucket_seconds))
+
+    @staticmethod
+    def _matches(key: Key, filters: Dict[str, Any]) -> bool:
+        for position, field in enumerate(KEY_FIELDS):
+            wanted = filters.get(field)
+            if wanted is None:
+                continue
+            values = wanted if isinstance(wanted, (list, tuple, set, frozenset)) else (wanted,)
+            if key[position] not in values:
+                return False
+        return True
+
+    @staticmethod
+    def _group(key: Key, by: Tuple[str, ...]) -> Any:
+        parts = tuple(key[KEY_FIELDS.index(field)] for field in by)
+        return parts[0] if len(parts) == 1 else parts
+
+    def _sum(
+        self,
+        first: int,
+        last: int,
+        by: Tuple[str, ...],
+        filters: Dict[str, Any],
+    ) -> Dict[Any, int]:
+        """Counts over buckets ``first..last`` (inclusive), grouped by ``by``."""
+        out: Dict[Any, int] = {}
+        with self._lock:
+            if last - first < len(self._buckets):
+                buckets = (self._buckets.get(b) for b in range(first, last + 1))
+            else:
+                buckets = (c for b, c in self._buckets.items() if first <= b <= last)
+            for counts in buckets:
+                for key, n in (counts or {}).items():
+                    if filters and not self._matches(key, filters):
+                        continue
+                    group = self._group(key, by)
+                    out[group] = out.get(group, 0) + n
+        return out
+
+    def sliding(
+        self,
+        window: float,
+        by: Tuple[str, ...] = ("avot_id", "signal_type"),
+        now: Optional[float] = None,
+        **filters: Any,
+    ) -> Dict[Any, int]:
+        """Counts over the last ``window`` seconds, grouped by ``by``.
+
+        Filters (``avot_id``, ``signal_type``, ``severity``) take a value
+        or a list of values. A single ``by`` field gives plain keys.
+        """
+        last = self._now_bucket(now)
+        return self._sum(last - self._span(window) + 1, last, tuple(by), filters)
+
+    def tumbling(
+        self,
+        window: float,
+        periods: int = 24,
+        now: Optional[float] = None,
+        **filters: Any,
+    ) -> List[Dict[str, Any]]:
+        """Counts per aligned ``window`` period, oldest first.
+
+        The last of the ``periods`` entries is the period containing
+        ``now`` and is still filling. ``window`` must be a whole number of
+        buckets.
+        """
+        if window % self.bucket_seconds:
+            raise ValueError(f"window must be a multiple of {self.bucket_seconds}s")
+        span = self._span(window)
+        current = self._now_bucket(now) // span * span
+        out = []
+        for period in range(periods - 1, -1, -1):
+            first = current - period * span
+            counts = self._sum(first, first + span - 1, (), filters)
+            out.append({
+                "start": _iso(first * self.bucket_seconds),
+                "count": counts.get((), 0),
+            })
+        return out
+
+    def severity_histogram(
+        self,
+        window: Optional[float] = None,
+        now: Optional[float] = None,
+        **filters: Any,
+    ) -> Dict[Any, int]:
+        """Counts per severity over the last ``window`` seconds, or all time."""
+        if window is not None:
+            return self.sliding(window, by=("severity",), now=now, **filters)
+        return self.totals(by=("severity",), **filters)
+
+    def totals(self, by: Tuple[str, ...] = ("avot_id", "signal_type"), **filters: Any) -> Dict[Any, int]:
+        """All-time counts, grouped by ``by``."""
+        out: Dict[Any, int] = {}
+        with self._lock:
+            for key, n in self._totals.items():
+                if filters and not self._matches(key, filters):
+                    continue
+                group = self._group(key, tuple(by))
+                out[group] = out.get(group, 0) + n
+        return out
+
+    def summary(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Compact trend report: recent counts per AVOT and signal type."""
+        with self._lock:
+            now = time.time() if now is None else now
+            windows = {w: self.sliding(w, now=now) for w in SUMMARY_WINDOWS}
+            previous = self.sliding(TREND_WINDOW, now=now - TREND_WINDOW)
+            current = windows.get(TREND_WINDOW) or self.sliding(TREND_WINDOW, now=now)
+
+            rows = []
+            for avot_id, signal_type in set().union(*windows.values(), previous):
+                row = {"avot_id": avot_id, "signal_type": signal_type}
+                for w, counts in windows.items():
+                    row[f"last_{w}s"] = counts.get((avot_id, signal_type), 0)
+                row[f"previous_{TREND_WINDOW}s"] = before = previous.get((avot_id, signal_type), 0)
+                after = current.get((avot_id, signal_type), 0)
+                row["trend"] = "rising" if after > before else "falling" if after < before else "steady"
+                rows.append(row)
+            rows.sort(key=lambda r: (-r[f"last_{SUMMARY_WINDOWS[-1]}s"], str(r["avot_id"]), str(r["signal_type"])))
+
+            return {
+                "as_of": _iso(now),
+                "signals_total": sum(self._totals.values()),
+                "recent": rows[:SUMMARY_TOP],
+                f"severity_last_{SUMMARY_WINDOWS[-1]}s": self.severity_histogram(SUMMARY_WINDOWS[-1], now=now),
+            }
+
+    # --- Snapshots ---
+
+    def _maybe_snapshot(self) -> None:
+        if self.snapshot_path is not None and (
+            time.monotonic() - self._last_snapshot >= self.snapshot_interval
+        ):
+            self.snapshot()
+
+    def snapshot(self, path: Optional[str] = None) -> None:
+        """Write the counts to ``path`` (default ``snapshot_path``) atomically."""
+        path = Path(path or self.snapshot_path)
+        with self._lock:
+            state = {
+                "version": SNAPSHOT_VERSION,
+                "bucket_seconds": self.bucket_seconds,
+                "consumed": self._consumed,
+                "last_signal_id": self._last_signal_id,
+                "buckets": [[b, *key, n] for b, counts in self._buckets.items() for key, n in counts.items()],
+                "totals": [[*key, n] for key, n in self._totals.items()],
+            }
+            self._last_snapshot = time.monotonic()
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            os.fchmod(fd, 0o644)  # mkstemp files are 0600
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _restore(self) -> None:
+        try:
+            state = json.loads(self.snapshot_path.read_text())
+        except (OSError, ValueError):
+            return  # unreadable snapshot: start empty
+        if state.get("version") != SNAPSHOT_VERSION or state.get("bucket_seconds") != self.bucket_seconds:
+            return
+        for bucket, avot_id, signal_type, severity, n in state["buckets"]:
+            self._buckets.setdefault(bucket, {})[(avot_id, signal_type, severity)] = n
+        self._totals = {(a, t, s): n for a, t, s, n in state["totals"]}
+        self._newest = max(self._buckets, default=None)
+        if self._newest is not None:
+            self._expire()
+        self._consumed = state.get("consumed", 0)
+        self._last_signal_id = state.get("last_signal_id")
+        self._verified = self.ledger is None
+
+
+_shared: Dict[Path, SignalAggregates] = {}
+_shared_lock = threading.Lock()
+
+
+def ledger_aggregates(ledger_path: str, snapshot_path: Optional[str] = None) -> SignalAggregates:
+    """The process-wide aggregator for ``ledger_path``, caught up."""
+    path = Path(ledger_path).resolve()
+    with _shared_lock:
+        aggregates = _shared.get(path)
+        if aggregates is None:
+            aggregates = _shared[path] = SignalAggregates(SignalLedger(str(path)), snapshot_path=snapshot_path)
+    return aggregates.refresh()
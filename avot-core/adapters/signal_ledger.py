@@ -1,15 +1,429 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
+from array import array
+from bisect import bisect_left, bisect_right
+import asyncio
+import heapq
+import json
+import math
+import os
+import re
+import select
+import threading
+import time
 import yaml
 import uuid
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX: in-process locking only
+    fcntl = None
+
+try:
+    import ctypes
+
+    _libc = ctypes.CDLL(None, use_errno=True)
+    if not hasattr(_libc, "inotify_init1"):
+        _libc = None
+except (ImportError, OSError):  # pragma: no cover - no inotify: follow() polls
+    _libc = None
+
+
+# fsync policy for appends:
+#   "always"   - fsync after every append (durable on return)
+#   "interval" - fsync at most every FSYNC_INTERVAL seconds
+#   "never"    - leave flushing to the OS
+FSYNC_POLICY = os.getenv("AVOT_LEDGER_FSYNC", "always")
+FSYNC_POLICIES = ("always", "interval", "never")
+FSYNC_INTERVAL = 1.0
+
+SEGMENT_MAX_BYTES = 16 * 1024 * 1024
+SEGMENT_PATTERN = re.compile(r"^segment-(\d{6})\.jsonl$")
+
+# follow(): "auto" uses inotify when available, "poll" always polls.
+# Polling (and, with inotify, the safety re-check) runs every
+# FOLLOW_POLL_INTERVAL seconds.
+FOLLOW_WATCH = os.getenv("AVOT_LEDGER_WATCH", "auto")
+FOLLOW_POLL_INTERVAL = 0.5
+
+_IN_MODIFY, _IN_MOVED_TO, _IN_CREATE = 0x2, 0x80, 0x100
+_IN_NONBLOCK, _IN_CLOEXEC = os.O_NONBLOCK, getattr(os, "O_CLOEXEC", 0)
+
 
 class SignalLedgerError(Exception):
     """Raised when the signal ledger cannot be read or written safely."""
     pass
 
 
+TimeBound = Union[None, float, int, str, datetime]
+
+
+def epoch_seconds(value: TimeBound) -> Optional[float]:
+    """Seconds since the epoch for a timestamp, ISO string or datetime."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return None
+
+
+class SignalIndex:
+    """
+    In-memory secondary indexes over a ledger.
+
+    Signals are numbered in ledger order (their ordinal). For every
+    ordinal the index keeps the record's location, its timestamp, and
+    interned codes for ``avot_id``, ``signal_type`` and ``severity``. Each
+    field value also gets an ascending posting list of ordinals.
+
+    ``refresh`` catches up by reading only the bytes appended since the
+    last refresh, including appends made by other processes. Queries
+    walk the shortest matching posting list and read only the records
+    they return.
+    """
+
+    FIELDS = ("avot_id", "signal_type", "severity")
+
+    def __init__(self, ledger: "SignalLedger"):
+        self._ledger = ledger
+        self._lock = threading.RLock()
+        self._reset(None)
+
+    def _reset(self, header: Optional[Dict[str, Any]]) -> None:
+        self._header_ref = header
+        self.positions: List[Tuple[int, int]] = []  # (segment, offset); segment 0 = YAML
+        self.timestamps = array("d")
+        self.codes = {field: array("I") for field in self.FIELDS}
+        self.values: Dict[str, Dict[Any, int]] = {field: {} for field in self.FIELDS}
+        self.postings: Dict[str, Dict[int, array]] = {field: {} for field in self.FIELDS}
+        self.ids: Dict[str, int] = {}
+        self.time_ordered = True  # timestamps non-decreasing in ledger order
+        self._offsets: Dict[int, int] = {}  # segment number -> bytes indexed
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def _add(self, signal: Dict[str, Any], position: Tuple[int, int]) -> None:
+        ordinal = len(self.positions)
+        self.positions.append(position)
+        stamp = epoch_seconds(signal.get("timestamp"))
+        stamp = math.nan if stamp is None else stamp
+        if self.timestamps and not (stamp >= self.timestamps[-1]):
+            self.time_ordered = False
+        self.timestamps.append(stamp)
+        for field in self.FIELDS:
+            value = signal.get(field)
+            # A missing value is interned as None itself, never as "None"
+            if value is not None and not isinstance(value, (str, int, float)):
+                value = str(value)
+            codes = self.values[field]
+            code = codes.setdefault(value, len(codes))
+            self.codes[field].append(code)
+            self.postings[field].setdefault(code, array("I")).append(ordinal)
+        signal_id = signal.get("signal_id")
+        if signal_id is not None:
+            self.ids[str(signal_id)] = ordinal
+
+    def refresh(self) -> "SignalIndex":
+        """Index everything appended since the last refresh."""
+        with self._lock:
+            header = self._ledger._header()
+            if header is not self._header_ref:
+                self._reset(header)
+                legacy = (header.get("signal_ledger") or {}).get("signals") or []
+                for i, signal in enumerate(legacy):
+                    self._add(signal, (0, i))
+            for path in self._ledger._segments():
+                number = self._ledger._segment_number(path)
+                if self._offsets and number < max(self._offsets):
+                    continue  # closed segments never grow
+                self._scan(path, number)
+        return self
+
+    def _scan(self, path: Path, number: int) -> None:
+        offset = self._offsets.get(number, 0)
+        with path.open("rb") as f:
+            f.seek(offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # only whole records
+        for line in data[:end].splitlines(keepends=True):
+            try:
+                self._add(json.loads(line), (number, offset))
+            except ValueError:
+                pass  # sealed torn record
+            offset += len(line)
+        self._offsets[number] = offset
+
+    def fetch(self, ordinals: Iterable[int]) -> List[Dict[str, Any]]:
+        """Load the records at ``ordinals``."""
+        legacy = (self._header_ref or {}).get("signal_ledger", {}).get("signals") or []
+        handles: Dict[int, Any] = {}
+        try:
+            out = []
+            for ordinal in ordinals:
+                segment, offset = self.positions[ordinal]
+                if segment == 0:
+                    out.append(legacy[offset])
+                    continue
+                if segment not in handles:
+                    handles[segment] = self._ledger._segment_path(segment).open("rb")
+                f = handles[segment]
+                f.seek(offset)
+                out.append(json.loads(f.readline()))
+            return out
+        finally:
+            for f in handles.values():
+                f.close()
+
+    def _codes(self, filters: Dict[str, Any]) -> Optional[Dict[str, set]]:
+        """Interned codes per filtered field; None if a field cannot match."""
+        allowed = {}
+        for field, wanted in filters.items():
+            values = wanted if isinstance(wanted, (list, tuple, set, frozenset)) else [wanted]
+            codes = {self.values[field][v] for v in values if v in self.values[field]}
+            if not codes:
+                return None
+            allowed[field] = codes
+        return allowed
+
+    def _postings(self, field: str, codes: set) -> Any:
+        lists = [self.postings[field][code] for code in codes]
+        return lists[0] if len(lists) == 1 else array("I", heapq.merge(*lists))
+
+    def select(
+        self,
+        filters: Dict[str, Any],
+        since: TimeBound = None,
+        until: TimeBound = None,
+        after: Optional[int] = None,
+        newest_first: bool = False,
+    ) -> Iterator[int]:
+        """Ordinals matching ``filters`` and the time range, in ledger order.
+
+        ``filters`` maps fields to a value or a collection of values.
+        ``since`` is inclusive and ``until`` exclusive. Iteration resumes
+        just past ordinal ``after``, in the chosen direction.
+        """
+        allowed = self._codes(filters)
+        if allowed is None:
+            return
+        lo, hi = epoch_seconds(since), epoch_seconds(until)
+
+        if allowed:
+            # Walk the shortest posting list; check the other fields by code
+            field = min(allowed, key=lambda f: sum(len(self.postings[f][c]) for c in allowed[f]))
+            driver = self._postings(field, allowed[field])
+            checks = [(self.codes[f], codes) for f, codes in allowed.items() if f != field]
+        else:
+            driver, checks = range(len(self.positions)), []
+
+        start, stop = 0, len(driver)
+        if not allowed and self.time_ordered:
+            # Time-ordered ledger: the range is a slice
+            if lo is not None:
+                start = bisect_left(self.timestamps, lo)
+            if hi is not None:
+                stop = bisect_left(self.timestamps, hi)
+        if after is not None:
+            if newest_first:
+                stop = min(stop, bisect_left(driver, after))
+            else:
+                start = max(start, bisect_right(driver, after))
+        span = range(stop - 1, start - 1, -1) if newest_first else range(start, stop)
+
+        for i in span:
+            ordinal = driver[i]
+            stamp = self.timestamps[ordinal]
+            if lo is not None and not stamp >= lo:
+                continue
+            if hi is not None and not stamp < hi:
+                continue
+            if all(column[ordinal] in codes for column, codes in checks):
+                yield ordinal
+
+
+class _SegmentWatcher:
+    """
+    Blocks until the segment directory changes.
+
+    Uses an inotify watch on Linux; elsewhere (or when the directory does
+    not exist yet, or watching is disabled) it simply sleeps for the poll
+    interval. Either way a wait never lasts longer than that interval.
+    """
+
+    def __init__(self, segment_dir: Path, poll_interval: float, use_inotify: bool):
+        self.segment_dir = segment_dir
+        self.poll_interval = poll_interval
+        self.fd: Optional[int] = None
+        if use_inotify and _libc is not None:
+            fd = _libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+            if fd >= 0:
+                self.fd = fd
+        self._watching = False
+
+    def _watch(self) -> bool:
+        if self.fd is not None and not self._watching and self.segment_dir.is_dir():
+            mask = _IN_MODIFY | _IN_MOVED_TO | _IN_CREATE
+            wd = _libc.inotify_add_watch(self.fd, os.fsencode(self.segment_dir), mask)
+            self._watching = wd >= 0
+        return self._watching
+
+    def drain(self) -> None:
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        timeout = self.poll_interval if timeout is None else min(timeout, self.poll_interval)
+        if self._watch():
+            if select.select([self.fd], [], [], timeout)[0]:
+                self.drain()
+        else:
+            time.sleep(timeout)
+
+    async def wait_async(self, timeout: Optional[float] = None) -> None:
+        timeout = self.poll_interval if timeout is None else min(timeout, self.poll_interval)
+        if not self._watch():
+            await asyncio.sleep(timeout)
+            return
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        loop.add_reader(self.fd, lambda: ready.done() or ready.set_result(None))
+        try:
+            await asyncio.wait_for(ready, timeout)
+            self.drain()
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            loop.remove_reader(self.fd)
+
+    def close(self) -> None:
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class SignalFollower:
+    """
+    A live stream of signals appended to a ledger.
+
+    Iterate it with ``for`` or ``async for``. Each wake-up refreshes the
+    ledger's :class:`SignalIndex` (reading only new bytes) and yields the
+    signals that arrived since, filtered through the index, so non-matching
+    signals are never decoded. :attr:`cursor` is the signal_id of the last
+    signal yielded; pass it to ``follow(cursor=...)`` to resume.
+
+    Iteration ends after :meth:`stop`, or once ``idle_timeout`` seconds
+    pass without a matching signal.
+    """
+
+    def __init__(
+        self,
+        ledger: "SignalLedger",
+        filters: Dict[str, Any],
+        cursor: Optional[str],
+        from_start: bool,
+        poll_interval: float,
+        idle_timeout: Optional[float],
+        watch: str,
+    ):
+        if watch not in ("auto", "poll"):
+            raise SignalLedgerError(f"Unknown watch mode '{watch}'")
+        self._ledger = ledger
+        self._filters = filters
+        self._idle_timeout = idle_timeout
+        self._stopped = threading.Event()
+        self._watcher = _SegmentWatcher(ledger.segment_dir, poll_interval, watch == "auto")
+
+        index = ledger.index()
+        self._header_ref = index._header_ref
+        self.cursor = cursor
+        if cursor is not None:
+            if cursor not in index.ids:
+                raise SignalLedgerError(f"Unknown cursor '{cursor}'")
+            self._after = index.ids[cursor]
+        else:
+            self._after = -1 if from_start else len(index) - 1
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._watcher.fd is not None
+
+    def _poll(self) -> List[Dict[str, Any]]:
+        """Signals matching the filters appended since the last poll."""
+        index = self._ledger.index()
+        if index._header_ref is not self._header_ref:
+            # The YAML header changed and the index was rebuilt: re-anchor
+            self._header_ref = index._header_ref
+            if self.cursor in index.ids:
+                self._after = index.ids[self.cursor]
+        end = len(index) - 1
+        ordinals = list(index.select(self._filters, after=self._after))
+        self._after = max([end, self._after] + ordinals[-1:])
+        signals = index.fetch(ordinals)
+        if signals:
+            self.cursor = str(signals[-1].get("signal_id"))
+        return signals
+
+    def _remaining(self, idle_since: float) -> Optional[float]:
+        if self._idle_timeout is None:
+            return None
+        return self._idle_timeout - (time.monotonic() - idle_since)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        try:
+            idle_since = time.monotonic()
+            while not self._stopped.is_set():
+                signals = self._poll()
+                if signals:
+                    yield from signals
+                    idle_since = time.monotonic()
+                    continue
+                remaining = self._remaining(idle_since)
+                if remaining is not None and remaining <= 0:
+                    return
+                self._watcher.wait(remaining)
+        finally:
+            self.close()
+
+    async def __aiter__(self):
+        try:
+            idle_since = time.monotonic()
+            while not self._stopped.is_set():
+                signals = self._poll()
+                if signals:
+                    for signal in signals:
+                        yield signal
+                    idle_since = time.monotonic()
+                    continue
+                remaining = self._remaining(idle_since)
+                if remaining is not None and remaining <= 0:
+                    return
+                await self._watcher.wait_async(remaining)
+        finally:
+            self.close()
+
+    def stop(self) -> None:
+        """End iteration at the next wake-up (at most one poll interval)."""
+        self._stopped.set()
+
+    def close(self) -> None:
+        self._stopped.set()
+        self._watcher.close()
+
+
 class SignalLedger:
     """
     Read / append-only adapter for the Signal Ledger.
@@ -19,16 +433,70 @@ class SignalLedger:
     - appends new signals
     - never mutates or deletes existing signals
     - performs no interpretation
+
+    Storage:
+    - the YAML file holds the ledger header (ledger_id, status,
+      governed_by) and any signals recorded before the log existed
+    - new signals are appended as JSON lines to numbered segments in
+      ``<ledger>.segments/``, rotated at ``SEGMENT_MAX_BYTES``
+
+    An append is one ``write`` to the end of the active segment, so it
+    costs the same however long the ledger is. A crash can at worst leave
+    a torn final line, which readers skip and the next append seals off.
+
+    Concurrency:
+    - writers in different processes (or different ``SignalLedger``
+      objects) take an exclusive ``flock`` on ``<ledger>.segments/.lock``
+      around each write
+    - threads sharing one object use group commit: the first waiting
+      thread writes every queued signal in one ``write`` + ``fsync`` while
+      the rest wait for it, so a burst of appends costs one disk flush
+
+    Queries:
+    - :meth:`query`, :meth:`iter_query` and :meth:`count` filter by AVOT,
+      signal type, severity and time range through a :class:`SignalIndex`
+    - the index is built on first use and afterwards reads only the bytes
+      appended since, including appends made by other writers
+    - :meth:`follow` streams new signals as they are appended, woken by
+      inotify where available and by polling elsewhere
     """
 
-    def __init__(self, ledger_path: str):
+    def __init__(
+        self,
+        ledger_path: str,
+        fsync: Optional[str] = None,
+        segment_max_bytes: Optional[int] = None,
+    ):
         self.ledger_path = Path(ledger_path)
+        self.segment_dir = self.ledger_path.with_suffix(".segments")
+        self.fsync = fsync or FSYNC_POLICY
+        self.segment_max_bytes = segment_max_bytes or SEGMENT_MAX_BYTES
+
+        if self.fsync not in FSYNC_POLICIES:
+            raise SignalLedgerError(f"Unknown fsync policy '{self.fsync}'")
 
         if not self.ledger_path.exists():
             raise SignalLedgerError(
                 f"Signal ledger not found at {self.ledger_path}"
             )
 
+        self._header_cache = None
+        self._fd = None
+        self._segment = None
+        self._last_sync = 0.0
+        self._lock_fd = None
+
+        # Group commit state, guarded by _commit_lock
+        self._commit_lock = threading.Lock()
+        self._committed = threading.Condition(self._commit_lock)
+        self._pending: List[bytes] = []
+        self._batch = 0  # batch currently collecting records
+        self._done = -1  # last batch written (or failed)
+        self._flushing = False
+        self._failures: Dict[int, SignalLedgerError] = {}  # batch -> write error
+
+        self._index: Optional[SignalIndex] = None
+
     # --- Internal helpers ---
 
     def _load(self) -> Dict[str, Any]:
@@ -38,18 +506,186 @@ class SignalLedger:
         except Exception as e:
             raise SignalLedgerError(f"Failed to read signal ledger: {e}")
 
-    def _write(self, data: Dict[str, Any]) -> None:
+    def _header(self) -> Dict[str, Any]:
+        """The YAML ledger, cached until the file changes."""
         try:
-            with self.ledger_path.open("w", encoding="utf-8") as f:
-                yaml.safe_dump(data, f, sort_keys=False)
-        except Exception as e:
+            stamp = self.ledger_path.stat().st_mtime_ns
+        except OSError as e:
+            raise SignalLedgerError(f"Failed to read signal ledger: {e}")
+        if self._header_cache is None or self._header_cache[0] != stamp:
+            self._header_cache = (stamp, self._load())
+        return self._header_cache[1]
+
+    def _segments(self) -> List[Path]:
+        if not self.segment_dir.is_dir():
+            return []
+        return sorted(
+            p for p in self.segment_dir.iterdir() if SEGMENT_PATTERN.match(p.name)
+        )
+
+    def _open_segment(self, path: Path) -> None:
+        self._close_segment()
+        self._fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        self._segment = path
+
+    def _seal(self, fd: int, size: int) -> int:
+        """Terminate a torn record at the end of the segment; returns the size.
+
+        A crashed writer (here or in another process) or a short write can
+        leave a partial last line. Without sealing, the next record would
+        be glued onto it and skipped by readers. Safe: we hold the file
+        lock, so no writer is mid-record.
+        """
+        if size and os.pread(fd, 1, size - 1) != b"\n":
+            os.write(fd, b"\n")
+            size += 1
+        return size
+
+    def _close_segment(self) -> None:
+        if self._fd is not None:
+            if self.fsync != "never":
+                os.fsync(self._fd)
+            os.close(self._fd)
+            self._fd = None
+
+    def _segment_path(self, number: int) -> Path:
+        return self.segment_dir / f"segment-{number:06d}.jsonl"
+
+    @staticmethod
+    def _segment_number(path: Path) -> int:
+        return int(SEGMENT_PATTERN.match(path.name).group(1))
+
+    def _writable_segment(self, incoming: int) -> int:
+        """The fd of the segment to append to; call with the file lock held.
+
+        Another process may have rotated since our last write, so a
+        successor of our segment means ours is closed to appends.
+        """
+        if self._fd is None or self._segment_path(self._segment_number(self._segment) + 1).exists():
+            segments = self._segments()
+            self._open_segment(segments[-1] if segments else self._segment_path(1))
+        size = self._seal(self._fd, os.fstat(self._fd).st_size)
+        if size and size + incoming > self.segment_max_bytes:
+            self._open_segment(self._segment_path(self._segment_number(self._segment) + 1))
+        return self._fd
+
+    def _file_lock(self) -> None:
+        if self._lock_fd is None:
+            self.segment_dir.mkdir(exist_ok=True)
+            self._lock_fd = os.open(self.segment_dir / ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+
+    def _file_unlock(self) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _write_records(self, data: bytes) -> None:
+        """Append ``data`` (whole records) in one write under the file lock."""
+        try:
+            self._file_lock()
+            try:
+                fd = self._writable_segment(len(data))
+                written = os.write(fd, data)
+                if written != len(data):
+                    raise OSError(f"short write ({written} of {len(data)} bytes)")
+                now = time.monotonic()
+                if self.fsync == "always" or (
+                    self.fsync == "interval" and now - self._last_sync >= FSYNC_INTERVAL
+                ):
+                    os.fsync(fd)
+                    self._last_sync = now
+            finally:
+                self._file_unlock()
+        except OSError as e:
             raise SignalLedgerError(f"Failed to write signal ledger: {e}")
 
+    def _commit(self, records: List[bytes]) -> None:
+        """Queue ``records`` and return once they are written (group commit).
+
+        Whichever waiting thread finds no write in progress becomes the
+        leader and writes everything queued so far as one batch.
+        """
+        with self._commit_lock:
+            self._pending.extend(records)
+            batch = self._batch
+            while self._done < batch:
+                if self._flushing:
+                    self._committed.wait()
+                    continue
+                self._flushing = True
+                data, self._pending = b"".join(self._pending), []
+                current, self._batch = self._batch, self._batch + 1
+                self._commit_lock.release()
+                error = None
+                try:
+                    self._write_records(data)
+                except SignalLedgerError as e:
+                    error = e
+                finally:
+                    self._commit_lock.acquire()
+                    self._flushing = False
+                    self._done = current
+                    if error is not None:
+                        self._failures[current] = error
+                        # Waiters re-check right after waking; old entries are never read
+                        for stale in [k for k in self._failures if k < current - 1024]:
+                            del self._failures[stale]
+                    self._committed.notify_all()
+            error = self._failures.get(batch)
+            if error is not None:
+                raise error
+
+    def _iter_segment(self, path: Path) -> Iterator[Dict[str, Any]]:
+        with path.open("rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    return  # torn tail: not yet (or never) fully written
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # sealed torn record
+
     # --- Public API ---
 
+    def header(self) -> Dict[str, Any]:
+        """Ledger metadata (ledger_id, status, governed_by, ...)."""
+        ledger = self._header().get("signal_ledger") or {}
+        return {k: v for k, v in ledger.items() if k != "signals"}
+
+    def iter_signals(self) -> Iterator[Dict[str, Any]]:
+        """Stream every signal in append order without loading the ledger."""
+        ledger = self._header().get("signal_ledger") or {}
+        yield from ledger.get("signals") or []
+        for segment in self._segments():
+            yield from self._iter_segment(segment)
+
     def read_signals(self) -> List[Dict[str, Any]]:
-        ledger = self._load()
-        return ledger.get("signal_ledger", {}).get("signals", [])
+        return list(self.iter_signals())
+
+    @staticmethod
+    def _new_signal(
+        avot_id: str,
+        signal_type: str,
+        description: str,
+        severity: str = "low",
+        context: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        return {
+            "signal_id": f"SIG-{uuid.uuid4()}",
+            "avot_id": avot_id,
+            "signal_type": signal_type,
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "severity": severity,
+            "description": description,
+            "context": context or {},
+            "metadata": metadata or {},
+        }
+
+    @staticmethod
+    def _encode(signal: Dict[str, Any]) -> bytes:
+        return (json.dumps(signal, separators=(",", ":"), default=str) + "\n").encode("utf-8")
 
     def append_signal(
         self,
@@ -69,23 +705,174 @@ class SignalLedger:
         - appends without altering existing entries
         """
 
-        ledger = self._load()
+        if "signal_ledger" not in self._header():
+            raise SignalLedgerError("Invalid signal ledger structure")
+
+        signal = self._new_signal(
+            avot_id, signal_type, description, severity, context, metadata
+        )
+        self._commit([self._encode(signal)])
 
-        if "signal_ledger" not in ledger:
+        return signal
+
+    def append_signals(self, signals: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Append several signals in one commit.
+
+        Each item takes the keyword arguments of ``append_signal``. The
+        signals land contiguously, in order.
+        """
+
+        if "signal_ledger" not in self._header():
             raise SignalLedgerError("Invalid signal ledger structure")
 
-        signal = {
-            "signal_id": f"SIG-{uuid.uuid4()}",
-            "avot_id": avot_id,
-            "signal_type": signal_type,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "severity": severity,
-            "description": description,
-            "context": context or {},
-            "metadata": metadata or {},
+        created = [self._new_signal(**item) for item in signals]
+        if created:
+            self._commit([b"".join(self._encode(signal) for signal in created)])
+        return created
+
+    # --- Queries ---
+
+    def index(self) -> SignalIndex:
+        """The secondary index, caught up with every append so far."""
+        if self._index is None:
+            self._index = SignalIndex(self)
+        return self._index.refresh()
+
+    @staticmethod
+    def _filters(avot_id: Any, signal_type: Any, severity: Any) -> Dict[str, Any]:
+        given = {"avot_id": avot_id, "signal_type": signal_type, "severity": severity}
+        return {field: value for field, value in given.items() if value is not None}
+
+    def query(
+        self,
+        avot_id: Any = None,
+        signal_type: Any = None,
+        severity: Any = None,
+        since: TimeBound = None,
+        until: TimeBound = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        newest_first: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        One page of signals matching every given filter.
+
+        ``avot_id``, ``signal_type`` and ``severity`` each take a value or
+        a list of values. ``since`` (inclusive) and ``until`` (exclusive)
+        take ISO strings, datetimes or epoch seconds.
+
+        Returns ``{"signals": [...], "next_cursor": ...}``. Pass
+        ``next_cursor`` back as ``cursor`` to get the following page; it is
+        None on the last page.
+        """
+        index = self.index()
+        after = None
+        if cursor is not None:
+            if cursor not in index.ids:
+                raise SignalLedgerError(f"Unknown cursor '{cursor}'")
+            after = index.ids[cursor]
+
+        selected = index.select(
+            self._filters(avot_id, signal_type, severity), since, until, after, newest_first
+        )
+        ordinals = [o for _, o in zip(range(limit + 1), selected)]
+        signals = index.fetch(ordinals[:limit])
+        more = len(ordinals) > limit
+        return {
+            "signals": signals,
+            "next_cursor": str(signals[-1]["signal_id"]) if more and signals else None,
         }
 
-        ledger["signal_ledger"].setdefault("signals", []).append(signal)
-        self._write(ledger)
+    def iter_query(
+        self,
+        avot_id: Any = None,
+        signal_type: Any = None,
+        severity: Any = None,
+        since: TimeBound = None,
+        until: TimeBound = None,
+        newest_first: bool = False,
+        page_size: int = 500,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every matching signal, reading ``page_size`` records at a
+        time. The match set is fixed when iteration starts.
+        """
+        index = self.index()
+        selected = index.select(
+            self._filters(avot_id, signal_type, severity), since, until, None, newest_first
+        )
+        while True:
+            page = [o for _, o in zip(range(page_size), selected)]
+            if not page:
+                return
+            yield from index.fetch(page)
 
-        return signal
+    def count(
+        self,
+        avot_id: Any = None,
+        signal_type: Any = None,
+        severity: Any = None,
+        since: TimeBound = None,
+        until: TimeBound = None,
+    ) -> int:
+        """Number of matching signals, without reading any records."""
+        index = self.index()
+        filters = self._filters(avot_id, signal_type, severity)
+        if since is None and until is None and len(filters) == 1:
+            (field, wanted), = filters.items()
+            codes = index._codes(filters)
+            return sum(len(index.postings[field][c]) for c in codes[field]) if codes else 0
+        return sum(1 for _ in index.select(filters, since, until))
+
+    def follow(
+        self,
+        avot_id: Any = None,
+        signal_type: Any = None,
+        severity: Any = None,
+        cursor: Optional[str] = None,
+        from_start: bool = False,
+        poll_interval: float = FOLLOW_POLL_INTERVAL,
+        idle_timeout: Optional[float] = None,
+        watch: Optional[str] = None,
+    ) -> SignalFollower:
+        """
+        Tail the ledger, yielding matching signals as they are appended.
+
+        Starts after ``cursor`` (a signal_id) if given, at the beginning
+        with ``from_start``, and otherwise with the next append. Filters
+        take a value or a list of values, as in :meth:`query`. ``watch`` is
+        ``"auto"`` (inotify where available) or ``"poll"``; it defaults to
+        ``FOLLOW_WATCH``.
+        """
+        return SignalFollower(
+            self,
+            self._filters(avot_id, signal_type, severity),
+            cursor,
+            from_start,
+            poll_interval,
+            idle_timeout,
+            watch or FOLLOW_WATCH,
+        )
+
+    def sync(self) -> None:
+        """Force buffered appends to disk (for ``interval`` / ``never``)."""
+        with self._commit_lock:
+            if self._fd is not None:
+                os.fsync(self._fd)
+                self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        with self._commit_lock:
+            while self._flushing:
+                self._committed.wait()
+            self._close_segment()
+            if self._lock_fd is not None:
+                os.close(self._lock_fd)
+                self._lock_fd = None
+
+    def __enter__(self) -> "SignalLedger":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
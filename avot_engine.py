@@ -6,25 +6,101 @@ It loads avot_registry.json, selects agents by intent, calls the
 OpenAI client, and merges responses. Coherence/ethics will be
 enriched over time.
 """
+import asyncio
 import json
+import time
+from contextlib import aclosing
 from pathlib import Path
-from core.openai_bridge import run_chat
+from clients.rate_limiter import deadline_scope
+from core.event_loop import run_sync
+from core.guardian_verdict import VerdictExtractor, extract_json, extract_verdict
+from core.instrumentation import span
+from core.openai_bridge import run_chat, run_chat_async, run_chat_stream_async
+from core.prompts import resolve_prompt
+from core.registry import get_registry
 
 REGISTRY_PATH = Path(__file__).parent / "avot_registry.json"
 
+# STAGE 1 execution defaults. "parallel" dispatches every routed agent at
+# once; "sequential" preserves the original one-at-a-time behaviour.
+STAGE1_MODE = "parallel"
+STAGE1_MAX_WORKERS = 8
+STAGE1_AGENT_TIMEOUT = None  # seconds; None waits for every agent
+
+# Streaming policy. "hold" buffers agent output until Guardian approves it;
+# "release" streams chunks as they arrive, ahead of the Guardian verdict.
+STREAM_POLICY = "hold"
+
+# Guardian review mode. "merged" reviews the merged output once every agent
+# has finished; "pipelined" reviews each agent's output as soon as it
+# arrives, overlapping review with the agents still generating, and combines
+# the verdicts with combine_guardian_evals.
+GUARDIAN_MODE = "merged"
+
+# When True the Guardian reply is streamed and the stream is closed as soon
+# as a complete verdict object has arrived, instead of waiting for the whole
+# response.
+GUARDIAN_STREAM_VERDICT = False
+
+# Batch defaults (handle_tasks). The concurrency cap is shared by every
+# agent and Guardian call in a batch; Guardian reviews are packed several
+# merged outputs per request.
+BATCH_MAX_CONCURRENCY = 16
+GUARDIAN_BATCH_SIZE = 4
+
+# Intents whose payload is used as an Archivist search query. The top
+# ARCHIVAL_CONTEXT_K snippets are appended to the agent's prompt.
+RETRIEVAL_INTENTS = ("retrieve_context",)
+ARCHIVAL_CONTEXT_K = 5
+
 
 def load_registry():
     with REGISTRY_PATH.open() as f:
         return json.load(f)
 
 
-def build_messages(agent_config, task):
-    system_msg = {"role": "system", "content": agent_config["system_prompt"]}
-    user_msg = {
-        "role": "user",
-        "content": task.get("payload", ""),
-    }
-    return [system_msg, user_msg]
+def _retrieval_query(task):
+    content = task.get("payload", "")
+    if task.get("intent") in RETRIEVAL_INTENTS and isinstance(content, str):
+        return content
+    return None
+
+
+def _archival_snippets(task):
+    """Archivist snippets for a retrieval task (reads the index from disk)."""
+    query = _retrieval_query(task)
+    if query is None:
+        return None
+    from archivist import archival_context
+    return archival_context(query, k=ARCHIVAL_CONTEXT_K)
+
+
+def build_messages(agent_config, task, snippets=None):
+    """Chat messages for ``task``.
+
+    ``snippets`` is precomputed archival context; when None, retrieval
+    tasks look it up here, which blocks on disk reads.
+    """
+    with span("build_messages"):
+        system_msg = {"role": "system", "content": resolve_prompt(agent_config["system_prompt"])}
+        content = task.get("payload", "")
+        if snippets is None:
+            snippets = _archival_snippets(task)
+        if snippets:
+            content += "\n\nARCHIVAL CONTEXT:\n" + json.dumps(snippets, indent=2)
+        user_msg = {
+            "role": "user",
+            "content": content,
+        }
+        return [system_msg, user_msg]
+
+
+async def build_messages_async(agent_config, task):
+    """:func:`build_messages` with the Archivist lookup run off the event loop."""
+    snippets = None
+    if _retrieval_query(task) is not None:
+        snippets = await asyncio.to_thread(_archival_snippets, task)
+    return build_messages(agent_config, task, [] if snippets is None else snippets)
 
 
 def call_agent(agent_config, task):
@@ -34,9 +110,121 @@ def call_agent(agent_config, task):
         messages=messages,
         temperature=agent_config.get("temperature", 0.2),
         max_tokens=agent_config.get("max_tokens", 1024),
+        cache=agent_config.get("cache"),
     )
 
 
+async def call_agent_async(agent_config, task):
+    messages = await build_messages_async(agent_config, task)
+    return await run_chat_async(
+        model=agent_config["model"],
+        messages=messages,
+        temperature=agent_config.get("temperature", 0.2),
+        max_tokens=agent_config.get("max_tokens", 1024),
+        cache=agent_config.get("cache"),
+    )
+
+
+async def call_agent_stream_async(agent_config, task):
+    messages = await build_messages_async(agent_config, task)
+    # aclosing: a consumer that stops early closes the upstream stream now
+    async with aclosing(run_chat_stream_async(
+        model=agent_config["model"],
+        messages=messages,
+        temperature=agent_config.get("temperature", 0.2),
+        max_tokens=agent_config.get("max_tokens", 1024),
+        cache=agent_config.get("cache"),
+    )) as chunks:
+        async for chunk in chunks:
+            yield chunk
+
+
+def _timeout_output(name, timeout):
+    # Shaped like the bridge's serialized error responses
+    return json.dumps({
+        "error": True,
+        "status": "timeout",
+        "content": f"{name} did not respond within {timeout}s.",
+    })
+
+
+async def _timed_call(name, agent_config, task, timeout=None, stage="agent_call"):
+    started = time.perf_counter()
+    with span(stage, agent=name):
+        try:
+            async with asyncio.timeout(timeout):
+                out = await call_agent_async(agent_config, task)
+        except TimeoutError:
+            out = _timeout_output(name, timeout)
+    return out, time.perf_counter() - started
+
+
+async def call_agents_async(agent_configs, task, mode=None, max_workers=None, timeout=None,
+                            on_output=None, slots=None):
+    """Run the primary agent calls for a task.
+
+    ``agent_configs`` is an ordered list of ``(name, config)`` pairs. Results
+    are returned in that same order regardless of completion order, together
+    with a ``{name: seconds}`` latency map.
+
+    In ``"parallel"`` mode all agents are dispatched at once, with at most
+    ``max_workers`` calls in flight. ``timeout`` bounds each agent's own call
+    (time spent waiting for a slot does not count); an agent that misses it
+    is cancelled and gets a timeout error as its output.
+
+    ``on_output``, if given, is a coroutine function called with
+    ``(name, output)`` as soon as each agent finishes. It runs alongside the
+    remaining agents and outside the concurrency cap, and all such calls
+    complete before this function returns.
+
+    ``slots`` may pass an ``asyncio.Semaphore`` shared with other callers
+    (e.g. a batch-wide cap); it replaces the per-call ``max_workers`` cap.
+    """
+    mode = mode or STAGE1_MODE
+    max_workers = max_workers or STAGE1_MAX_WORKERS
+    timeout = STAGE1_AGENT_TIMEOUT if timeout is None else timeout
+    followups = []
+
+    def finished(name, result):
+        if on_output is not None:
+            followups.append(asyncio.ensure_future(on_output(name, result[0])))
+        return result
+
+    if mode not in ("parallel", "sequential"):
+        raise ValueError(f"Unknown STAGE 1 mode '{mode}'")
+    slots = slots or asyncio.Semaphore(1 if mode == "sequential" else max_workers)
+
+    async def bounded(name, cfg):
+        async with slots:
+            result = await _timed_call(name, cfg, task, timeout)
+        return finished(name, result)
+
+    try:
+        if mode == "sequential":
+            results = [await bounded(name, cfg) for name, cfg in agent_configs]
+        else:
+            results = await asyncio.gather(
+                *(bounded(name, cfg) for name, cfg in agent_configs)
+            )
+
+        await asyncio.gather(*followups)
+    finally:
+        for followup in followups:
+            followup.cancel()
+
+    responses = []
+    latency = {}
+    for (name, _), (out, elapsed) in zip(agent_configs, results):
+        responses.append((name, out))
+        latency[name] = elapsed
+    return responses, latency
+
+
+def call_agents(agent_configs, task, mode=None, max_workers=None, timeout=None):
+    """Blocking wrapper around :func:`call_agents_async`."""
+    return run_sync(call_agents_async(agent_configs, task, mode, max_workers, timeout))
+
+
 def normalize_guardian_eval(raw_eval):
     """Normalize Guardian responses to ensure coherence and ethics fields are present."""
 
@@ -70,21 +258,57 @@ def normalize_guardian_eval(raw_eval):
     return normalized
 
 
-# GUARDIAN SYSTEM ENABLED
-def handle_task(task):
+def combine_guardian_evals(named_evals):
+    """Fold per-agent Guardian evaluations into a single verdict.
+
+    ``named_evals`` is an ordered list of ``(agent_name, eval)`` pairs. The
+    combined verdict is as strict as its weakest part: the lowest coherence
+    score, ``ethics_ok`` only if every review passed, and the summaries
+    joined per agent. A single evaluation is returned unchanged.
+    """
+    normalized = [(name, normalize_guardian_eval(e)) for name, e in named_evals]
+    if not normalized:
+        return normalize_guardian_eval(None)
+    if len(normalized) == 1:
+        return normalized[0][1]
+
+    return {
+        "coherence_score": min(e["coherence_score"] for _, e in normalized),
+        "ethics_ok": all(e["ethics_ok"] for _, e in normalized),
+        "summary": "\n".join(f"{name}: {e['summary']}" for name, e in normalized),
+    }
+
+
+def handle_task(task, mode=None, max_workers=None, agent_timeout=None, deadline=None,
+                guardian_mode=None):
     """
     Guardian-wrapped AVOT-Core task handler.
 
-    Pipeline:
-      1. Load registry & routing
-      2. Call selected agents for this intent
-      3. Merge agent responses
-      4. Send merged output to AVOT-Guardian for:
-         - Coherence scoring
-         - Ethics review
-      5. If Guardian score is acceptable -> return merged output
-      6. If Guardian score is low -> return Guardian summary + safe fallback
+    Thin blocking wrapper that runs :func:`handle_task_async` on the shared
+    AVOT event loop; see it for the pipeline and arguments.
+    """
+    return run_sync(
+        handle_task_async(task, mode, max_workers, agent_timeout, deadline, guardian_mode)
+    )
+
+
+async def handle_task_async(task, mode=None, max_workers=None, agent_timeout=None,
+                            deadline=None, guardian_mode=None):
     """
+    Guardian-wrapped AVOT-Core task handler (asyncio).
+
+    ``deadline`` caps the whole pipeline in seconds; when it passes the
+    in-flight calls are cancelled and ``TimeoutError`` is raised. Cancelling
+    the awaiting task cancels every in-flight agent call. The deadline also
+    bounds how long rate-limited calls may back off and retry.
+    """
+    with deadline_scope(deadline), span("task", intent=task.get("intent")):
+        async with asyncio.timeout(deadline):
+            return await _run_pipeline(task, mode, max_workers, agent_timeout, guardian_mode)
+
+
+async def _special_intent(task):
+    """Handle intents served outside the agent pipeline; None otherwise."""
 
     # TCOP integration
     if task.get("intent") == "tcop_heartbeat":
@@ -94,19 +318,19 @@ def handle_task(task):
 
     if task.get("intent") == "system_cycle":
         from core.tcop import generate_cycle_report
-        report = generate_cycle_report()
+        report = await asyncio.to_thread(generate_cycle_report)
         return {"agent": "TCOP", "content": report}
 
     # Phase Inquiry
     if task.get("intent") == "seek_next_phase":
         from core.system_snapshot import generate_snapshot
-        snapshot = generate_snapshot()
+        snapshot = await asyncio.to_thread(generate_snapshot)
 
         # Prepare convergence inquiry
         from convergence.engine import prepare_phase_inquiry, converge
         inquiry = prepare_phase_inquiry(snapshot)
 
-        upstream = converge({
+        upstream = await asyncio.to_thread(converge, {
             "task": {"intent": "synthesize", "payload": inquiry},
             "agent_outputs": [],
             "archival_context": [],
@@ -119,48 +343,28 @@ def handle_task(task):
             "content": upstream
         }
 
-    registry = load_registry()
-    routing = registry.get("routing", {})
-    agents = registry.get("agents", [])
+    return None
 
-    intent = task.get("intent")
-    payload = task.get("payload", "")
-
-    agent_names = routing.get(intent, [])
 
-    if not agent_names:
-        return {
-            "agent": "AVOT-Core",
-            "content": f"No agents registered for intent '{intent}'."
-        }
-
-    # Build name→config map for fast lookup
-    name_to_cfg = {a["name"]: a for a in agents}
-
-    # -----------------------------
-    # STAGE 1: Primary agent calls
-    # -----------------------------
+def _no_agents(intent):
+    return {
+        "agent": "AVOT-Core",
+        "content": f"No agents registered for intent '{intent}'."
+    }
 
-    responses = []
-    for name in agent_names:
-        cfg = name_to_cfg.get(name)
-        if not cfg:
-            continue
 
-        out = call_agent(cfg, task)
-        responses.append((name, out))
-
-    # Simple merge (Guardian will refine)
+def merge_responses(responses):
+    """Merge ``(name, output)`` pairs (Guardian will refine)."""
     if len(responses) == 1:
         agent_name, agent_output = responses[0]
-        merged_output = agent_output
-    else:
-        merged_output = "\n\n".join(
-            [f"### {name}\n{content}" for name, content in responses]
-        )
+        return agent_output
+    return "\n\n".join(
+        [f"### {name}\n{content}" for name, content in responses]
+    )
 
-    # Build Guardian review task
-    guardian_task = {
+
+def build_guardian_task(intent, merged_output):
+    return {
         "intent": "coherence_review",
         "payload": f"""
         Please perform a coherence and ethics evaluation
@@ -181,44 +385,54 @@ def handle_task(task):
         """
     }
 
-    guardian_cfg = name_to_cfg.get("AVOT-Guardian")
-    guardian_raw = call_agent(guardian_cfg, guardian_task) if guardian_cfg else ""
 
-    # -----------------------------
-    # STAGE 2: Guardian evaluation
-    # -----------------------------
-
-    # Attempt JSON extraction
-    try:
-        import json
-        guardian_eval = json.loads(guardian_raw)
-    except Exception:
-        guardian_eval = {
-            "coherence_score": 0.0,
-            "ethics_ok": False,
-            "summary": "Guardian could not parse its own output."
-        }
+def parse_guardian_output(guardian_raw):
+    """Turn raw Guardian output into a normalized evaluation.
 
-    guardian_eval = normalize_guardian_eval(guardian_eval)
+    The verdict may be wrapped in prose or code fences; the first JSON
+    object carrying the verdict keys is used.
+    """
 
+    # Attempt JSON extraction
+    guardian_eval = extract_verdict(guardian_raw)
+    if guardian_eval is None:
+        try:
+            # Serialized bridge errors carry no verdict keys
+            guardian_eval = json.loads(guardian_raw)
+        except Exception:
+            guardian_eval = {
+                "coherence_score": 0.0,
+                "ethics_ok": False,
+                "summary": "Guardian could not parse its own output."
+            }
+
+    return normalize_guardian_eval(guardian_eval)
+
+
+def guardian_approves(guardian_eval):
+    # Acceptable outputs must pass:
+    # - coherence_score >= 0.55
+    # - ethics_ok == True
+    #
+    # These thresholds can later be made dynamic via TIP proposals.
     score = guardian_eval.get("coherence_score", 0.0)
     ethics_ok = guardian_eval.get("ethics_ok", False)
+    return score >= 0.55 and ethics_ok
+
+
+def decide(merged_output, guardian_eval, latency):
+    """Build the task result from the merged output and Guardian verdict."""
 
     # -----------------------------
     # STAGE 3: Decision Logic
     # -----------------------------
 
-    # Acceptable outputs must pass:
-    # - coherence_score >= 0.55
-    # - ethics_ok == True
-    #
-    # These thresholds can later be made dynamic via TIP proposals.
-
-    if score >= 0.55 and ethics_ok:
+    if guardian_approves(guardian_eval):
         return {
             "agent": "AVOT-Core",
             "content": merged_output,
-            "guardian": guardian_eval
+            "guardian": guardian_eval,
+            "latency": latency,
         }
 
     # -----------------------------
@@ -240,10 +454,466 @@ def handle_task(task):
     return {
         "agent": "AVOT-Core",
         "content": safe_fallback,
-        "guardian": guardian_eval
+        "guardian": guardian_eval,
+        "latency": latency,
+    }
+
+
+async def _stream_guardian_verdict(guardian_cfg, guardian_task):
+    """Stream a Guardian reply until its verdict closes.
+
+    Returns ``(raw_text, verdict_or_None, seconds)``; the stream is closed
+    as soon as the verdict is found.
+    """
+    started = time.perf_counter()
+    extractor = VerdictExtractor()
+    parts = []
+    with span("guardian_call", agent="AVOT-Guardian"):
+        async with aclosing(call_agent_stream_async(guardian_cfg, guardian_task)) as chunks:
+            async for chunk in chunks:
+                parts.append(chunk)
+                if extractor.feed(chunk) is not None:
+                    break
+    return "".join(parts), extractor.verdict, time.perf_counter() - started
+
+
+async def _guardian_review(registry, intent, merged_output):
+    """Run the Guardian pass; returns ``(guardian_eval, seconds)``."""
+    guardian_cfg = registry.agent("AVOT-Guardian")
+    guardian_raw, guardian_latency = "", 0.0
+    if guardian_cfg and GUARDIAN_STREAM_VERDICT:
+        guardian_raw, verdict, guardian_latency = await _stream_guardian_verdict(
+            guardian_cfg, build_guardian_task(intent, merged_output)
+        )
+        if verdict is not None:
+            return normalize_guardian_eval(verdict), guardian_latency
+    elif guardian_cfg:
+        guardian_raw, guardian_latency = await _timed_call(
+            "AVOT-Guardian", guardian_cfg, build_guardian_task(intent, merged_output),
+            stage="guardian_call",
+        )
+
+    # -----------------------------
+    # STAGE 2: Guardian evaluation
+    # -----------------------------
+
+    with span("guardian_parse"):
+        guardian_eval = parse_guardian_output(guardian_raw)
+    return guardian_eval, guardian_latency
+
+
+# GUARDIAN SYSTEM ENABLED
+async def _run_pipeline(task, mode, max_workers, agent_timeout, guardian_mode=None):
+    """
+    Guardian-wrapped pipeline shared by the sync and async handlers.
+
+    Pipeline:
+      1. Load registry & routing
+      2. Call selected agents for this intent
+      3. Merge agent responses
+      4. Send merged output to AVOT-Guardian for:
+         - Coherence scoring
+         - Ethics review
+      5. If Guardian score is acceptable -> return merged output
+      6. If Guardian score is low -> return Guardian summary + safe fallback
+
+    ``mode``, ``max_workers`` and ``agent_timeout`` tune STAGE 1 and default
+    to the module-level ``STAGE1_*`` settings; ``guardian_mode`` defaults to
+    ``GUARDIAN_MODE``. Routed results carry a ``latency`` entry with
+    per-agent seconds and the Guardian review time (per agent when
+    pipelined). Each stage is timed through ``core.instrumentation`` spans.
+    """
+
+    special = await _special_intent(task)
+    if special is not None:
+        return special
+
+    with span("registry_load"):
+        registry = get_registry()
+    intent = task.get("intent")
+
+    if not registry.routing.get(intent):
+        return _no_agents(intent)
+
+    # -----------------------------
+    # STAGE 1: Primary agent calls
+    # -----------------------------
+
+    guardian_mode = guardian_mode or GUARDIAN_MODE
+    if guardian_mode not in ("merged", "pipelined"):
+        raise ValueError(f"Unknown Guardian mode '{guardian_mode}'")
+
+    reviews = {}
+
+    async def review(name, output):
+        reviews[name] = await _guardian_review(registry, intent, output)
+
+    responses, agent_latency = await call_agents_async(
+        registry.agents_for(intent),
+        task,
+        mode=mode,
+        max_workers=max_workers,
+        timeout=agent_timeout,
+        on_output=review if guardian_mode == "pipelined" else None,
+    )
+    with span("merge"):
+        merged_output = merge_responses(responses)
+
+    if guardian_mode == "pipelined":
+        guardian_eval = combine_guardian_evals(
+            [(name, reviews[name][0]) for name, _ in responses]
+        )
+        guardian_latency = {name: reviews[name][1] for name, _ in responses}
+    else:
+        guardian_eval, guardian_latency = await _guardian_review(registry, intent, merged_output)
+    latency = {"agents": agent_latency, "guardian": guardian_latency}
+
+    with span("decide"):
+        return decide(merged_output, guardian_eval, latency)
+
+
+def handle_task_stream(task, policy=None, mode=None, max_workers=None, agent_timeout=None,
+                       guardian_mode=None):
+    """Blocking generator over :func:`handle_task_stream_async` events.
+
+    The stream runs on the shared AVOT event loop; closing the generator
+    cancels any agent calls still in flight.
+    """
+    events = handle_task_stream_async(
+        task, policy, mode, max_workers, agent_timeout, guardian_mode
+    )
+    try:
+        while True:
+            try:
+                yield run_sync(anext(events))
+            except StopAsyncIteration:
+                return
+    finally:
+        run_sync(events.aclose())
+
+
+async def _pump_agent(index, name, cfg, task, slots, timeout, queue, review=None):
+    try:
+        async with slots:
+            started = time.perf_counter()
+            parts = []
+            with span("agent_call", agent=name):
+                try:
+                    async with asyncio.timeout(timeout):
+                        async for chunk in call_agent_stream_async(cfg, task):
+                            parts.append(chunk)
+                            await queue.put(("chunk", index, chunk))
+                except TimeoutError:
+                    parts = [_timeout_output(name, timeout)]
+        output = "".join(parts)
+        await queue.put(("done", index, (output, time.perf_counter() - started)))
+
+        if review is not None:
+            await queue.put(("reviewed", index, await review(output)))
+    except Exception as exc:
+        await queue.put(("failed", index, exc))
+
+
+async def handle_task_stream_async(task, policy=None, mode=None, max_workers=None,
+                                   agent_timeout=None, guardian_mode=None):
+    """
+    Streaming variant of :func:`handle_task_async`.
+
+    Yields event dicts as the pipeline progresses:
+
+      {"event": "chunk", "agent": name, "content": text}
+      {"event": "agent_done", "agent": name, "latency": seconds}
+      {"event": "agent_review", "agent": name, "guardian": eval}  # pipelined
+      {"event": "merged", "content": merged_output}
+      {"event": "guardian", "guardian": guardian_eval}
+      {"event": "result", "result": {...}}   # same shape as handle_task
+
+    With ``policy="release"`` chunks and the merged output are yielded as
+    soon as they exist. With ``policy="hold"`` (the default) they are
+    buffered and only yielded once Guardian approves; on a veto they are
+    dropped and only the fallback result is sent. Special intents (TCOP,
+    phase inquiry) yield just their result.
+    """
+    policy = policy or STREAM_POLICY
+    if policy not in ("hold", "release"):
+        raise ValueError(f"Unknown stream policy '{policy}'")
+    mode = mode or STAGE1_MODE
+    if mode not in ("parallel", "sequential"):
+        raise ValueError(f"Unknown STAGE 1 mode '{mode}'")
+    guardian_mode = guardian_mode or GUARDIAN_MODE
+    if guardian_mode not in ("merged", "pipelined"):
+        raise ValueError(f"Unknown Guardian mode '{guardian_mode}'")
+
+    special = await _special_intent(task)
+    if special is not None:
+        yield {"event": "result", "result": special}
+        return
+
+    with span("registry_load"):
+        registry = get_registry()
+    intent = task.get("intent")
+
+    if not registry.routing.get(intent):
+        yield {"event": "result", "result": _no_agents(intent)}
+        return
+
+    # -----------------------------
+    # STAGE 1: Primary agent streams
+    # -----------------------------
+
+    agent_configs = registry.agents_for(intent)
+    timeout = STAGE1_AGENT_TIMEOUT if agent_timeout is None else agent_timeout
+    # The semaphore is FIFO, so a single slot runs agents in routing order
+    slots = asyncio.Semaphore(1 if mode == "sequential" else (max_workers or STAGE1_MAX_WORKERS))
+    queue = asyncio.Queue()
+
+    review = None
+    if guardian_mode == "pipelined":
+        async def review(output):
+            return await _guardian_review(registry, intent, output)
+
+    pumps = [
+        asyncio.create_task(_pump_agent(i, name, cfg, task, slots, timeout, queue, review))
+        for i, (name, cfg) in enumerate(agent_configs)
+    ]
+
+    held = []
+    outputs = {}
+    reviews = {}
+    expected_reviews = len(pumps) if review is not None else 0
+    try:
+        while len(outputs) < len(pumps) or len(reviews) < expected_reviews:
+            kind, index, value = await queue.get()
+            name = agent_configs[index][0]
+            if kind == "failed":
+                raise value
+            if kind == "chunk":
+                event = {"event": "chunk", "agent": name, "content": value}
+                if policy == "release":
+                    yield event
+                else:
+                    held.append(event)
+                continue
+            if kind == "reviewed":
+                reviews[index] = value
+                yield {"event": "agent_review", "agent": name, "guardian": value[0]}
+                continue
+            outputs[index] = value
+            yield {"event": "agent_done", "agent": name, "latency": value[1]}
+    finally:
+        for pump in pumps:
+            pump.cancel()
+        await asyncio.gather(*pumps, return_exceptions=True)
+
+    responses = [(name, outputs[i][0]) for i, (name, _) in enumerate(agent_configs)]
+    agent_latency = {name: outputs[i][1] for i, (name, _) in enumerate(agent_configs)}
+    with span("merge"):
+        merged_output = merge_responses(responses)
+    merged_event = {"event": "merged", "content": merged_output}
+    if policy == "release":
+        yield merged_event
+
+    if review is not None:
+        guardian_eval = combine_guardian_evals(
+            [(name, reviews[i][0]) for i, (name, _) in enumerate(agent_configs)]
+        )
+        guardian_latency = {name: reviews[i][1] for i, (name, _) in enumerate(agent_configs)}
+    else:
+        guardian_eval, guardian_latency = await _guardian_review(registry, intent, merged_output)
+    yield {"event": "guardian", "guardian": guardian_eval}
+
+    if policy == "hold" and guardian_approves(guardian_eval):
+        for event in held:
+            yield event
+        yield merged_event
+
+    latency = {"agents": agent_latency, "guardian": guardian_latency}
+    with span("decide"):
+        result = decide(merged_output, guardian_eval, latency)
+    yield {"event": "result", "result": result}
+
+
+def build_guardian_batch_task(items):
+    """Guardian review task covering several ``(item_id, intent, merged_output)``."""
+    sections = "\n\n".join(
+        f"""        ITEM {item_id}
+        USER INTENT:
+        {intent}
+
+        MERGED RESPONSE:
+        {merged_output}"""
+        for item_id, intent, merged_output in items
+    )
+    return {
+        "intent": "coherence_review",
+        "payload": f"""
+        Please perform a coherence and ethics evaluation of EACH item below
+        according to docs/SIOS-CORE.md and docs/COHERENCE.md.
+        Evaluate every item independently.
+
+{sections}
+
+        Return a JSON array with one block per item:
+        [
+          {{
+            "item": <item number>,
+            "coherence_score": <0-1>,
+            "ethics_ok": true/false,
+            "summary": "short explanation"
+          }}
+        ]
+        """
     }
 
 
+def _item_number(value):
+    """An item id as an int; None for bools and anything non-integral."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return int(value)
+    return None
+
+
+def parse_guardian_batch_output(guardian_raw, item_ids):
+    """Map item ids to normalized evaluations from a batched Guardian reply.
+
+    Items missing from the reply (or an unparseable reply) are left out so
+    the caller can fall back to reviewing them individually.
+    The reply may be wrapped in prose or code fences. Item numbers are
+    matched as integers, so ``"2"`` matches item 2 and ``true`` matches
+    nothing.
+    """
+    def is_batch(value):
+        if isinstance(value, dict):
+            return "items" in value or (len(item_ids) == 1 and "item" in value)
+        return isinstance(value, list) and any(isinstance(entry, dict) for entry in value)
+
+    parsed = extract_json(guardian_raw, is_batch)
+    if isinstance(parsed, dict):
+        parsed = parsed.get("items", [parsed] if len(item_ids) == 1 else [])
+    if not isinstance(parsed, list):
+        return {}
+
+    wanted = {_item_number(item_id): item_id for item_id in item_ids}
+    evals = {}
+    for entry in parsed:
+        if not isinstance(entry, dict):
+            continue
+        number = _item_number(entry.get("item"))
+        if number is not None and number in wanted:
+            evals[wanted[number]] = normalize_guardian_eval(entry)
+    return evals
+
+
+async def _guardian_review_batch(registry, items, slots):
+    """Review ``(item_id, intent, merged_output)`` items with one Guardian call.
+
+    Returns ``{item_id: (guardian_eval, seconds)}``; items the batched reply
+    does not cover are reviewed one by one.
+    """
+    guardian_cfg = registry.agent("AVOT-Guardian")
+    reviews = {}
+    if guardian_cfg and len(items) > 1:
+        async with slots:
+            raw, elapsed = await _timed_call(
+                "AVOT-Guardian", guardian_cfg, build_guardian_batch_task(items),
+                stage="guardian_call",
+            )
+        with span("guardian_parse"):
+            evals = parse_guardian_batch_output(raw, [item_id for item_id, _, _ in items])
+        reviews = {item_id: (evaluation, elapsed) for item_id, evaluation in evals.items()}
+
+    async def single(item_id, intent, merged_output):
+        async with slots:
+            reviews[item_id] = await _guardian_review(registry, intent, merged_output)
+
+    await asyncio.gather(*(
+        single(*item) for item in items if item[0] not in reviews
+    ))
+    return reviews
+
+
+def task_key(task):
+    """Dedup key for :func:`handle_tasks`: tasks with equal keys share one run."""
+    return json.dumps(task, sort_keys=True, default=str)
+
+
+async def handle_tasks_async(tasks, max_concurrency=None, guardian_batch_size=None,
+                             agent_timeout=None):
+    """
+    Run a batch of tasks; returns one result per task, in input order.
+
+    Identical tasks are executed once and share a result. Every agent and
+    Guardian call in the batch shares one concurrency cap
+    (``BATCH_MAX_CONCURRENCY``), and merged outputs are reviewed
+    ``GUARDIAN_BATCH_SIZE`` at a time in a single Guardian request, with
+    per-item verdicts parsed from its reply. Verdict thresholds are the same
+    as :func:`handle_task`.
+    """
+    slots = asyncio.Semaphore(max_concurrency or BATCH_MAX_CONCURRENCY)
+    batch_size = guardian_batch_size or GUARDIAN_BATCH_SIZE
+    with span("registry_load"):
+        registry = get_registry()
+
+    unique = {}
+    for task in tasks:
+        unique.setdefault(task_key(task), task)
+    keys = list(unique)
+    results = {}
+
+    async def stage1(key):
+        task = unique[key]
+        special = await _special_intent(task)
+        if special is not None:
+            results[key] = special
+            return None
+        intent = task.get("intent")
+        if not registry.routing.get(intent):
+            results[key] = _no_agents(intent)
+            return None
+        responses, agent_latency = await call_agents_async(
+            registry.agents_for(intent), task, timeout=agent_timeout, slots=slots
+        )
+        with span("merge"):
+            merged_output = merge_responses(responses)
+        return key, intent, merged_output, agent_latency
+
+    staged = [item for item in await asyncio.gather(*(stage1(k) for k in keys)) if item]
+
+    # -----------------------------
+    # STAGE 2: Batched Guardian evaluation
+    # -----------------------------
+
+    groups = [staged[i:i + batch_size] for i in range(0, len(staged), batch_size)]
+    reviewed = await asyncio.gather(*(
+        _guardian_review_batch(
+            registry,
+            [(item_id, intent, merged) for item_id, (_, intent, merged, _) in enumerate(group, 1)],
+            slots,
+        )
+        for group in groups
+    ))
+
+    for group, reviews in zip(groups, reviewed):
+        for item_id, (key, _, merged_output, agent_latency) in enumerate(group, 1):
+            guardian_eval, guardian_latency = reviews[item_id]
+            latency = {"agents": agent_latency, "guardian": guardian_latency}
+            with span("decide"):
+                results[key] = decide(merged_output, guardian_eval, latency)
+
+    return [dict(results[task_key(task)]) for task in tasks]
+
+
+def handle_tasks(tasks, max_concurrency=None, guardian_batch_size=None, agent_timeout=None):
+    """Blocking wrapper around :func:`handle_tasks_async`."""
+    return run_sync(
+        handle_tasks_async(tasks, max_concurrency, guardian_batch_size, agent_timeout)
+    )
+
+
 if __name__ == "__main__":
     demo_task = {
         "intent": "write_scroll",
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""End-to-end ``handle_task`` benchmark against the local stand-in server.
+
+Starts ``clients.standin_server`` and points the model client at it. It then
+runs ``--tasks`` distinct tasks at each concurrency level and reports
+per-task latency percentiles and throughput, all without a real API key.
+The response cache and single-flight coalescing are switched off for the
+run, and payloads differ per level, so every model call reaches the server.
+
+    python benchmarks/engine_bench.py --concurrency 1,8,32 --latency lognormal:-3,0.5
+    python benchmarks/engine_bench.py --replay fixtures.jsonl --tasks 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+os.environ.setdefault("OPENAI_API_KEY", "standin-key")
+
+import avot_engine  # noqa: E402
+from clients import local_openai_client  # noqa: E402
+from clients.rate_limiter import limiter_stats  # noqa: E402
+from clients.standin_server import StandinServer  # noqa: E402
+from core import response_cache, single_flight  # noqa: E402
+from core.event_loop import run_sync  # noqa: E402
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(1, round(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+async def drive(intent, tasks, concurrency, guardian_mode):
+    slots = asyncio.Semaphore(concurrency)
+    latencies = []
+    vetoed = 0
+
+    async def one(i):
+        nonlocal vetoed
+        task = {
+            "intent": intent,
+            "payload": f"Benchmark request #{i} at concurrency {concurrency}: describe AVOT-Core.",
+        }
+        async with slots:
+            started = time.perf_counter()
+            result = await avot_engine.handle_task_async(task, guardian_mode=guardian_mode)
+            latencies.append(time.perf_counter() - started)
+        if not avot_engine.guardian_approves(result.get("guardian", {})):
+            vetoed += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(tasks)))
+    return latencies, vetoed, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--intent", default="write_scroll")
+    parser.add_argument("--tasks", type=int, default=100)
+    parser.add_argument("--concurrency", default="1,4,16,64")
+    parser.add_argument("--guardian-mode", choices=("merged", "pipelined"), default=None)
+    parser.add_argument("--latency", default="lognormal:-3,0.5",
+                        help="stand-in latency distribution (see latency_sampler)")
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-500", type=float, default=0.0)
+    parser.add_argument("--replay", help="recorded JSONL fixtures to serve")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    # Measure upstream calls, not cache hits or coalesced waiters
+    response_cache.response_cache = None
+    single_flight.single_flight = None
+    with StandinServer(latency=args.latency, rate_429=args.rate_429, rate_500=args.rate_500,
+                       replay=args.replay, seed=args.seed) as server:
+        local_openai_client.set_base_url(server.base_url)
+        local_openai_client.reset_clients()
+
+        print(f"{args.tasks} tasks, intent={args.intent}, latency={args.latency}")
+        print(f"{'concurrency':>11}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+              f"{'tasks/s':>10}{'vetoed':>8}")
+        for level in levels:
+            latencies, vetoed, wall = run_sync(
+                drive(args.intent, args.tasks, level, args.guardian_mode)
+            )
+            print(f"{level:>11}"
+                  f"{percentile(latencies, 50) * 1e3:>10.1f}"
+                  f"{percentile(latencies, 95) * 1e3:>10.1f}"
+                  f"{percentile(latencies, 99) * 1e3:>10.1f}"
+                  f"{args.tasks / wall:>10.1f}{vetoed:>8}")
+
+        print(f"server: {server.stats}")
+        print(f"client pools: {local_openai_client.pool_stats()}")
+        print(f"rate limiter: {limiter_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""Micro-benchmark: Guardian verdict extraction over a corpus of replies.
+
+Compares the previous whole-response ``json.loads`` with the incremental
+``VerdictExtractor``, both one-shot and fed in stream-sized chunks. For each
+strategy it reports how many replies yielded a verdict, the mean time per
+reply, and, for streaming, how much of each reply had to be read.
+
+    python benchmarks/guardian_verdict_bench.py [--corpus PATH] [--chunk 16]
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from core.guardian_verdict import VerdictExtractor, extract_verdict  # noqa: E402
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "data" / "guardian_outputs.jsonl"
+
+
+def load_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def full_parse(raw):
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        return None
+    return value if isinstance(value, dict) and "coherence_score" in value else None
+
+
+def streamed(raw, chunk):
+    """Feed ``raw`` in ``chunk``-sized pieces; returns (verdict, chars read)."""
+    extractor = VerdictExtractor()
+    for start in range(0, len(raw), chunk):
+        if extractor.feed(raw[start:start + chunk]) is not None:
+            return extractor.verdict, min(len(raw), start + chunk)
+    return extractor.finish(), len(raw)
+
+
+def run(corpus, chunk, number):
+    raws = [entry["raw"] for entry in corpus]
+    strategies = {
+        "json.loads": full_parse,
+        "extract_verdict": extract_verdict,
+        f"stream/{chunk}": lambda raw: streamed(raw, chunk)[0],
+    }
+
+    print(f"{len(corpus)} replies, {number} rounds")
+    print(f"{'strategy':<18}{'verdicts':>10}{'correct':>10}{'us/reply':>12}")
+    for name, fn in strategies.items():
+        found = correct = 0
+        for entry in corpus:
+            verdict = fn(entry["raw"])
+            found += verdict is not None
+            expected = entry.get("coherence_score")
+            got = verdict.get("coherence_score") if verdict else None
+            correct += got == expected
+        seconds = timeit.timeit(lambda: [fn(raw) for raw in raws], number=number)
+        per_reply = seconds / (number * len(raws)) * 1e6
+        print(f"{name:<18}{found:>10}{correct:>10}{per_reply:>12.1f}")
+
+    read = sum(streamed(raw, chunk)[1] for raw in raws)
+    total = sum(len(raw) for raw in raws)
+    print(f"streaming read {read}/{total} chars ({read / total:.0%}) before stopping")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS))
+    parser.add_argument("--chunk", type=int, default=16, help="stream chunk size in characters")
+    parser.add_argument("--number", type=int, default=200, help="timing rounds")
+    args = parser.parse_args(argv)
+    run(load_corpus(args.corpus), args.chunk, args.number)
+
+
+if __name__ == "__main__":
+    main()
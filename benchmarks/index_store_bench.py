@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""Benchmark: loading the knowledge index from JSON vs the SQLite store.
+
+Builds a synthetic index of ``--entries`` files and compares:
+
+- loading the whole pretty-printed ``knowledge_index.json``
+- opening the store and looking up one path
+- loading one category lazily
+- streaming every entry
+
+For each, it reports wall time and peak Python heap (``tracemalloc``).
+
+    python benchmarks/index_store_bench.py [--entries 200000]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from archivist.index_store import open_index, write_store  # noqa: E402
+from archivist.indexer import INDEX_KINDS, build_index  # noqa: E402
+
+
+def synthetic_files(count):
+    files = {}
+    for i in range(count):
+        kind = INDEX_KINDS[i % 4] if i % 4 != 2 else "repo_files"
+        rel = f"dir{i % 97}/file{i:07d}.{'md' if kind != 'repo_files' else 'py'}"
+        entry = {"path": rel, "summary": f"Synthetic entry {i} " + "lorem ipsum " * 8}
+        if kind == "scrolls":
+            entry.update(title=f"file{i}", tags=["scroll"], headings=["Intro", "Design"])
+        elif kind == "tips":
+            entry.update(id=f"TIP-{i}", title=f"TIP {i}", status="Draft")
+        else:
+            entry.update(language="py")
+        files[rel] = {"kind": kind, "entry": entry}
+    return files
+
+
+def measure(label, fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<28}{elapsed * 1e3:>12.2f}{peak / 1e6:>12.1f}")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    files = synthetic_files(args.entries)
+    probe = sorted(files)[len(files) // 2]
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path, store_path = Path(tmp) / "index.json", Path(tmp) / "index.sqlite"
+        with open(json_path, "w") as f:
+            json.dump(build_index(files), f, indent=2)
+        write_store(files, store_path, INDEX_KINDS)
+        del files
+
+        print(f"{args.entries} entries: json {json_path.stat().st_size / 1e6:.1f} MB, "
+              f"sqlite {store_path.stat().st_size / 1e6:.1f} MB")
+        print(f"{'operation':<28}{'ms':>12}{'peak MB':>12}")
+
+        def json_lookup():
+            with open(json_path) as f:
+                index = json.load(f)
+            return next(e for kind in index for e in index[kind] if e["path"] == probe)
+
+        def store_lookup():
+            with open_index(store_path) as store:
+                return store.get(probe)
+
+        def store_category():
+            with open_index(store_path) as store:
+                return len(store["tips"])
+
+        def store_stream():
+            with open_index(store_path) as store:
+                return sum(1 for _ in store.iter())
+
+        assert measure("json: load + lookup", json_lookup) == measure("store: open + get", store_lookup)
+        measure("store: one category", store_category)
+        measure("store: stream all", store_stream)
+
+
+if __name__ == "__main__":
+    main()
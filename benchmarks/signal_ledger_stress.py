@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""Stress test: concurrent SignalLedger writers.
+
+Runs ``--processes`` writer processes with ``--threads`` threads each,
+appending to one ledger. It reports throughput for each writer count, then
+re-reads the ledger to check that no signal was lost or duplicated and
+that every thread's appends are in order.
+
+    python benchmarks/signal_ledger_stress.py [--processes 1,2,4,8] [--threads 4] [--appends 500]
+"""
+
+import argparse
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "avot-core" / "adapters"))
+
+from signal_ledger import SignalLedger  # noqa: E402
+
+HEADER = REPO_ROOT / "registry" / "signal_ledger.yaml"
+
+
+def writer(path, process, threads, appends, fsync, start):
+    ledger = SignalLedger(path, fsync=fsync)
+    start.wait()
+
+    def run(thread):
+        for i in range(appends):
+            ledger.append_signal("AVOT-STRESS", "tick", f"{process}:{thread}:{i}")
+
+    workers = [threading.Thread(target=run, args=(t,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    ledger.close()
+
+
+def verify(path, expected, baseline):
+    signals = SignalLedger(path).read_signals()[baseline:]
+    ids = {s["signal_id"] for s in signals}
+    last = {}
+    ordered = True
+    for s in signals:
+        key, i = s["description"].rsplit(":", 1)
+        ordered &= int(i) == last.get(key, -1) + 1
+        last[key] = int(i)
+    return len(signals) == expected and len(ids) == expected and ordered, len(signals)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", default="1,2,4,8")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--appends", type=int, default=500, help="appends per thread")
+    parser.add_argument("--fsync", default="always")
+    args = parser.parse_args(argv)
+
+    ctx = multiprocessing.get_context("fork")
+    print(f"fsync={args.fsync}, {args.threads} threads/process, {args.appends} appends/thread")
+    print(f"{'processes':>10}{'signals':>10}{'seconds':>10}{'signals/s':>12}{'intact':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for processes in (int(p) for p in args.processes.split(",")):
+            path = Path(tmp) / f"p{processes}" / "signal_ledger.yaml"
+            path.parent.mkdir()
+            shutil.copy(HEADER, path)
+            baseline = len(SignalLedger(str(path)).read_signals())
+
+            start = ctx.Event()
+            procs = [
+                ctx.Process(target=writer,
+                            args=(str(path), p, args.threads, args.appends, args.fsync, start))
+                for p in range(processes)
+            ]
+            for p in procs:
+                p.start()
+            started = time.perf_counter()
+            start.set()
+            for p in procs:
+                p.join()
+            elapsed = time.perf_counter() - started
+
+            expected = processes * args.threads * args.appends
+            intact, found = verify(str(path), expected, baseline)
+            print(f"{processes:>10}{found:>10}{elapsed:>10.2f}{expected / elapsed:>12.0f}"
+                  f"{'yes' if intact else 'NO':>8}")
+            if not intact:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
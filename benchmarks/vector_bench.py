@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""Benchmark: Archivist vector search at 10k-1M chunks.
+
+For each corpus size, writes a matrix of clustered random unit vectors in
+the on-disk format of ``archivist.vector_index``, then reports:
+
+- the matrix file size
+- the time to train the IVF index
+- exact and IVF query latency (p50/p95, single and batched)
+- IVF recall@k against exact search
+- peak resident memory
+
+NumPy is strongly recommended at these sizes; without it only the smallest
+size is practical.
+
+    python benchmarks/vector_bench.py [--sizes 10000,100000,1000000] [--dim 256]
+"""
+
+import argparse
+import json
+import math
+import random
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from archivist import vector_index  # noqa: E402
+from archivist.vector_index import VectorIndex, np, write_ivf  # noqa: E402
+
+
+TOPICS = 1000  # chunks cluster around topics, as real scrolls do
+NOISE = 0.6
+
+
+def random_unit_rows(count, dim, rng, topics):
+    """``count`` unit vectors, each a random topic plus Gaussian noise."""
+    if np is not None:
+        gen = np.random.default_rng(rng.randrange(1 << 30))
+        block = topics[gen.integers(len(topics), size=count)]
+        block = block + NOISE / math.sqrt(dim) * gen.standard_normal((count, dim))
+        block /= np.linalg.norm(block, axis=1, keepdims=True)
+        return block.astype("<f4")
+    rows = []
+    for _ in range(count):
+        topic = rng.choice(topics)
+        vec = [x + rng.gauss(0, NOISE / math.sqrt(dim)) for x in topic]
+        rows.append(vector_index.normalize(vec))
+    return rows
+
+
+def make_topics(dim, rng):
+    topics = [vector_index.normalize([rng.gauss(0, 1) for _ in range(dim)]) for _ in range(TOPICS)]
+    return np.asarray(topics) if np is not None else topics
+
+
+def write_corpus(vector_dir, size, dim, rng, topics, block=100_000):
+    """Stream ``size`` random rows to matrix.f32 without holding them all."""
+    with open(vector_dir / "matrix.f32", "wb") as f:
+        for start in range(0, size, block):
+            rows = random_unit_rows(min(block, size - start), dim, rng, topics)
+            if np is not None:
+                f.write(rows.tobytes())
+            else:
+                for row in rows:
+                    f.write(vector_index._packed(row, "f"))
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run(size, dim, queries, k, nprobe, rng):
+    with tempfile.TemporaryDirectory() as tmp:
+        vector_dir = Path(tmp)
+        topics = make_topics(dim, rng)
+        write_corpus(vector_dir, size, dim, rng, topics)
+        started = time.perf_counter()
+        matrix = vector_index.VectorMatrix.open(vector_dir / "matrix.f32", dim)
+        ivf = write_ivf(vector_dir, matrix, int(math.sqrt(size)))
+        train = time.perf_counter() - started
+        meta = {
+            "version": vector_index.FORMAT_VERSION, "embedder": "bench", "dim": dim,
+            "chunks": [None] * size, "ivf": ivf,
+        }
+        (vector_dir / "chunks.json").write_text(json.dumps(meta))
+        index = VectorIndex(vector_dir)
+
+        probes = [list(map(float, q)) for q in random_unit_rows(queries, dim, rng, topics)]
+        timings = {"exact": [], "ivf": []}
+        recall = 0
+        for q in probes:
+            started = time.perf_counter()
+            exact = index.search_vectors([q], k, approximate=False)[0]
+            timings["exact"].append(time.perf_counter() - started)
+            started = time.perf_counter()
+            approx = index.search_vectors([q], k, nprobe=nprobe)[0]
+            timings["ivf"].append(time.perf_counter() - started)
+            recall += len({r for _, r in exact} & {r for _, r in approx})
+        started = time.perf_counter()
+        index.search_vectors(probes, k, approximate=False)
+        batched = (time.perf_counter() - started) / len(probes)
+
+        size_mb = (vector_dir / "matrix.f32").stat().st_size / 1e6
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(
+            f"{size:>9} {size_mb:>9.1f} {train:>8.2f}"
+            f" {percentile(timings['exact'], 50) * 1e3:>9.2f} {percentile(timings['exact'], 95) * 1e3:>9.2f}"
+            f" {batched * 1e3:>9.2f}"
+            f" {percentile(timings['ivf'], 50) * 1e3:>8.2f} {percentile(timings['ivf'], 95) * 1e3:>8.2f}"
+            f" {recall / (k * len(probes)):>8.1%} {peak_mb:>8.0f}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--dim", type=int, default=vector_index.HASHING_DIM)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, default=vector_index.IVF_NPROBE)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    print(f"backend: {'numpy' if np is not None else 'pure python'}, dim {args.dim}, k {args.k}")
+    print(f"{'chunks':>9} {'file MB':>9} {'train s':>8} {'exact p50':>9} {'exact p95':>9}"
+          f" {'batch/q':>9} {'ivf p50':>8} {'ivf p95':>8} {'recall':>8} {'peak MB':>8}")
+    print(f"{'':>9} {'':>9} {'':>8} {'ms':>9} {'ms':>9} {'ms':>9} {'ms':>8} {'ms':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        run(size, args.dim, args.queries, args.k, args.nprobe, rng)
+
+
+if __name__ == "__main__":
+    main()
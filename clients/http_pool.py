@@ -0,0 +1,299 @@
+"""
+Keep-alive connection pools for the stdlib transports.
+
+``LocalOpenAIClient`` prefers ``requests`` / ``aiohttp`` sessions when they
+are installed. Without them it falls back to these pools, which keep idle
+HTTP/1.1 connections per (scheme, host, port) so consecutive agent calls
+skip the TCP+TLS handshake. Both pools count connections opened vs reused.
+"""
+import asyncio
+import http.client
+import ssl
+import threading
+import weakref
+from urllib.parse import urlsplit
+
+# Raised when a pooled connection was closed by the server while idle.
+_STALE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionError,
+    asyncio.IncompleteReadError,
+)
+
+
+def _endpoint(url):
+    parts = urlsplit(url)
+    secure = parts.scheme == "https"
+    port = parts.port or (443 if secure else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    return (parts.scheme, parts.hostname, port), parts.netloc, path
+
+
+class _PoolStats:
+    def __init__(self, size):
+        self.size = size
+        self.opened = 0
+        self.reused = 0
+        self.requests = 0
+
+    def snapshot(self, transport):
+        return {
+            "transport": transport,
+            "pool_size": self.size,
+            "opened": self.opened,
+            "reused": self.reused,
+            "requests": self.requests,
+        }
+
+
+class SyncConnectionPool(_PoolStats):
+    """Thread-safe pool of ``http.client`` connections."""
+
+    def __init__(self, size, timeout=None):
+        super().__init__(size)
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+
+    def _acquire(self, key):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self.reused += 1
+                return idle.pop(), True
+            self.opened += 1
+
+        scheme, host, port = key
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(
+                host, port, timeout=self.timeout, context=self._ssl_context
+            )
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=self.timeout)
+        return conn, False
+
+    def _release(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.size:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def post(self, url, headers, body):
+        """POST ``body`` and return ``(status, text, response_headers)``."""
+        key, _, path = _endpoint(url)
+        data = body.encode("utf-8")
+
+        with self._lock:
+            self.requests += 1
+
+        while True:
+            conn, reused = self._acquire(key)
+            try:
+                conn.request("POST", path, body=data, headers=headers)
+                resp = conn.getresponse()
+                text = resp.read().decode("utf-8", errors="replace")
+            except _STALE_ERRORS:
+                conn.close()
+                if reused:
+                    continue  # idle connection went away; retry on a fresh one
+                raise
+            except BaseException:
+                conn.close()
+                raise
+
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            response_headers = {name.lower(): value for name, value in resp.getheaders()}
+            return resp.status, text, response_headers
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    def stats(self):
+        return self.snapshot("http.client")
+
+
+class AsyncConnectionPool(_PoolStats):
+    """Pool of ``asyncio`` stream connections.
+
+    Streams belong to the loop that opened them, so idle connections are kept
+    per event loop and dropped together with it.
+    """
+
+    def __init__(self, size):
+        super().__init__(size)
+        self._idle = weakref.WeakKeyDictionary()
+        self._ssl_context = ssl.create_default_context()
+
+    def _idle_for(self, key):
+        per_loop = self._idle.setdefault(asyncio.get_running_loop(), {})
+        return per_loop.setdefault(key, [])
+
+    async def _acquire(self, key):
+        idle = self._idle_for(key)
+        while idle:
+            reader, writer = idle.pop()
+            if reader.at_eof() or writer.is_closing():
+                writer.close()
+                continue
+            self.reused += 1
+            return reader, writer, True
+
+        self.opened += 1
+        scheme, host, port = key
+        ssl_context = self._ssl_context if scheme == "https" else None
+        reader, writer = await asyncio.open_connection(host, port, ssl=ssl_context)
+        return reader, writer, False
+
+    def _release(self, key, reader, writer):
+        idle = self._idle_for(key)
+        if len(idle) < self.size:
+            idle.append((reader, writer))
+        else:
+            writer.close()
+
+    def _request_bytes(self, netloc, path, headers, data):
+        lines = [
+            f"POST {path} HTTP/1.1",
+            f"Host: {netloc}",
+            f"Content-Length: {len(data)}",
+            "Connection: keep-alive",
+        ]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + data
+
+    async def _open(self, key, request):
+        """Send ``request`` and read the response head, retrying stale reuse."""
+        while True:
+            reader, writer, reused = await self._acquire(key)
+            try:
+                writer.write(request)
+                await writer.drain()
+                status_line = await reader.readline()
+                if not status_line:
+                    raise ConnectionResetError("connection closed before response")
+                status = int(status_line.split()[1])
+                response_headers = await read_headers(reader)
+            except _STALE_ERRORS:
+                writer.close()
+                if reused:
+                    continue  # idle connection went away; retry on a fresh one
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            return reader, writer, status, response_headers
+
+    def _finish(self, key, reader, writer, response_headers, reusable):
+        if reusable and response_headers.get("connection", "").lower() != "close":
+            self._release(key, reader, writer)
+        else:
+            writer.close()
+
+    async def post(self, url, headers, body):
+        """POST ``body`` and return ``(status, text, response_headers)``."""
+        key, netloc, path = _endpoint(url)
+        request = self._request_bytes(netloc, path, headers, body.encode("utf-8"))
+        self.requests += 1
+
+        reader, writer, status, response_headers = await self._open(key, request)
+        try:
+            raw, reusable = await read_body(reader, response_headers)
+        except BaseException:
+            writer.close()
+            raise
+        self._finish(key, reader, writer, response_headers, reusable)
+        return status, raw.decode("utf-8", errors="replace"), response_headers
+
+    async def post_lines(self, url, headers, body):
+        """POST ``body``; yield ``(status, response_headers)``, then each body line.
+
+        Used for server-sent events. Closing the generator early closes the
+        connection instead of returning it to the pool.
+        """
+        key, netloc, path = _endpoint(url)
+        request = self._request_bytes(netloc, path, headers, body.encode("utf-8"))
+        self.requests += 1
+
+        reader, writer, status, response_headers = await self._open(key, request)
+        completed = False
+        reusable = False
+        try:
+            yield status, response_headers
+            pending = b""
+            async for chunk, reusable in iter_body(reader, response_headers):
+                pending += chunk
+                *lines, pending = pending.split(b"\n")
+                for line in lines:
+                    yield line.rstrip(b"\r").decode("utf-8", errors="replace")
+            if pending:
+                yield pending.rstrip(b"\r").decode("utf-8", errors="replace")
+            completed = True
+        finally:
+            if completed:
+                self._finish(key, reader, writer, response_headers, reusable)
+            else:
+                writer.close()
+
+    def stats(self):
+        return self.snapshot("asyncio")
+
+
+async def read_headers(reader):
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+async def iter_body(reader, headers, read_size=65536):
+    """Yield ``(chunk, connection_reusable)`` pairs as the body arrives."""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await reader.readline()
+                yield b"", True
+                return
+            chunk = await reader.readexactly(size)
+            await reader.readline()
+            yield chunk, False
+    elif "content-length" in headers:
+        remaining = int(headers["content-length"])
+        while remaining:
+            chunk = await reader.readexactly(min(remaining, read_size))
+            remaining -= len(chunk)
+            yield chunk, remaining == 0
+        if int(headers["content-length"]) == 0:
+            yield b"", True
+    else:
+        # Body delimited by connection close; the connection cannot be reused.
+        while True:
+            chunk = await reader.read(read_size)
+            if not chunk:
+                return
+            yield chunk, False
+
+
+async def read_body(reader, headers):
+    """Read a response body; returns ``(body, connection_reusable)``."""
+    chunks = []
+    reusable = False
+    async for chunk, reusable in iter_body(reader, headers):
+        chunks.append(chunk)
+    return b"".join(chunks), reusable
@@ -1,87 +1,429 @@
+import asyncio
+import http.client
 import json
 import os
+import threading
+import time
+import weakref
+
+from clients.http_pool import AsyncConnectionPool, SyncConnectionPool
+from clients.rate_limiter import (
+    MAX_RETRIES,
+    RETRY_STATUSES,
+    backoff_delay,
+    deadline_scope,
+    estimate_tokens,
+    rate_limiter,
+    remaining_budget,
+)
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
 except ImportError:  # pragma: no cover - optional dependency
     requests = None
 
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+# OPENAI_BASE_URL points the client at any OpenAI-compatible server, such as
+# the local stand-in in clients/standin_server.py.
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+CHAT_COMPLETIONS_URL = OPENAI_BASE_URL.rstrip("/") + "/chat/completions"
+
+# Idle keep-alive connections kept per host by the process-wide clients.
+POOL_SIZE = int(os.getenv("AVOT_HTTP_POOL_SIZE", "10"))
+
+
+def set_base_url(base_url):
+    """Send subsequent calls to ``base_url`` (e.g. ``http://127.0.0.1:8089/v1``)."""
+    global OPENAI_BASE_URL, CHAT_COMPLETIONS_URL
+    OPENAI_BASE_URL = base_url
+    CHAT_COMPLETIONS_URL = base_url.rstrip("/") + "/chat/completions"
+
+
+def _missing_key_error():
+    return {
+        "error": True,
+        "status": "missing_api_key",
+        "content": "OPENAI_API_KEY environment variable is not set.",
+    }
+
+
+def _build_payload(model, messages, temperature, max_tokens, stream=False):
+    payload = {
+        "model": model,
+        "messages": messages or [{"role": "user", "content": "Hello"}],
+        "temperature": temperature,
+    }
+    if max_tokens is not None:
+        payload["max_tokens"] = max_tokens
+    if stream:
+        payload["stream"] = True
+        # Ask for a final chunk carrying token usage
+        payload["stream_options"] = {"include_usage": True}
+    return payload
+
+
+def _budget_exhausted(model, delay):
+    rate_limiter.record_exhausted()
+    return {
+        "error": True,
+        "status": "rate_limited",
+        "content": f"{model} is rate limited for {delay:.1f}s, beyond the task's deadline budget.",
+    }
+
+
+def _next_retry_delay(model, attempt, status, headers):
+    """Record the response and return the backoff before retrying, or None."""
+    retry_after = rate_limiter.observe(model, status, headers)
+    if status not in RETRY_STATUSES:
+        return None
+    delay = backoff_delay(attempt, retry_after)
+    if attempt >= MAX_RETRIES or delay > remaining_budget():
+        rate_limiter.record_exhausted()
+        return None
+    rate_limiter.record_retry()
+    return delay
+
+
+def _parse_response(response_status, response_text):
+    if response_status != 200:
+        return {
+            "error": True,
+            "status": response_status,
+            "content": response_text,
+        }
+
+    try:
+        return json.loads(response_text)
+    except Exception:
+        return {
+            "error": True,
+            "status": response_status,
+            "content": response_text,
+        }
+
 
 class LocalOpenAIClient:
-    def __init__(self):
-        self.api_key = os.getenv("OPENAI_API_KEY") or os.getenv("OPENAI")
+    """Chat-completions client holding a keep-alive connection pool.
+
+    Uses a ``requests.Session`` when ``requests`` is installed and a pooled
+    ``http.client`` transport otherwise. Share one instance per process (see
+    :func:`get_client`) so connections are reused across agent calls.
+
+    ``base_url`` and ``api_key`` default to the process configuration
+    (``OPENAI_BASE_URL`` / ``OPENAI_API_KEY``).
+    """
+
+    def __init__(self, pool_size=None, base_url=None, api_key=None):
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY") or os.getenv("OPENAI")
+        self.base_url = base_url
+        self.pool_size = pool_size or POOL_SIZE
+        if requests:
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+            self._pool = None
+        else:
+            self._session = None
+            self._pool = SyncConnectionPool(self.pool_size)
 
     @property
     def is_configured(self):
         return bool(self.api_key)
 
-    def chat(self, model="gpt-4o-mini", messages=None, temperature=0.2, max_tokens=None):
-        if not self.is_configured:
-            return {
-                "error": True,
-                "status": "missing_api_key",
-                "content": "OPENAI_API_KEY environment variable is not set.",
-            }
-
-        url = "https://api.openai.com/v1/chat/completions"
-        headers = {
+    def _chat_url(self):
+        if self.base_url:
+            return self.base_url.rstrip("/") + "/chat/completions"
+        return CHAT_COMPLETIONS_URL
+
+    def _headers(self):
+        return {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}",
         }
-        payload = {
-            "model": model,
-            "messages": messages or [{"role": "user", "content": "Hello"}],
-            "temperature": temperature,
-        }
-        if max_tokens is not None:
-            payload["max_tokens"] = max_tokens
 
-        response_status = None
-        response_text = None
+    def chat(self, model="gpt-4o-mini", messages=None, temperature=0.2, max_tokens=None):
+        """Call chat completions, pacing and retrying through the rate limiter.
 
-        if requests:
-            resp = requests.post(url, headers=headers, data=json.dumps(payload))
-            response_status = resp.status_code
-            response_text = resp.text
-        else:  # Fallback to urllib to avoid external dependency issues
-            import urllib.error
-            import urllib.request
-
-            req = urllib.request.Request(
-                url,
-                data=json.dumps(payload).encode("utf-8"),
-                headers=headers,
-                method="POST",
+        429 and 5xx responses are retried with jittered exponential backoff
+        while the task's deadline budget allows; the last response is
+        returned once retries are exhausted.
+        """
+        if not self.is_configured:
+            return _missing_key_error()
+
+        headers = self._headers()
+        body = json.dumps(_build_payload(model, messages, temperature, max_tokens))
+        tokens = estimate_tokens(messages, max_tokens)
+
+        attempt = 0
+        while True:
+            budget = remaining_budget()
+            delay = rate_limiter.reserve(model, tokens, max_delay=budget)
+            if delay > budget:
+                return _budget_exhausted(model, delay)
+            if delay:
+                time.sleep(delay)
+
+            response_status, response_text, response_headers = self._post(
+                self._chat_url(), headers, body
             )
-            try:
-                with urllib.request.urlopen(req) as resp:  # noqa: S310 - trusted endpoint
-                    response_status = resp.getcode()
-                    response_text = resp.read().decode("utf-8")
-            except urllib.error.HTTPError as exc:  # pragma: no cover - network dependent
-                response_status = exc.code
-                response_text = exc.read().decode("utf-8")
-            except urllib.error.URLError as exc:  # pragma: no cover - network dependent
-                response_status = "network_error"
-                response_text = str(exc.reason)
-
-        if response_status != 200:
-            return {
-                "error": True,
-                "status": response_status,
-                "content": response_text,
-            }
+            backoff = _next_retry_delay(model, attempt, response_status, response_headers)
+            if backoff is None:
+                return _parse_response(response_status, response_text)
+            time.sleep(backoff)
+            attempt += 1
+
+    def _post(self, url, headers, body):
+        if self._session is not None:
+            resp = self._session.post(url, headers=headers, data=body)
+            return resp.status_code, resp.text, {k.lower(): v for k, v in resp.headers.items()}
+
+        # Fallback to http.client to avoid external dependency issues
+        try:
+            return self._pool.post(url, headers, body)
+        except (OSError, http.client.HTTPException) as exc:  # pragma: no cover - network dependent
+            return "network_error", str(exc), {}
+
+    def pool_stats(self):
+        """Return connections opened vs reused by this client."""
+        if self._pool is not None:
+            return self._pool.stats()
+
+        opened = requests_made = 0
+        for adapter in self._session.adapters.values():
+            for key in list(adapter.poolmanager.pools.keys()):
+                pool = adapter.poolmanager.pools.get(key)
+                if pool is not None:
+                    opened += pool.num_connections
+                    requests_made += pool.num_requests
+        return {
+            "transport": "requests",
+            "pool_size": self.pool_size,
+            "opened": opened,
+            "reused": max(0, requests_made - opened),
+            "requests": requests_made,
+        }
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+        else:
+            self._pool.close()
+
+
+class AsyncLocalOpenAIClient(LocalOpenAIClient):
+    """Coroutine flavour of :class:`LocalOpenAIClient`.
+
+    Uses ``aiohttp`` when installed and otherwise speaks HTTP/1.1 directly over
+    pooled ``asyncio`` streams, so no worker thread is held while a request is
+    in flight. Cancelling the awaiting task aborts the request and closes its
+    connection.
+    """
+
+    def __init__(self, pool_size=None, base_url=None, api_key=None):
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY") or os.getenv("OPENAI")
+        self.base_url = base_url
+        self.pool_size = pool_size or POOL_SIZE
+        self._pool = AsyncConnectionPool(self.pool_size)
+        self._sessions = weakref.WeakKeyDictionary()
+        self._trace_counts = {"opened": 0, "reused": 0, "requests": 0}
+
+    async def chat(self, model="gpt-4o-mini", messages=None, temperature=0.2,
+                   max_tokens=None, timeout=None):
+        """Awaitable :meth:`LocalOpenAIClient.chat`; ``timeout`` covers retries too."""
+        if not self.is_configured:
+            return _missing_key_error()
+
+        headers = self._headers()
+        body = json.dumps(_build_payload(model, messages, temperature, max_tokens))
+        tokens = estimate_tokens(messages, max_tokens)
+        post = self._post_aiohttp if aiohttp else self._pool.post
 
         try:
-            return json.loads(response_text)
-        except Exception:
-            return {
-                "error": True,
-                "status": response_status,
-                "content": response_text,
-            }
+            async with asyncio.timeout(timeout):
+                with deadline_scope(timeout):
+                    attempt = 0
+                    while True:
+                        budget = remaining_budget()
+                        delay = rate_limiter.reserve(model, tokens, max_delay=budget)
+                        if delay > budget:
+                            return _budget_exhausted(model, delay)
+                        if delay:
+                            await asyncio.sleep(delay)
+
+                        try:
+                            response_status, response_text, response_headers = await post(
+                                self._chat_url(), headers, body
+                            )
+                        except (OSError, ValueError) as exc:  # pragma: no cover - network dependent
+                            response_status, response_text, response_headers = (
+                                "network_error", str(exc), {}
+                            )
+                        backoff = _next_retry_delay(
+                            model, attempt, response_status, response_headers
+                        )
+                        if backoff is None:
+                            break
+                        await asyncio.sleep(backoff)
+                        attempt += 1
+        except TimeoutError:
+            response_status = "timeout"
+            response_text = f"No response within {timeout}s."
+
+        return _parse_response(response_status, response_text)
+
+    async def chat_stream(self, model="gpt-4o-mini", messages=None, temperature=0.2,
+                          max_tokens=None):
+        """Stream a completion, yielding each parsed server-sent event.
+
+        Events are the ``chat.completion.chunk`` dicts sent by the API. A
+        failed request yields a single error dict shaped like :meth:`chat`'s.
+        Retryable failures are retried before any event is yielded.
+        """
+        if not self.is_configured:
+            yield _missing_key_error()
+            return
+
+        headers = self._headers()
+        body = json.dumps(_build_payload(model, messages, temperature, max_tokens, stream=True))
+        tokens = estimate_tokens(messages, max_tokens)
+        open_lines = self._stream_aiohttp if aiohttp else self._pool.post_lines
+
+        attempt = 0
+        while True:
+            budget = remaining_budget()
+            delay = rate_limiter.reserve(model, tokens, max_delay=budget)
+            if delay > budget:
+                yield _budget_exhausted(model, delay)
+                return
+            if delay:
+                await asyncio.sleep(delay)
+
+            lines = open_lines(self._chat_url(), headers, body)
+            try:
+                try:
+                    status, response_headers = await anext(lines)
+                except (OSError, ValueError) as exc:  # pragma: no cover - network dependent
+                    yield {"error": True, "status": "network_error", "content": str(exc)}
+                    return
 
+                if status != 200:
+                    text = "\n".join([line async for line in lines])
+                    backoff = _next_retry_delay(model, attempt, status, response_headers)
+                    if backoff is None:
+                        yield _parse_response(status, text)
+                        return
+                else:
+                    rate_limiter.observe(model, status, response_headers)
+                    finished = False
+                    async for line in lines:
+                        # Keep reading past [DONE] so the connection can be pooled
+                        if finished or not line.startswith("data:"):
+                            continue
+                        data = line[len("data:"):].strip()
+                        if data == "[DONE]":
+                            finished = True
+                            continue
+                        try:
+                            yield json.loads(data)
+                        except ValueError:
+                            continue
+                    return
+            finally:
+                await lines.aclose()
+
+            await asyncio.sleep(backoff)
+            attempt += 1
+
+    async def _stream_aiohttp(self, url, headers, body):  # pragma: no cover - optional dependency
+        self._trace_counts["requests"] += 1
+        async with self._session().post(url, headers=headers, data=body) as resp:
+            yield resp.status, {k.lower(): v for k, v in resp.headers.items()}
+            async for raw in resp.content:
+                yield raw.decode("utf-8", errors="replace").rstrip("\r\n")
+
+    def _session(self):  # pragma: no cover - optional dependency
+        # aiohttp sessions are bound to the loop they were created on
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            counts = self._trace_counts
+
+            async def on_create(*_args):
+                counts["opened"] += 1
+
+            async def on_reuse(*_args):
+                counts["reused"] += 1
+
+            trace = aiohttp.TraceConfig()
+            trace.on_connection_create_end.append(on_create)
+            trace.on_connection_reuseconn.append(on_reuse)
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                trace_configs=[trace],
+            )
+            self._sessions[loop] = session
+        return session
+
+    async def _post_aiohttp(self, url, headers, body):  # pragma: no cover - optional dependency
+        self._trace_counts["requests"] += 1
+        async with self._session().post(url, headers=headers, data=body) as resp:
+            return resp.status, await resp.text(), {k.lower(): v for k, v in resp.headers.items()}
+
+    def pool_stats(self):
+        if aiohttp:  # pragma: no cover - optional dependency
+            return {"transport": "aiohttp", "pool_size": self.pool_size, **self._trace_counts}
+        return self._pool.stats()
+
+    def close(self):
+        for loop, session in list(self._sessions.items()):  # pragma: no cover - optional dependency
+            if not session.closed and not loop.is_closed():
+                asyncio.run_coroutine_threadsafe(session.close(), loop)
+        self._sessions.clear()
+
+
+# Process-wide clients, created on first use
+
+_client = None
+_async_client = None
+_clients_lock = threading.Lock()
 
-# convenience wrapper
 
 def get_client():
-    return LocalOpenAIClient()
+    global _client
+    with _clients_lock:
+        if _client is None:
+            _client = LocalOpenAIClient()
+        return _client
+
+
+def get_async_client():
+    global _async_client
+    with _clients_lock:
+        if _async_client is None:
+            _async_client = AsyncLocalOpenAIClient()
+        return _async_client
+
+
+def pool_stats():
+    """Connection reuse counters for the process-wide clients."""
+    return {
+        "sync": _client.pool_stats() if _client else None,
+        "async": _async_client.pool_stats() if _async_client else None,
+    }
+
+
+def reset_clients():
+    """Close and drop the process-wide clients (e.g. after changing the API key)."""
+    global _client, _async_client
+    with _clients_lock:
+        for client in (_client, _async_client):
+            if client is not None:
+                client.close()
+        _client = _async_client = None
@@ -0,0 +1,233 @@
+"""
+Transport selection for model calls.
+
+Every subsystem calls models through ``core.openai_bridge.run_chat`` /
+``run_chat_async`` / ``run_chat_stream_async``. Those share the response
+cache, single-flight coalescing and usage instrumentation. The bridge gets
+its clients from :func:`get_client` and :func:`get_async_client` here, and
+the configured transport decides which clients those are:
+
+``http`` (default)
+    The pooled raw-HTTP :class:`~clients.local_openai_client.LocalOpenAIClient`
+    with the adaptive rate limiter.
+``sdk``
+    The official ``openai`` package, using one SDK client per process.
+``standin``
+    An in-process :class:`~clients.standin_server.StandinServer`, reached
+    over the same raw-HTTP client. Use it for offline runs.
+
+All transports expose the same client interface:
+
+- ``chat(model, messages, temperature, max_tokens)``, which returns a
+  completion dict or an ``{"error": True, ...}`` dict
+- the async ``chat(..., timeout=None)``
+- ``chat_stream(...)``
+
+Pick a transport with ``AVOT_MODEL_TRANSPORT`` or :func:`set_transport`, or
+add your own with :func:`register_transport`.
+"""
+import asyncio
+import os
+import threading
+import time
+
+from clients import local_openai_client as _http
+from clients.rate_limiter import deadline_scope, estimate_tokens, rate_limiter, remaining_budget
+
+try:  # New-style OpenAI client
+    from openai import OpenAI
+except ImportError:  # pragma: no cover - optional dependency
+    OpenAI = None  # type: ignore
+
+try:  # Legacy OpenAI client
+    import openai
+except ImportError:  # pragma: no cover - optional dependency
+    openai = None
+
+TRANSPORT = os.getenv("AVOT_MODEL_TRANSPORT", "http")
+STANDIN_LATENCY = os.getenv("AVOT_STANDIN_LATENCY") or None
+
+
+def _sdk_response(resp):
+    """Convert an SDK response object (or legacy dict) to a completion dict."""
+    if isinstance(resp, dict):
+        return resp
+    if hasattr(resp, "model_dump"):
+        return resp.model_dump()
+    response = {"choices": [{"message": {"content": resp.choices[0].message.content}}]}
+    usage = getattr(resp, "usage", None)
+    if usage is not None:
+        response["usage"] = {
+            "prompt_tokens": getattr(usage, "prompt_tokens", None),
+            "completion_tokens": getattr(usage, "completion_tokens", None),
+        }
+    return response
+
+
+class SDKClient:
+    """The ``openai`` SDK behind the :class:`LocalOpenAIClient` interface.
+
+    One SDK client is built per instance and reused, so the SDK's own
+    connection pool is shared across calls. Falls back to the legacy
+    ``openai.ChatCompletion`` API when the new client is unavailable.
+    """
+
+    def __init__(self, base_url=None, api_key=None):
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY") or os.getenv("OPENAI")
+        self.base_url = base_url or _http.OPENAI_BASE_URL
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_configured(self):
+        return bool(self.api_key)
+
+    def _sdk(self):
+        with self._lock:
+            if self._client is None and OpenAI is not None:
+                self._client = OpenAI(api_key=self.api_key, base_url=self.base_url)
+            return self._client
+
+    def _create(self, **params):
+        client = self._sdk()
+        if client is not None:
+            return client.chat.completions.create(**params)
+        if openai is None:
+            raise RuntimeError("openai package not installed; cannot call model")
+        openai.api_key = self.api_key
+        return openai.ChatCompletion.create(**params)
+
+    def chat(self, model="gpt-4o-mini", messages=None, temperature=0.2, max_tokens=None):
+        if not self.is_configured:
+            return _http._missing_key_error()
+
+        params = {"model": model, "messages": messages or [], "temperature": temperature}
+        if max_tokens is not None:
+            params["max_tokens"] = max_tokens
+
+        budget = remaining_budget()
+        delay = rate_limiter.reserve(model, estimate_tokens(messages, max_tokens), max_delay=budget)
+        if delay > budget:
+            return _http._budget_exhausted(model, delay)
+        if delay:
+            time.sleep(delay)
+        try:
+            response = _sdk_response(self._create(**params))
+        except Exception as exc:  # SDK errors carry an HTTP status when there is one
+            status = getattr(exc, "status_code", None) or "sdk_error"
+            rate_limiter.observe(model, status, {})
+            return {"error": True, "status": status, "content": str(exc)}
+        rate_limiter.observe(model, 200, {})
+        return response
+
+    def pool_stats(self):
+        return {"transport": "openai-sdk"}
+
+    def close(self):
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None and hasattr(client, "close"):
+            client.close()
+
+
+class AsyncSDKClient(SDKClient):
+    """Coroutine flavour of :class:`SDKClient`; SDK calls run in a worker thread."""
+
+    async def chat(self, model="gpt-4o-mini", messages=None, temperature=0.2,
+                   max_tokens=None, timeout=None):
+        try:
+            async with asyncio.timeout(timeout):
+                # The worker thread inherits the deadline through the context
+                with deadline_scope(timeout):
+                    return await asyncio.to_thread(
+                        SDKClient.chat, self, model, messages, temperature, max_tokens
+                    )
+        except TimeoutError:
+            return {"error": True, "status": "timeout", "content": f"No response within {timeout}s."}
+
+    async def chat_stream(self, model="gpt-4o-mini", messages=None, temperature=0.2,
+                          max_tokens=None):
+        """Yield the whole completion as a single chunk event."""
+        response = await self.chat(model, messages, temperature, max_tokens)
+        if response.get("error"):
+            yield response
+            return
+        content = response["choices"][0]["message"]["content"]
+        yield {"choices": [{"index": 0, "delta": {"content": content}}],
+               "usage": response.get("usage")}
+
+
+def _standin_base_url():
+    # Called by the stand-in factories, under _lock
+    global _standin
+    if _standin is None:
+        from clients.standin_server import StandinServer
+        _standin = StandinServer(latency=STANDIN_LATENCY).start()
+    return _standin.base_url
+
+
+_standin = None
+
+# name -> (sync factory, async factory); factories build one process-wide client
+_TRANSPORTS = {
+    "http": (_http.LocalOpenAIClient, _http.AsyncLocalOpenAIClient),
+    "sdk": (SDKClient, AsyncSDKClient),
+    "standin": (
+        lambda: _http.LocalOpenAIClient(base_url=_standin_base_url(), api_key="standin"),
+        lambda: _http.AsyncLocalOpenAIClient(base_url=_standin_base_url(), api_key="standin"),
+    ),
+}
+_clients = {}
+_lock = threading.Lock()
+
+
+def register_transport(name, sync_factory, async_factory):
+    """Make ``name`` selectable; factories take no arguments."""
+    with _lock:
+        _TRANSPORTS[name] = (sync_factory, async_factory)
+
+
+def set_transport(name):
+    """Switch the process-wide transport; existing clients are closed."""
+    global TRANSPORT
+    if name not in _TRANSPORTS:
+        raise ValueError(f"Unknown model transport '{name}'")
+    reset_clients()
+    TRANSPORT = name
+
+
+def _client_for(kind):
+    if TRANSPORT == "http":
+        # Shares the raw-HTTP singletons (and their pools) with direct users
+        return _http.get_client() if kind == 0 else _http.get_async_client()
+    with _lock:
+        key = (TRANSPORT, kind)
+        if key not in _clients:
+            if TRANSPORT not in _TRANSPORTS:
+                raise ValueError(f"Unknown model transport '{TRANSPORT}'")
+            _clients[key] = _TRANSPORTS[TRANSPORT][kind]()
+        return _clients[key]
+
+
+def get_client():
+    """Process-wide sync client for the configured transport."""
+    return _client_for(0)
+
+
+def get_async_client():
+    """Process-wide async client for the configured transport."""
+    return _client_for(1)
+
+
+def reset_clients():
+    """Close every process-wide client (all transports)."""
+    global _standin
+    _http.reset_clients()
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        standin, _standin = _standin, None
+    for client in clients:
+        client.close()
+    if standin is not None:
+        standin.stop()
@@ -0,0 +1,236 @@
+"""
+Adaptive rate limiting and retry scheduling for upstream model calls.
+
+Each model gets a pair of token buckets (requests/minute and
+tokens/minute). Buckets start unlimited and learn their size from the
+``x-ratelimit-*`` headers the API returns; a ``retry-after`` on a 429
+pauses the model until it passes. Callers reserve capacity before a
+request and sleep for the returned delay, so the same limiter serves
+threads and coroutines.
+
+Retryable failures (429 and 5xx) are retried with full-jitter
+exponential backoff, bounded by the task's deadline budget: the engine
+publishes its deadline through :data:`deadline_var`, and calls made
+outside a task fall back to ``RETRY_BUDGET`` seconds.
+"""
+import contextvars
+import math
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRIES = int(os.getenv("AVOT_MAX_RETRIES", "4"))
+BACKOFF_BASE = 0.5  # seconds
+BACKOFF_CAP = 20.0  # seconds
+RETRY_BUDGET = float(os.getenv("AVOT_RETRY_BUDGET", "60"))
+
+# Absolute time.monotonic() deadline of the task currently being served.
+deadline_var = contextvars.ContextVar("avot_task_deadline", default=None)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+@contextmanager
+def deadline_scope(seconds):
+    """Publish a deadline ``seconds`` from now (None: no deadline).
+
+    An enclosing, earlier deadline is kept.
+    """
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    current = deadline_var.get()
+    token = deadline_var.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        deadline_var.reset(token)
+
+
+def remaining_budget():
+    """Seconds left for retries in the current task."""
+    deadline = deadline_var.get()
+    if deadline is None:
+        return RETRY_BUDGET
+    return max(0.0, deadline - time.monotonic())
+
+
+def parse_duration(value):
+    """Parse header durations such as ``"1s"``, ``"6m0s"``, ``"20ms"`` or ``"2"``."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def estimate_tokens(messages, max_tokens):
+    """Rough prompt+completion token estimate (~4 characters per token)."""
+    chars = sum(len(str(m.get("content", ""))) for m in messages or [])
+    return chars // 4 + (max_tokens or 0)
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Full-jitter exponential backoff, never shorter than ``retry_after``."""
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+class TokenBucket:
+    """Token bucket whose balance may go negative to queue reservations."""
+
+    def __init__(self, capacity=math.inf, refill_per_second=math.inf):
+        self.capacity = capacity
+        self.rate = refill_per_second
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        if self.rate != math.inf:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_for(self, amount, now):
+        """How long a reservation of ``amount`` would wait, without debiting."""
+        if self.capacity == math.inf:
+            return 0.0
+        self._refill(now)
+        level = self.level - amount
+        if level >= 0:
+            return 0.0
+        return -level / self.rate if self.rate else math.inf
+
+    def reserve(self, amount, now):
+        """Debit ``amount`` and return how long the caller must wait."""
+        delay = self.wait_for(amount, now)
+        if self.capacity != math.inf:
+            self.level -= amount
+        return delay
+
+    def learn(self, limit, remaining, reset, now):
+        """Resize from ``limit`` per minute and sync the balance to ``remaining``."""
+        if limit:
+            self.capacity = float(limit)
+            self.rate = self.capacity / 60.0
+        if remaining is not None and self.capacity != math.inf:
+            self._refill(now)
+            self.level = min(self.level, float(remaining))
+            if reset and remaining == 0:
+                self.level = min(self.level, -reset * self.rate)
+
+
+class RateLimiter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}  # model -> (requests bucket, tokens bucket)
+        self._paused_until = {}
+        self.throttled = 0
+        self.retried = 0
+        self.exhausted = 0
+
+    def _for(self, model):
+        buckets = self._buckets.get(model)
+        if buckets is None:
+            buckets = self._buckets[model] = (TokenBucket(), TokenBucket())
+        return buckets
+
+    def reserve(self, model, tokens, max_delay=None):
+        """Reserve one request and ``tokens`` tokens; returns the delay to wait.
+
+        If the delay would exceed ``max_delay`` nothing is reserved and the
+        delay is returned, so a caller that gives up leaves the capacity
+        to others.
+        """
+        now = time.monotonic()
+        with self._lock:
+            requests, token_bucket = self._for(model)
+            paused = self._paused_until.get(model, 0.0) - now
+            if max_delay is not None:
+                needed = max(
+                    requests.wait_for(1, now), token_bucket.wait_for(tokens, now), paused
+                )
+                if needed > max_delay:
+                    return needed
+            delay = max(
+                requests.reserve(1, now),
+                token_bucket.reserve(tokens, now),
+                paused,
+            )
+            if delay > 0:
+                self.throttled += 1
+            return max(0.0, delay)
+
+    def observe(self, model, status, headers):
+        """Learn limits from response headers; returns a retry-after hint."""
+        headers = headers or {}
+        now = time.monotonic()
+        retry_after = parse_duration(headers.get("retry-after-ms"))
+        if retry_after is not None:
+            retry_after /= 1000.0
+        else:
+            retry_after = parse_duration(headers.get("retry-after"))
+
+        with self._lock:
+            requests, token_bucket = self._for(model)
+            requests.learn(
+                _int(headers.get("x-ratelimit-limit-requests")),
+                _int(headers.get("x-ratelimit-remaining-requests")),
+                parse_duration(headers.get("x-ratelimit-reset-requests")),
+                now,
+            )
+            token_bucket.learn(
+                _int(headers.get("x-ratelimit-limit-tokens")),
+                _int(headers.get("x-ratelimit-remaining-tokens")),
+                parse_duration(headers.get("x-ratelimit-reset-tokens")),
+                now,
+            )
+            if status == 429 and retry_after:
+                self._paused_until[model] = max(
+                    self._paused_until.get(model, 0.0), now + retry_after
+                )
+        return retry_after
+
+    def record_retry(self):
+        with self._lock:
+            self.retried += 1
+
+    def record_exhausted(self):
+        with self._lock:
+            self.exhausted += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "throttled": self.throttled,
+                "retried": self.retried,
+                "exhausted": self.exhausted,
+            }
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+rate_limiter = RateLimiter()
+
+
+def limiter_stats():
+    """Throttled / retried / exhausted counters for the shared limiter."""
+    return rate_limiter.stats()
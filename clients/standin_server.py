@@ -0,0 +1,361 @@
+#!/usr/bin/env python
+"""
+Local OpenAI-compatible stand-in server for offline tests and benchmarks.
+
+Serves ``POST /v1/chat/completions`` (plain and ``stream: true``) with
+synthetic replies. Guardian review prompts get a JSON verdict, or a JSON
+array for batched reviews, so the engine pipeline runs end to end.
+
+* **Latency** is sampled per request from a distribution spec
+  (see :func:`latency_sampler`); streamed replies also wait
+  ``chunk_delay`` between chunks.
+* **Errors** are injected at configurable rates: ``429`` (with
+  ``retry-after-ms``), ``500`` and ``timeout`` (the request hangs, then
+  the connection is dropped).
+* **Record / replay**: with ``upstream`` set, requests are forwarded to a
+  real API and the replies appended to a JSONL fixture file. With
+  ``replay`` set, replies are served from such a file, keyed like the
+  response cache.
+
+Point the client at it with ``OPENAI_BASE_URL=http://127.0.0.1:<port>/v1``
+or :func:`clients.local_openai_client.set_base_url`::
+
+    python clients/standin_server.py --port 8089 --latency lognormal:-2.5,0.4 --rate-429 0.02
+"""
+import argparse
+import hashlib
+import http.client
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+if __package__ in (None, ""):  # run as a script
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from clients.http_pool import SyncConnectionPool  # noqa: E402
+from core.response_cache import cache_key  # noqa: E402
+
+_WORDS = (
+    "coherence resonance scroll kodex flame garden lattice signal phase "
+    "harmonic archive guardian convergence tyme quill pattern thread light"
+).split()
+_ITEM = re.compile(r"ITEM (\d+)")
+
+
+def latency_sampler(spec, rng=None):
+    """Return a zero-argument function sampling request latency in seconds.
+
+    ``spec`` is ``None`` / ``"0"`` (no delay), a number (fixed),
+    ``"fixed:s"``, ``"uniform:lo,hi"``, ``"normal:mean,sd"``,
+    ``"lognormal:mu,sigma"`` (of the underlying normal) or ``"exp:mean"``.
+    Samples are clamped at zero.
+    """
+    rng = rng or random.Random()
+    if spec in (None, "", 0, "0"):
+        return lambda: 0.0
+    if isinstance(spec, (int, float)):
+        return lambda: float(spec)
+
+    kind, _, args = str(spec).partition(":")
+    if not args:
+        kind, args = "fixed", kind
+    params = [float(a) for a in args.split(",")]
+    draw = {
+        "fixed": lambda: params[0],
+        "uniform": lambda: rng.uniform(params[0], params[1]),
+        "normal": lambda: rng.gauss(params[0], params[1]),
+        "lognormal": lambda: rng.lognormvariate(params[0], params[1]),
+        "exp": lambda: rng.expovariate(1.0 / params[0]),
+    }.get(kind)
+    if draw is None:
+        raise ValueError(f"Unknown latency distribution '{kind}'")
+    return lambda: max(0.0, draw())
+
+
+def request_key(request):
+    """Fixture key for a chat completion request body."""
+    return cache_key(
+        request.get("model"),
+        request.get("messages"),
+        request.get("temperature"),
+        request.get("max_tokens"),
+    )
+
+
+def synthetic_reply(request, words=40, guardian_score=0.9):
+    """Deterministic reply text for ``request``."""
+    messages = request.get("messages") or []
+    prompt = str(messages[-1].get("content", "")) if messages else ""
+
+    if "coherence and ethics evaluation" in prompt:  # Guardian review tasks
+        verdict = {"coherence_score": guardian_score, "ethics_ok": True,
+                   "summary": "Stand-in review: coherent."}
+        items = _ITEM.findall(prompt)
+        if items:
+            return json.dumps([dict(verdict, item=int(i)) for i in items])
+        return json.dumps(verdict)
+
+    seed = int(hashlib.sha256(json.dumps(messages, sort_keys=True).encode()).hexdigest()[:8], 16)
+    rng = random.Random(seed)
+    if request.get("max_tokens"):
+        words = min(words, request["max_tokens"])
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def _completion(request, content):
+    prompt_chars = sum(len(str(m.get("content", ""))) for m in request.get("messages") or [])
+    return {
+        "id": "chatcmpl-standin",
+        "object": "chat.completion",
+        "model": request.get("model"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_chars // 4,
+            "completion_tokens": len(content.split()),
+            "total_tokens": prompt_chars // 4 + len(content.split()),
+        },
+    }
+
+
+class StandinServer:
+    """Threaded stand-in; use as a context manager or call start()/stop()."""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=None, chunk_delay=0.0,
+                 rate_429=0.0, rate_500=0.0, rate_timeout=0.0, hang=30.0,
+                 replay=None, record=None, upstream=None, words=40,
+                 guardian_score=0.9, chunk_words=4, seed=None):
+        self.rng = random.Random(seed)
+        self.latency = latency_sampler(latency, self.rng)
+        self.chunk_delay = chunk_delay
+        self.rates = {429: rate_429, 500: rate_500, "timeout": rate_timeout}
+        self.hang = hang
+        self.words = words
+        self.guardian_score = guardian_score
+        self.chunk_words = chunk_words
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.record_path = record
+        self.fixtures = {}
+        if replay:
+            with open(replay, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.fixtures[entry["key"]] = entry["response"]
+
+        self._lock = threading.Lock()
+        self._upstream_pool = SyncConnectionPool(4) if self.upstream else None
+        self.stats = {"requests": 0, "streamed": 0, "replayed": 0, "recorded": 0,
+                      "injected_429": 0, "injected_500": 0, "injected_timeout": 0}
+
+        server = self
+
+        class Handler(_Handler):
+            standin = server
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._upstream_pool is not None:
+            self._upstream_pool.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_exc):
+        self.stop()
+
+    def count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def draw_fault(self):
+        """Pick an injected fault for this request, or None."""
+        with self._lock:
+            roll = self.rng.random()
+        for fault, rate in self.rates.items():
+            if roll < rate:
+                return fault
+            roll -= rate
+        return None
+
+    def reply(self, request, authorization):
+        """Return ``(status, response, headers)`` for ``request``.
+
+        ``response`` is the completion dict for a 200. Any other upstream
+        reply is passed through as its raw body text, with the upstream's
+        headers, and is never recorded as a fixture.
+        """
+        key = request_key(request)
+        if key in self.fixtures:
+            self.count("replayed")
+            return 200, self.fixtures[key], {}
+
+        if self.upstream:
+            body = dict(request)
+            body.pop("stream", None)
+            body.pop("stream_options", None)
+            try:
+                status, text, headers = self._upstream_pool.post(
+                    self.upstream + "/chat/completions",
+                    {"Content-Type": "application/json", "Authorization": authorization},
+                    json.dumps(body),
+                )
+            except (OSError, http.client.HTTPException) as exc:
+                return 502, json.dumps({"error": {"message": f"upstream unreachable: {exc}"}}), {}
+            if status != 200:
+                return status, text, headers
+            response = json.loads(text)
+            if self.record_path:
+                with self._lock:
+                    self.fixtures[key] = response
+                    with open(self.record_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps({"key": key, "request": body, "response": response}) + "\n")
+                    self.stats["recorded"] += 1
+            return 200, response, {}
+
+        return 200, _completion(request, synthetic_reply(request, self.words, self.guardian_score)), {}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    standin = None
+
+    def do_POST(self):
+        server = self.standin
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        server.count("requests")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            return self._json(404, {"error": {"message": f"unknown path {self.path}"}})
+
+        time.sleep(server.latency())
+        fault = server.draw_fault()
+        if fault == "timeout":
+            server.count("injected_timeout")
+            time.sleep(server.hang)
+            self.close_connection = True
+            return None
+        if fault == 429:
+            server.count("injected_429")
+            return self._json(429, {"error": {"message": "rate limited (injected)"}},
+                              {"retry-after-ms": "50"})
+        if fault == 500:
+            server.count("injected_500")
+            return self._json(500, {"error": {"message": "server error (injected)"}})
+
+        status, response, headers = server.reply(request, self.headers.get("Authorization", ""))
+        if status != 200:
+            return self._raw(status, response, headers)
+        if request.get("stream"):
+            server.count("streamed")
+            return self._stream(request, response)
+        return self._json(200, response)
+
+    def _json(self, status, payload, headers=None):
+        out = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(out)
+
+    def _raw(self, status, text, headers):
+        """Send an upstream error reply as it came, minus hop-by-hop headers."""
+        out = text.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", headers.get("content-type", "application/json"))
+        self.send_header("Content-Length", str(len(out)))
+        for name, value in headers.items():
+            if name.startswith(("retry-after", "x-ratelimit-")):
+                self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(out)
+
+    def _stream(self, request, response):
+        server = self.standin
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        words = response["choices"][0]["message"]["content"].split(" ")
+        step = max(1, server.chunk_words)
+        for start in range(0, len(words), step):
+            piece = " ".join(words[start:start + step])
+            if start:
+                piece = " " + piece
+                time.sleep(server.chunk_delay)
+            self._event({"object": "chat.completion.chunk",
+                         "choices": [{"index": 0, "delta": {"content": piece}}]})
+        if (request.get("stream_options") or {}).get("include_usage"):
+            self._event({"object": "chat.completion.chunk", "choices": [],
+                         "usage": response.get("usage")})
+        self._chunk(b"data: [DONE]\n\n")
+        self._chunk(b"")
+
+    def _event(self, payload):
+        self._chunk(f"data: {json.dumps(payload)}\n\n".encode())
+
+    def _chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, *_args):
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", help="e.g. 0.05, uniform:0.01,0.1, lognormal:-2.5,0.4")
+    parser.add_argument("--chunk-delay", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-500", type=float, default=0.0)
+    parser.add_argument("--rate-timeout", type=float, default=0.0)
+    parser.add_argument("--replay", help="serve replies from a recorded JSONL fixture file")
+    parser.add_argument("--record", help="append upstream replies to this JSONL file")
+    parser.add_argument("--upstream", help="real API base URL to forward to, e.g. https://api.openai.com/v1")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    server = StandinServer(
+        host=args.host, port=args.port, latency=args.latency, chunk_delay=args.chunk_delay,
+        rate_429=args.rate_429, rate_500=args.rate_500, rate_timeout=args.rate_timeout,
+        replay=args.replay, record=args.record, upstream=args.upstream, seed=args.seed,
+    )
+    print(f"stand-in listening on {server.base_url}", file=sys.stderr)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,12 +5,14 @@ and Guardian constraints to produce unified insights.
 """
 import json
 from pathlib import Path
-from clients.openai_client import run_chat_completion
+from core.openai_bridge import run_chat
+from core.prompts import read_prompt
 
 PROMPT_PATH = Path(__file__).resolve().parents[1] / "prompts" / "convergence_prompt.txt"
+PHASE_INQUIRY_PROMPT_PATH = Path(__file__).resolve().parents[1] / "prompts" / "phase_inquiry_prompt.txt"
 
 def load_prompt():
-    return PROMPT_PATH.read_text()
+    return read_prompt(PROMPT_PATH)
 
 def converge(inputs):
     """
@@ -20,15 +22,24 @@ def converge(inputs):
       "archival_context": [...],
       "guardian_context": {...}
     }
+
+    An optional ``archival_query`` fills an empty ``archival_context``
+    with Archivist search snippets.
     """
     system_prompt = load_prompt()
+    query = inputs.get("archival_query")
+    if query:
+        from archivist import archival_context
+        inputs = {k: v for k, v in inputs.items() if k != "archival_query"}
+        if not inputs.get("archival_context"):
+            inputs["archival_context"] = archival_context(query)
 
     messages = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": json.dumps(inputs)}
     ]
 
-    raw = run_chat_completion(
+    raw = run_chat(
         model="gpt-5.1",
         messages=messages,
         temperature=0.1,
@@ -36,13 +47,16 @@ def converge(inputs):
     )
 
     try:
-        return json.loads(raw)
+        data = json.loads(raw)
     except:
         return {"synthesis": raw}
+    # Serialized bridge errors are reported as the synthesis text
+    if not isinstance(data, dict) or data.get("error"):
+        return {"synthesis": raw}
+    return data
 
 
 # Phase Inquiry helper
 def prepare_phase_inquiry(snapshot):
-    prompt_path = Path(__file__).resolve().parents[1] / "prompts" / "phase_inquiry_prompt.txt"
-    template = prompt_path.read_text()
+    template = read_prompt(PHASE_INQUIRY_PROMPT_PATH)
     return template + "\n\nSYSTEM SNAPSHOT:\n" + json.dumps(snapshot, indent=2)
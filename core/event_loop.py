@@ -0,0 +1,51 @@
+"""
+Shared event loop for AVOT-Core.
+
+Synchronous entry points (``avot_engine.handle_task`` and friends) submit
+their coroutines to one long-lived loop running on a daemon thread, so sync
+and async callers share the same loop and its in-flight work, and sync
+callers work even when invoked from inside another running loop. The
+exception is the shared loop's own thread: code running on it must await
+the coroutine instead, and ``run_sync`` raises rather than deadlock.
+"""
+import asyncio
+import threading
+
+_loop = None
+_thread = None
+_lock = threading.Lock()
+
+
+def get_loop():
+    """Return the shared loop, starting its thread on first use."""
+    global _loop, _thread
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="avot-event-loop", daemon=True
+            )
+            thread.start()
+            _loop, _thread = loop, thread
+        return _loop
+
+
+def run_sync(coro, timeout=None):
+    """Run ``coro`` on the shared loop and block until it finishes.
+
+    If ``timeout`` elapses first the coroutine is cancelled and
+    ``TimeoutError`` is raised. Calling it from the shared loop's thread
+    raises ``RuntimeError``: blocking there would wait on itself forever.
+    """
+    loop = get_loop()
+    if threading.current_thread() is _thread:
+        coro.close()
+        raise RuntimeError(
+            "run_sync() called from the shared event loop thread; await the coroutine instead"
+        )
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout)
+    except BaseException:
+        future.cancel()
+        raise
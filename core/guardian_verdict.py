@@ -0,0 +1,135 @@
+"""
+Incremental extraction of Guardian verdicts.
+
+Guardian is asked for a bare JSON block, but models often wrap it in prose
+or code fences. :class:`VerdictExtractor` scans text as it arrives and
+returns the first balanced JSON object that carries every verdict key. It
+tracks brace nesting and string state, so callers can stop reading a
+stream as soon as the verdict closes. Braces inside JSON strings are
+handled, and only candidate objects that mention every key are handed
+to ``json.loads``.
+"""
+import json
+import re
+
+VERDICT_KEYS = ("coherence_score", "ethics_ok", "summary")
+
+# Characters that matter outside / inside a JSON string
+_STRUCTURAL = re.compile(r'[{}"]')
+_STRING_END = re.compile(r'["\\]')
+_JSON_START = re.compile(r"[\[{]")
+
+_decoder = json.JSONDecoder()
+
+
+class VerdictExtractor:
+    """Feed text chunks; :attr:`verdict` is set once a verdict object closes."""
+
+    def __init__(self, keys=VERDICT_KEYS):
+        self.keys = tuple(keys)
+        self._needles = tuple(f'"{key}"' for key in self.keys)
+        self._text = ""
+        self._pos = 0
+        self._starts = []  # offsets of currently open '{'
+        self._in_string = False
+        self.verdict = None
+
+    def feed(self, chunk):
+        """Scan ``chunk``; returns the verdict dict once found, else None."""
+        if self.verdict is not None:
+            return self.verdict
+        self._text += chunk
+        text = self._text
+        pos = self._pos
+
+        while True:
+            if self._in_string:
+                match = _STRING_END.search(text, pos)
+                if match is None:
+                    pos = max(pos, len(text))
+                    break
+                if match.group() == "\\":
+                    pos = match.end() + 1  # may point past the buffer until more arrives
+                    continue
+                self._in_string = False
+                pos = match.end()
+                continue
+
+            match = _STRUCTURAL.search(text, pos)
+            if match is None:
+                pos = len(text)
+                break
+            char, pos = match.group(), match.end()
+            if char == "{":
+                self._starts.append(pos - 1)
+            elif char == '"':
+                # Quotes in surrounding prose are not JSON strings
+                self._in_string = bool(self._starts)
+            elif self._starts:
+                verdict = self._candidate(text[self._starts.pop():pos])
+                if verdict is not None:
+                    self.verdict = verdict
+                    break
+
+        self._pos = pos
+        return self.verdict
+
+    def finish(self):
+        """Called at end of input: retry every ``{`` with a full JSON decode.
+
+        This recovers verdicts that the streaming scan lost track of, for
+        example after an unbalanced quote in the surrounding prose.
+        """
+        if self.verdict is not None:
+            return self.verdict
+        text = self._text
+        start = text.find("{")
+        while start != -1:
+            try:
+                value, _ = _decoder.raw_decode(text, start)
+            except ValueError:
+                value = None
+            if self._is_verdict(value):
+                self.verdict = value
+                break
+            start = text.find("{", start + 1)
+        return self.verdict
+
+    def _candidate(self, blob):
+        if not all(needle in blob for needle in self._needles):
+            return None
+        try:
+            value = json.loads(blob)
+        except ValueError:
+            return None
+        return value if self._is_verdict(value) else None
+
+    def _is_verdict(self, value):
+        return isinstance(value, dict) and all(key in value for key in self.keys)
+
+
+def extract_json(text, accept):
+    """Return the first JSON object or array in ``text`` that ``accept``s.
+
+    Like :meth:`VerdictExtractor.finish`, every ``{`` and ``[`` is tried
+    with a full decode, so values wrapped in prose or code fences are
+    found. Meant for complete replies, not streams.
+    """
+    if not isinstance(text, str):
+        return None
+    for match in _JSON_START.finditer(text):
+        try:
+            value, _ = _decoder.raw_decode(text, match.start())
+        except ValueError:
+            continue
+        if accept(value):
+            return value
+    return None
+
+
+def extract_verdict(text, keys=VERDICT_KEYS):
+    """Return the first verdict object embedded in ``text``, or None."""
+    if not isinstance(text, str):
+        return None
+    extractor = VerdictExtractor(keys)
+    return extractor.feed(text) or extractor.finish()
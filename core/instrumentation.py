@@ -0,0 +1,261 @@
+"""
+Pluggable instrumentation for the engine pipeline.
+
+The engine wraps each stage (registry load, message build, agent and
+Guardian calls, merge, Guardian parse, decision) in :func:`span`, and the
+bridge reports completion ``usage`` through :func:`record_usage`. Both go to
+the installed hook. The default hook does nothing, and its spans are one
+shared null context manager.
+
+:class:`MetricsRecorder` keeps per-stage latency histograms, per-agent
+token counters and recent spans. It exports them as Prometheus text or
+as OTLP/JSON traces. Setting ``AVOT_METRICS`` to ``prometheus`` or ``otlp``
+installs a recorder at import time. The recorder writes to
+``AVOT_METRICS_PATH`` (``-`` for stdout) when the process exits.
+"""
+import atexit
+import bisect
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+METRICS_FORMAT = os.getenv("AVOT_METRICS", "").lower() or None
+METRICS_PATH = os.getenv("AVOT_METRICS_PATH", "-")
+
+STAGE_SECONDS = "avot_stage_seconds"
+TOKENS_TOTAL = "avot_tokens_total"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SPAN_BUFFER = 4096
+
+_NULL_SPAN = nullcontext()
+
+# Agent whose call is in progress, so nested stages and usage are attributed to it
+agent_var = contextvars.ContextVar("avot_agent", default=None)
+_span_var = contextvars.ContextVar("avot_span", default=None)
+
+
+class Instrumentation:
+    """No-op hook. Subclasses record spans, histograms and counters."""
+
+    enabled = False
+
+    def span(self, name, **attrs):
+        return _NULL_SPAN
+
+    def observe(self, name, value, **labels):
+        pass
+
+    def count(self, name, value=1, **labels):
+        pass
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def add(self, buckets, value):
+        index = bisect.bisect_left(buckets, value)
+        if index < len(buckets):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRecorder(Instrumentation):
+    """In-process recorder with Prometheus and OTLP/JSON exports."""
+
+    enabled = True
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, span_buffer=SPAN_BUFFER):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._histograms = {}  # (name, labels) -> _Histogram
+        self._counters = {}  # (name, labels) -> value
+        self.spans = deque(maxlen=span_buffer)
+
+    @contextmanager
+    def span(self, name, **attrs):
+        parent = _span_var.get()
+        record = {
+            "name": name,
+            "attrs": attrs,
+            "trace_id": parent["trace_id"] if parent else os.urandom(16).hex(),
+            "span_id": os.urandom(8).hex(),
+            "parent_id": parent["span_id"] if parent else None,
+            "start_ns": time.time_ns(),
+        }
+        span_token = _span_var.set(record)
+        agent_token = agent_var.set(attrs["agent"]) if "agent" in attrs else None
+        started = time.perf_counter()
+        try:
+            yield record
+        except BaseException as exc:
+            record["error"] = type(exc).__name__
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            record["end_ns"] = record["start_ns"] + int(elapsed * 1e9)
+            if agent_token is not None:
+                agent_var.reset(agent_token)
+            _span_var.reset(span_token)
+            labels = {"stage": name}
+            agent = attrs.get("agent") or agent_var.get()
+            if agent:
+                labels["agent"] = agent
+            self.observe(STAGE_SECONDS, elapsed, **labels)
+            self.spans.append(record)
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(self.buckets)
+            histogram.add(self.buckets, value)
+
+    def count(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def snapshot(self):
+        """Return ``{"histograms": ..., "counters": ...}`` keyed by (name, labels)."""
+        with self._lock:
+            histograms = {
+                key: {"buckets": list(h.counts), "sum": h.sum, "count": h.count}
+                for key, h in self._histograms.items()
+            }
+            return {"histograms": histograms, "counters": dict(self._counters)}
+
+    def to_prometheus(self):
+        """Render metrics in the Prometheus text exposition format."""
+        snap = self.snapshot()
+        lines = []
+        typed = set()
+
+        def header(name, kind):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), h in sorted(snap["histograms"].items()):
+            header(name, "histogram")
+            cumulative = 0
+            for bound, count in zip(self.buckets, h["buckets"]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(labels, le=_number(bound))} {cumulative}")
+            lines.append(f'{name}_bucket{_labels(labels, le="+Inf")} {h["count"]}')
+            lines.append(f"{name}_sum{_labels(labels)} {_number(h['sum'])}")
+            lines.append(f"{name}_count{_labels(labels)} {h['count']}")
+        for (name, labels), value in sorted(snap["counters"].items()):
+            header(name, "counter")
+            lines.append(f"{name}{_labels(labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def to_otlp(self, service_name="avot-core"):
+        """Render recorded spans as an OTLP/JSON ``ExportTraceServiceRequest``."""
+        spans = []
+        for record in list(self.spans):
+            span = {
+                "traceId": record["trace_id"],
+                "spanId": record["span_id"],
+                "name": record["name"],
+                "kind": 1,
+                "startTimeUnixNano": str(record["start_ns"]),
+                "endTimeUnixNano": str(record["end_ns"]),
+                "attributes": [
+                    {"key": key, "value": {"stringValue": str(value)}}
+                    for key, value in record["attrs"].items()
+                ],
+            }
+            if record["parent_id"]:
+                span["parentSpanId"] = record["parent_id"]
+            if "error" in record:
+                span["status"] = {"code": 2, "message": record["error"]}
+            spans.append(span)
+        return {
+            "resourceSpans": [{
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": service_name}}
+                    ]
+                },
+                "scopeSpans": [{"scope": {"name": "avot_engine"}, "spans": spans}],
+            }]
+        }
+
+    def export(self, path="-", fmt="prometheus"):
+        """Write metrics (``prometheus``) or spans (``otlp``) to ``path`` or stdout."""
+        if fmt == "prometheus":
+            text = self.to_prometheus()
+        elif fmt == "otlp":
+            text = json.dumps(self.to_otlp()) + "\n"
+        else:
+            raise ValueError(f"Unknown metrics format '{fmt}'")
+
+        if path in (None, "-"):
+            sys.stdout.write(text)
+            sys.stdout.flush()
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in pairs
+    )
+    return "{" + body + "}"
+
+
+hook = Instrumentation()
+
+
+def get_hook():
+    return hook
+
+
+def set_hook(new_hook):
+    """Install ``new_hook`` (None restores the no-op) and return the previous one."""
+    global hook
+    previous, hook = hook, new_hook or Instrumentation()
+    return previous
+
+
+def span(name, **attrs):
+    """Time a pipeline stage on the installed hook."""
+    return hook.span(name, **attrs)
+
+
+def record_usage(model, usage):
+    """Count a completion's ``usage`` tokens against the current agent."""
+    if not hook.enabled or not isinstance(usage, dict):
+        return
+    agent = agent_var.get() or "unknown"
+    for kind in ("prompt_tokens", "completion_tokens"):
+        tokens = usage.get(kind)
+        if isinstance(tokens, int):
+            hook.count(TOKENS_TOTAL, tokens, agent=agent, model=model, kind=kind[:-len("_tokens")])
+
+
+if METRICS_FORMAT:
+    _recorder = MetricsRecorder()
+    set_hook(_recorder)
+    atexit.register(_recorder.export, METRICS_PATH, METRICS_FORMAT)
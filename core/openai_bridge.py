@@ -1,8 +1,54 @@
-"""Minimal bridge module connecting AVOT and TCOP to the LocalOpenAIClient."""
+"""Minimal bridge module connecting AVOT and TCOP to the LocalOpenAIClient.
+
+This is the single model-call entry point for the engine, TCOP,
+convergence and scripts. Clients come from ``clients.model_client``, so the
+transport (raw HTTP, OpenAI SDK, local stand-in) is configured in one place.
+"""
 import json
+from contextlib import aclosing
 from typing import Any
 
-from clients.local_openai_client import get_client
+from clients.model_client import get_async_client, get_client
+from core import response_cache as _cache
+from core import single_flight as _flight
+from core.instrumentation import record_usage
+
+
+def _extract_content(response: Any) -> Any:
+    if isinstance(response, dict) and response.get("error"):
+        # Bubble up serialized error information for diagnostics
+        return json.dumps(response)
+
+    try:
+        return response["choices"][0]["message"]["content"]
+    except Exception:
+        return response
+
+
+def _record_usage(model, response):
+    if isinstance(response, dict):
+        record_usage(model, response.get("usage"))
+
+
+def _cache_key(model, messages, kwargs):
+    """Return the response-cache key for this call, or None to bypass."""
+    temperature = kwargs.get("temperature", 0.2)
+    if _cache.response_cache is None or not _cache.should_cache(temperature, kwargs.get("cache")):
+        return None
+    return _cache.cache_key(model, messages, temperature, kwargs.get("max_tokens"))
+
+
+def _flight_key(model, messages, kwargs):
+    """Return the single-flight key for this call, or None to bypass."""
+    if _flight.single_flight is None or kwargs.get("coalesce") is False:
+        return None
+    return _cache.cache_key(
+        model, messages, kwargs.get("temperature", 0.2), kwargs.get("max_tokens")
+    )
+
+
+def _is_error(response: Any) -> bool:
+    return not isinstance(response, dict) or bool(response.get("error"))
 
 
 def run_chat(model: str, messages, **kwargs) -> Any:
@@ -10,20 +56,114 @@ def run_chat(model: str, messages, **kwargs) -> Any:
 
     Falls back to returning the raw response if the expected message format is
     unavailable (e.g., error responses or unexpected payloads).
+
+    ``cache`` selects the response-cache policy: ``None`` caches only
+    temperature-0 calls, ``True`` / ``False`` force it on or off. Identical
+    concurrent calls share one upstream request unless ``coalesce=False``.
     """
-    client = get_client()
-    response: Any = client.chat(
+    key = _cache_key(model, messages, kwargs)
+    if key is not None:
+        hit, content = _cache.response_cache.get(key)
+        if hit:
+            return content
+
+    def fetch():
+        client = get_client()
+        response = client.chat(
+            model=model,
+            messages=messages,
+            temperature=kwargs.get("temperature", 0.2),
+            max_tokens=kwargs.get("max_tokens"),
+        )
+        # Recorded by the caller that went upstream, not by coalesced waiters
+        _record_usage(model, response)
+        return response
+
+    flight_key = _flight_key(model, messages, kwargs)
+    if flight_key is None:
+        response: Any = fetch()
+    else:
+        response = _flight.single_flight.do(flight_key, fetch)
+    content = _extract_content(response)
+
+    if key is not None and not _is_error(response):
+        _cache.response_cache.put(key, content)
+    return content
+
+
+async def run_chat_async(model: str, messages, **kwargs) -> Any:
+    """Awaitable counterpart of :func:`run_chat`.
+
+    Accepts an extra ``timeout`` (seconds) after which the call resolves to a
+    serialized ``timeout`` error instead of content.
+    """
+    key = _cache_key(model, messages, kwargs)
+    if key is not None:
+        hit, content = _cache.response_cache.get(key)
+        if hit:
+            return content
+
+    async def fetch():
+        client = get_async_client()
+        response = await client.chat(
+            model=model,
+            messages=messages,
+            temperature=kwargs.get("temperature", 0.2),
+            max_tokens=kwargs.get("max_tokens"),
+            timeout=kwargs.get("timeout"),
+        )
+        _record_usage(model, response)
+        return response
+
+    flight_key = _flight_key(model, messages, kwargs)
+    if flight_key is None:
+        response: Any = await fetch()
+    else:
+        response = await _flight.single_flight.do_async(flight_key, fetch)
+    content = _extract_content(response)
+
+    if key is not None and not _is_error(response):
+        _cache.response_cache.put(key, content)
+    return content
+
+
+async def run_chat_stream_async(model: str, messages, **kwargs):
+    """Stream a completion, yielding content deltas as they arrive.
+
+    Errors are yielded as one serialized chunk, as :func:`run_chat` returns
+    them. Response-cache hits are yielded whole; single-flight coalescing
+    does not apply to streams.
+    """
+    key = _cache_key(model, messages, kwargs)
+    if key is not None:
+        hit, content = _cache.response_cache.get(key)
+        if hit:
+            yield content
+            return
+
+    client = get_async_client()
+    parts = []
+    failed = False
+    # aclosing: a consumer that stops early closes the HTTP stream now
+    async with aclosing(client.chat_stream(
         model=model,
         messages=messages,
         temperature=kwargs.get("temperature", 0.2),
         max_tokens=kwargs.get("max_tokens"),
-    )
+    )) as events:
+        async for event in events:
+            if event.get("error"):
+                failed = True
+                yield json.dumps(event)
+                continue
+            _record_usage(model, event)
+            try:
+                delta = event["choices"][0]["delta"].get("content")
+            except (KeyError, IndexError, AttributeError):
+                continue
+            if delta:
+                parts.append(delta)
+                yield delta
 
-    if isinstance(response, dict) and response.get("error"):
-        # Bubble up serialized error information for diagnostics
-        return json.dumps(response)
-
-    try:
-        return response["choices"][0]["message"]["content"]
-    except Exception:
-        return response
+    if key is not None and not failed:
+        _cache.response_cache.put(key, "".join(parts))
@@ -0,0 +1,79 @@
+"""
+Prompt store for AVOT-Core.
+
+Registry entries may set ``system_prompt`` to a ``<USE_FILE:path>``
+directive instead of inline text. The store resolves those directives
+(paths are relative to the project root) and keeps file contents in
+memory, keyed by path and re-validated against the file's mtime at most
+once per ``check_interval`` seconds, so steady-state lookups never touch
+the disk.
+"""
+import re
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+USE_FILE_PATTERN = re.compile(r"^\s*<USE_FILE:([^>]+)>\s*$")
+
+# Seconds between mtime checks for a cached prompt file.
+PROMPT_CHECK_INTERVAL = 1.0
+
+
+class PromptStore:
+    def __init__(self, root=PROJECT_ROOT, check_interval=PROMPT_CHECK_INTERVAL):
+        self.root = Path(root)
+        self.check_interval = check_interval
+        self._entries = {}  # path -> (mtime_ns, checked_at, text)
+        self._lock = threading.Lock()
+
+    def _path(self, path):
+        path = Path(path)
+        return path if path.is_absolute() else self.root / path
+
+    def read(self, path):
+        """Return the text of a prompt file, reading it only when it changed."""
+        path = self._path(path)
+        now = time.monotonic()
+        entry = self._entries.get(path)
+        if entry is not None and now - entry[1] < self.check_interval:
+            return entry[2]
+
+        with self._lock:
+            mtime_ns = path.stat().st_mtime_ns
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == mtime_ns:
+                text = entry[2]
+            else:
+                text = path.read_text()
+            self._entries[path] = (mtime_ns, now, text)
+            return text
+
+    def resolve(self, value):
+        """Expand a ``<USE_FILE:...>`` directive; other strings pass through."""
+        if not isinstance(value, str):
+            return value
+        match = USE_FILE_PATTERN.match(value)
+        if match is None:
+            return value
+        return self.read(match.group(1).strip())
+
+    def invalidate(self, path=None):
+        """Drop one cached prompt, or all of them."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(self._path(path), None)
+
+
+prompt_store = PromptStore()
+
+
+def read_prompt(path):
+    return prompt_store.read(path)
+
+
+def resolve_prompt(value):
+    return prompt_store.resolve(value)
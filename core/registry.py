@@ -1,6 +1,13 @@
 """Registry utilities for AVOT-Core."""
+import hashlib
 import json
+import threading
+from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Tuple
+
+from core.prompts import resolve_prompt
 
 # Registry lives at project root alongside ``avot_engine.py``
 REGISTRY_PATH = Path(__file__).resolve().parent.parent / "avot_registry.json"
@@ -12,4 +19,119 @@ def load_registry():
         return json.load(f)
 
 
-__all__ = ["load_registry", "REGISTRY_PATH"]
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@dataclass(frozen=True)
+class CompiledRegistry:
+    """Read-only view of ``avot_registry.json`` with a precomputed routing index.
+
+    ``routes`` maps each intent to its ``(name, config)`` pairs in routing
+    order, skipping names without an agent entry. As in the raw registry, a
+    later agent entry with the same name wins.
+    """
+
+    agents: Tuple[Mapping[str, Any], ...]
+    by_name: Mapping[str, Mapping[str, Any]]
+    routing: Mapping[str, Tuple[str, ...]]
+    routes: Mapping[str, Tuple[Tuple[str, Mapping[str, Any]], ...]]
+    digest: str = ""
+
+    def agents_for(self, intent) -> Tuple[Tuple[str, Mapping[str, Any]], ...]:
+        return self.routes.get(intent, ())
+
+    def agent(self, name) -> Optional[Mapping[str, Any]]:
+        return self.by_name.get(name)
+
+
+def compile_registry(data, digest=""):
+    """Build a :class:`CompiledRegistry` from raw registry data.
+
+    ``<USE_FILE:...>`` system prompts are resolved here so missing prompt
+    files surface at compile time and the prompt store starts warm.
+    """
+    agents = _freeze(data.get("agents", []))
+    for agent in agents:
+        resolve_prompt(agent.get("system_prompt"))
+    by_name = {a["name"]: a for a in agents}
+    routing = _freeze(data.get("routing", {}))
+    routes = {
+        intent: tuple((name, by_name[name]) for name in names if name in by_name)
+        for intent, names in routing.items()
+    }
+    return CompiledRegistry(
+        agents=agents,
+        by_name=MappingProxyType(by_name),
+        routing=routing,
+        routes=MappingProxyType(routes),
+        digest=digest,
+    )
+
+
+class RegistryCache:
+    """Compiles a registry file once and recompiles only when it changes.
+
+    Each lookup costs a single ``stat``. When the file's mtime or size moves
+    the content hash is checked, so touching the file without editing it
+    does not trigger a rebuild.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._compiled = None
+
+    def get(self) -> CompiledRegistry:
+        st = self.path.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._stamp and self._compiled is not None:
+            return self._compiled
+        with self._lock:
+            if stamp != self._stamp or self._compiled is None:
+                self._refresh(stamp)
+            return self._compiled
+
+    def reload(self) -> CompiledRegistry:
+        """Recompile from disk unconditionally."""
+        with self._lock:
+            self._compiled = None
+            st = self.path.stat()
+            self._refresh((st.st_mtime_ns, st.st_size))
+            return self._compiled
+
+    def _refresh(self, stamp):
+        raw = self.path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if self._compiled is None or digest != self._compiled.digest:
+            self._compiled = compile_registry(json.loads(raw), digest)
+        self._stamp = stamp
+
+
+_cache = RegistryCache(REGISTRY_PATH)
+
+
+def get_registry() -> CompiledRegistry:
+    """Return the compiled project registry, recompiling if the file changed."""
+    return _cache.get()
+
+
+def reload_registry() -> CompiledRegistry:
+    """Force the project registry to be recompiled from disk."""
+    return _cache.reload()
+
+
+__all__ = [
+    "CompiledRegistry",
+    "RegistryCache",
+    "compile_registry",
+    "get_registry",
+    "load_registry",
+    "reload_registry",
+    "REGISTRY_PATH",
+]
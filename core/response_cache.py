@@ -0,0 +1,134 @@
+"""
+Content-addressed response cache for model calls.
+
+Entries are keyed by a hash of model, messages, temperature and
+max_tokens. A bounded in-memory LRU tier with TTL sits in front of an
+optional sqlite tier that survives restarts. Only successful responses are
+stored.
+
+By default only deterministic calls (temperature 0) are cached; registry
+entries may set ``"cache": true`` to opt a sampled agent in or
+``"cache": false`` to bypass the cache entirely.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_ENABLED = os.getenv("AVOT_RESPONSE_CACHE", "1") != "0"
+CACHE_MAX_ENTRIES = int(os.getenv("AVOT_RESPONSE_CACHE_SIZE", "1024"))
+CACHE_TTL = float(os.getenv("AVOT_RESPONSE_CACHE_TTL", "3600"))
+CACHE_DB_PATH = os.getenv("AVOT_RESPONSE_CACHE_DB") or None
+
+
+def cache_key(model, messages, temperature, max_tokens):
+    blob = json.dumps(
+        {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def should_cache(temperature, policy=None):
+    """Apply the per-agent ``cache`` policy (None means deterministic only)."""
+    if policy is not None:
+        return bool(policy)
+    return temperature == 0
+
+
+class ResponseCache:
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, db_path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        if db_path:
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, key):
+        """Return ``(True, value)`` on a hit and ``(False, None)`` otherwise."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, entry[1]
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    value = json.loads(row[0])
+                    self._remember(key, row[1], value)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return True, value
+
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, value)
+            self.stores += 1
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), expires_at),
+                )
+                self._db.commit()
+
+    def _remember(self, key, expires_at, value):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "entries": len(self._entries),
+            }
+
+
+response_cache = ResponseCache(db_path=CACHE_DB_PATH) if CACHE_ENABLED else None
+
+
+def cache_stats():
+    """Hit/miss counters for the shared response cache (None if disabled)."""
+    return response_cache.stats() if response_cache is not None else None
@@ -0,0 +1,112 @@
+"""
+Single-flight coalescing for identical in-flight model calls.
+
+While a call for a given key is running, further callers with the same key
+wait for it and receive its result instead of issuing their own upstream
+request. Unlike the response cache this applies at any temperature: once
+the call finishes the key is released and the next caller goes upstream.
+"""
+import asyncio
+import os
+import threading
+import weakref
+
+SINGLE_FLIGHT_ENABLED = os.getenv("AVOT_SINGLE_FLIGHT", "1") != "0"
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _AsyncCall:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        # asyncio tasks belong to one loop, so async calls are grouped per loop
+        self._async_calls = weakref.WeakKeyDictionary()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """Run ``fn()`` for ``key`` unless an identical call is already running."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key, coro_fn):
+        """Awaitable :meth:`do`; ``coro_fn()`` must return a coroutine.
+
+        The shared call is cancelled only once every waiter has gone away.
+        """
+        calls = self._async_calls.setdefault(asyncio.get_running_loop(), {})
+        call = calls.get(key)
+        if call is None:
+            call = calls[key] = _AsyncCall(asyncio.ensure_future(coro_fn()))
+            call.task.add_done_callback(lambda _t: calls.pop(key, None))
+            with self._lock:
+                self.executed += 1
+        else:
+            with self._lock:
+                self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls)
+                + sum(len(calls) for calls in self._async_calls.values()),
+            }
+
+
+single_flight = SingleFlight() if SINGLE_FLIGHT_ENABLED else None
+
+
+def coalesce_stats():
+    """Counters for the shared single-flight group (None if disabled)."""
+    return single_flight.stats() if single_flight is not None else None
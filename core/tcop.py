@@ -8,17 +8,51 @@ Provides:
 This module coordinates existing components. It does NOT
 modify code, registry, or safety boundaries.
 """
+import importlib.util
 import json
+import os
+import sys
 from datetime import datetime
 from pathlib import Path
 
 from core.system_snapshot import generate_snapshot
 from core.openai_bridge import run_chat
+from core.prompts import read_prompt
 
-PROMPT_PATH = Path(__file__).resolve().parents[1] / "prompts" / "tcop_prompt.txt"
+ROOT = Path(__file__).resolve().parents[1]
+PROMPT_PATH = ROOT / "prompts" / "tcop_prompt.txt"
+ADAPTERS_DIR = ROOT / "avot-core" / "adapters"
+LEDGER_PATH = ROOT / "registry" / "signal_ledger.yaml"
+# Where to snapshot the signal aggregates between runs; off unless set
+SIGNAL_TRENDS_SNAPSHOT = os.getenv("AVOT_SIGNAL_TRENDS_SNAPSHOT")
 
 def _load_tcop_prompt():
-    return PROMPT_PATH.read_text()
+    return read_prompt(PROMPT_PATH)
+
+def _load_adapter(name):
+    """Import an avot-core adapter module from its file, once."""
+    module = sys.modules.get(name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(name, ADAPTERS_DIR / f"{name}.py")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module  # shared with signal_aggregates' own loader
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+    return module
+
+def _signal_trends():
+    """Rolling signal counts from the ledger, or None if it cannot be read."""
+    signal_ledger = _load_adapter("signal_ledger")
+    signal_aggregates = _load_adapter("signal_aggregates")
+    try:
+        return signal_aggregates.ledger_aggregates(
+            LEDGER_PATH, snapshot_path=SIGNAL_TRENDS_SNAPSHOT
+        ).summary()
+    except (signal_ledger.SignalLedgerError, OSError):
+        return None
 
 def generate_cycle_report():
     """Run a single TCOP cycle and return a structured dict."""
@@ -27,6 +61,7 @@ def generate_cycle_report():
 
     payload = {
         "snapshot": snapshot,
+        "signal_trends": _signal_trends(),
         "timestamp": datetime.utcnow().isoformat() + "Z"
     }
 
@@ -53,6 +88,8 @@ def generate_cycle_report():
             "next_suggestions": []
         }
 
+    if isinstance(data, dict):
+        data.setdefault("signal_trends", payload["signal_trends"])
     return data
 
 def heartbeat():
@@ -2,7 +2,9 @@
 """Command-line interface for AVOT-core."""
 
 import argparse
+import json
 import sys
+import time
 from pathlib import Path
 
 # Ensure local package is importable when running from repo root
@@ -10,6 +12,8 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 PYTHON_PATH = REPO_ROOT / "python"
 if str(PYTHON_PATH) not in sys.path:
     sys.path.insert(0, str(PYTHON_PATH))
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
 
 from avot_core import registry, runtime  # noqa: E402
 
@@ -42,6 +46,64 @@ def cmd_run(args: argparse.Namespace) -> None:
     runtime.run_agent(args.agent_id, intent=args.intent)
 
 
+def cmd_batch(args: argparse.Namespace) -> None:
+    from avot_engine import handle_tasks, task_key
+
+    # One slot per non-blank line: None for a task, else its error record
+    tasks, slots = [], []
+    with args.input as source:
+        for number, line in enumerate(source, 1):
+            if not line.strip():
+                continue
+            try:
+                task = json.loads(line)
+                error = None if isinstance(task, dict) else "a task must be a JSON object"
+            except ValueError as exc:
+                error = f"invalid JSON: {exc}"
+            if error is None:
+                tasks.append(task)
+                slots.append(None)
+                continue
+            print(f"{args.input.name}:{number}: {error}", file=sys.stderr)
+            slots.append({"error": True, "status": "invalid_task", "line": number, "content": error})
+
+    started = time.perf_counter()
+    results = iter(handle_tasks(
+        tasks,
+        max_concurrency=args.concurrency,
+        guardian_batch_size=args.guardian_batch,
+    ))
+    elapsed = time.perf_counter() - started
+
+    for slot in slots:
+        result = next(results) if slot is None else slot
+        sys.stdout.write(json.dumps(result, default=str) + "\n")
+    sys.stdout.flush()
+
+    unique = len({task_key(task) for task in tasks})
+    rate = len(tasks) / elapsed if elapsed else 0.0
+    print(
+        f"{len(tasks)} tasks ({unique} unique, {len(slots) - len(tasks)} invalid) "
+        f"in {elapsed:.2f}s: {rate:.1f} tasks/sec",
+        file=sys.stderr,
+    )
+
+
+def cmd_search(args: argparse.Namespace) -> None:
+    from archivist import search
+
+    hits = search(args.query, k=args.k)
+    if args.json:
+        sys.stdout.write(json.dumps(hits, indent=2) + "\n")
+        return
+    if not hits:
+        print("No matches (run `python -m archivist.indexer` to build the index).")
+    for hit in hits:
+        print(f"{hit['score']:7.3f}  {hit['path']}  [{hit['title']}]")
+        if hit["snippet"]:
+            print(f"         {hit['snippet']}")
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="AVOT-core registry helper")
     subparsers = parser.add_subparsers(required=True)
@@ -59,6 +121,26 @@ def build_parser() -> argparse.ArgumentParser:
                            help="Optional description of the requested task")
     run_parser.set_defaults(func=cmd_run)
 
+    batch_parser = subparsers.add_parser(
+        "batch", help="Run a JSONL stream of engine tasks, writing JSONL results"
+    )
+    batch_parser.add_argument("input", nargs="?", default="-",
+                              type=argparse.FileType("r", encoding="utf-8"),
+                              help="JSONL file of tasks (default: stdin)")
+    batch_parser.add_argument("--concurrency", type=int, default=None,
+                              help="Max in-flight model calls across the batch")
+    batch_parser.add_argument("--guardian-batch", type=int, default=None,
+                              help="Merged outputs per Guardian review request")
+    batch_parser.set_defaults(func=cmd_batch)
+
+    search_parser = subparsers.add_parser(
+        "search", help="Full-text search of the Archivist knowledge index"
+    )
+    search_parser.add_argument("query", help="Search terms")
+    search_parser.add_argument("-k", type=int, default=10, help="Number of hits")
+    search_parser.add_argument("--json", action="store_true", help="Print hits as JSON")
+    search_parser.set_defaults(func=cmd_search)
+
     return parser
 
 
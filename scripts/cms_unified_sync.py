@@ -32,6 +32,8 @@ if str(REPO_ROOT) not in sys.path:
 ARTIFACTS_DIR = REPO_ROOT / "artifacts"
 ARTIFACTS_DIR.mkdir(exist_ok=True)
 
+MODEL = "gpt-5.1"
+
 
 def load_run_chat():
     spec = importlib.util.find_spec("core.openai_bridge")
@@ -124,7 +126,15 @@ def call_model(task: str, type_: str | None, targets: List[str] | None, mode: st
     system_prompt = build_system_prompt()
     user_prompt = build_user_prompt(task, type_, targets, mode)
 
-    raw = run_chat(system_prompt, user_prompt)
+    raw = run_chat(
+        model=MODEL,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        temperature=0.2,
+        max_tokens=8000,
+    )
     try:
         plan = json.loads(raw)
     except json.JSONDecodeError as exc:
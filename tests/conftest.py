@@ -3,6 +3,8 @@ import sys
 import types
 from pathlib import Path
 
+import pytest
+
 # Provide a lightweight stub for the OpenAI client so tests do not require
 # network access or external dependencies.
 if "openai" not in sys.modules:
@@ -41,3 +43,59 @@ os.environ.setdefault("OPENAI", "test-key")
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
+
+
+@pytest.fixture
+def fake_registry(monkeypatch):
+    """Serve a compiled test registry from ``avot_engine.get_registry``.
+
+    ``fake_registry(routing, **fields)`` registers every routed agent with
+    model ``m`` and its lowercased name as the system prompt, plus an
+    ``AVOT-Guardian`` whose system prompt is ``g``. ``fields`` are added to
+    every agent, the Guardian included.
+    """
+    import avot_engine
+    from core.registry import compile_registry
+
+    def install(routing, **fields):
+        names = dict.fromkeys(name for agents in routing.values() for name in agents)
+        agents = [{"name": name, "model": "m", "system_prompt": name.lower(), **fields} for name in names]
+        agents.append({"name": "AVOT-Guardian", "model": "m", "system_prompt": "g", **fields})
+        registry = compile_registry({"agents": agents, "routing": routing})
+        monkeypatch.setattr(avot_engine, "get_registry", lambda: registry)
+        return registry
+
+    return install
+
+
+class ArchivistTree:
+    """A scratch repository for Archivist indexer tests."""
+
+    def __init__(self, root):
+        self.root = root
+        (root / "archivist").mkdir(exist_ok=True)
+
+    def write(self, files):
+        """Create ``{relative path: text}`` files under the root."""
+        for rel, text in files.items():
+            path = self.root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+        return self.root
+
+    def update(self, **kwargs):
+        """Run the indexer over the tree, keeping its outputs in ``archivist/``."""
+        from archivist import indexer
+
+        return indexer.update_index(
+            root=self.root,
+            index_file=self.root / "archivist" / "knowledge_index.json",
+            manifest_file=self.root / "archivist" / "index_manifest.json",
+            **kwargs,
+        )
+
+
+@pytest.fixture
+def archivist_tree(tmp_path):
+    """An :class:`ArchivistTree` rooted at ``tmp_path``."""
+    return ArchivistTree(tmp_path)
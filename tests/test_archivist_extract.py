@@ -0,0 +1,81 @@
+import json
+
+from archivist import extract, indexer
+
+
+def test_markdown_title_headings_and_summary_section(tmp_path):
+    doc = tmp_path / "TIP-009.md"
+    doc.write_text(
+        "# TIP-009: Streaming\n\n**Status:** Draft\n\nIntro line.\n\n"
+        "## Summary\n\nStream partial\noutputs to callers.\n\n```\n# not a heading\n```\n## Design\n"
+    )
+    info = extract.extract(doc)
+    assert info["title"] == "TIP-009: Streaming"
+    assert info["headings"] == ["TIP-009: Streaming", "Summary", "Design"]
+    assert info["status"] == "Draft"
+    assert info["summary"] == "Stream partial outputs to callers."
+
+
+def test_front_matter_overrides(tmp_path):
+    doc = tmp_path / "scroll.md"
+    doc.write_text("---\ntitle: Front\nsummary: From the header.\n---\n# Body\n\nText.\n")
+    info = extract.extract(doc)
+    assert info["front_matter"]["title"] == "Front"
+    assert info["title"] == "Front"
+    assert info["summary"] == "From the header."
+
+
+def test_python_docstring_and_json_yaml_keys(tmp_path):
+    mod = tmp_path / "mod.py"
+    mod.write_text('# header\n"""First paragraph\nspans lines.\n\nDetails."""\nx = 1\n')
+    assert extract.extract(mod)["summary"] == "First paragraph spans lines."
+
+    data = tmp_path / "data.json"
+    data.write_text(json.dumps({"a": {"nested": [1, {"b": 2}]}, "s": "x\\\"y:", "c": [], "d": 1}))
+    assert extract.extract(data)["keys"] == ["a", "s", "c", "d"]
+
+    conf = tmp_path / "conf.yml"
+    conf.write_text("# comment\nname: x\nagents:\n  - nested: 1\n'quoted key': 2\n")
+    assert extract.extract(conf)["keys"] == ["name", "agents", "quoted key"]
+
+
+def test_large_files_are_scanned_with_a_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr(extract, "MAX_SCAN_BYTES", 1024)
+    big = tmp_path / "big.md"
+    big.write_text("# Big\n\n" + "## H\n\n" * 5000)
+    assert len(extract.extract(big)["headings"]) <= extract.MAX_HEADINGS
+
+
+def test_extract_many_process_pool_matches_inline(tmp_path, monkeypatch):
+    names = []
+    for i in range(6):
+        (tmp_path / f"m{i}.py").write_text(f'"""Module {i}."""\n')
+        names.append(f"m{i}.py")
+    inline = dict(extract.extract_many(tmp_path, names, workers=1))
+    monkeypatch.setattr(extract, "PARALLEL_THRESHOLD", 2)
+    pooled = dict(extract.extract_many(tmp_path, names, workers=2))
+    assert pooled == inline
+    assert pooled["m3.py"]["summary"] == "Module 3."
+
+
+def test_agent_summaries_parse_batched_reply():
+    raw = 'Here: [{"path": "a.md", "summary": "Alpha."}, {"path": "zzz", "summary": "x"}]'
+    assert extract.parse_summary_output(raw, {"a.md", "b.md"}) == {"a.md": "Alpha."}
+    assert extract.parse_summary_output('{"error": "boom"}', {"a.md"}) == {}
+
+
+def test_indexer_extracts_only_changed_files(tmp_path, monkeypatch, archivist_tree):
+    archivist_tree.write({"docs/SCROLL.md": "# Scroll\n\nOpening words.\n", "mod.py": '"""Module."""\n'})
+    index, _ = archivist_tree.update()
+    assert index["scrolls"][0]["summary"] == "Opening words."
+    assert index["scrolls"][0]["headings"] == ["Scroll"]
+    assert index["repo_files"][0]["summary"] == "Module."
+
+    seen = []
+    real = indexer.extract_many
+    monkeypatch.setattr(indexer, "extract_many", lambda root, rels, workers=None: seen.extend(rels) or real(root, rels, workers))
+    (tmp_path / "mod.py").write_text('"""Edited module."""\n')
+    index, _ = archivist_tree.update()
+    assert seen == ["mod.py"]
+    assert index["repo_files"][0]["summary"] == "Edited module."
+    assert index["scrolls"][0]["summary"] == "Opening words."
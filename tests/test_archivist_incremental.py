@@ -0,0 +1,108 @@
+import json
+import os
+
+from archivist import indexer
+
+
+TREE = {
+    "docs/SCROLL.md": "# Scroll\n",
+    "core/mod.py": '"""Module."""\n',
+    ".git/config.json": "{}",
+    "artifacts/plan.json": "{}",
+    "build/gen.py": "",
+    "notes.py": "",
+    ".gitignore": "/build/\nnotes.py\n",
+}
+
+
+def test_prunes_ignored_paths(tmp_path, archivist_tree):
+    archivist_tree.write(TREE)
+    index, changes = archivist_tree.update()
+
+    assert sorted(changes["added"]) == ["core/mod.py", "docs/SCROLL.md"]
+    assert [e["path"] for e in index["repo_files"]] == ["core/mod.py"]
+    assert [e["title"] for e in index["scrolls"]] == ["SCROLL"]
+    on_disk = json.loads((tmp_path / "archivist" / "knowledge_index.json").read_text())
+    assert on_disk == index
+
+
+def test_rescan_touches_only_changed_files(tmp_path, monkeypatch, archivist_tree):
+    archivist_tree.write(TREE)
+    archivist_tree.update()
+    index_file = tmp_path / "archivist" / "knowledge_index.json"
+    stamp = index_file.stat().st_mtime_ns
+
+    hashed = []
+    real_hash = indexer.file_hash
+    monkeypatch.setattr(indexer, "file_hash", lambda p: hashed.append(p) or real_hash(p))
+
+    _, changes = archivist_tree.update()
+    assert changes == {"added": [], "changed": [], "removed": [], "unchanged": 2}
+    assert hashed == []
+    assert index_file.stat().st_mtime_ns == stamp  # nothing rewritten
+
+    # Touch without editing: rehashed, but not reported as changed
+    mod = tmp_path / "core" / "mod.py"
+    os.utime(mod, ns=(1, 1))
+    _, changes = archivist_tree.update()
+    assert changes["changed"] == [] and len(hashed) == 1
+
+    mod.write_text('"""Edited."""\n')
+    (tmp_path / "docs" / "SCROLL.md").unlink()
+    (tmp_path / "docs" / "TIP-001.md").write_text("# TIP\n")
+    index, changes = archivist_tree.update()
+    assert changes["changed"] == ["core/mod.py"]
+    assert changes["removed"] == ["docs/SCROLL.md"]
+    assert changes["added"] == ["docs/TIP-001.md"]
+    assert [e["path"] for e in index["scrolls"]] == ["docs/TIP-001.md"]
+
+
+def test_full_rebuild_ignores_manifest(archivist_tree):
+    archivist_tree.write(TREE)
+    archivist_tree.update()
+    _, changes = archivist_tree.update(full=True)
+    assert len(changes["added"]) == 2
+
+
+def test_atomic_write_leaves_no_temp_files(tmp_path):
+    target = tmp_path / "out.json"
+    indexer.write_json_atomic(target, {"a": 1})
+    indexer.write_json_atomic(target, {"a": 2})
+    assert json.loads(target.read_text()) == {"a": 2}
+    assert [p.name for p in tmp_path.iterdir()] == ["out.json"]
+
+
+def test_stale_or_edited_outputs_are_rebuilt(tmp_path, archivist_tree):
+    archivist_tree.write(TREE)
+    index, _ = archivist_tree.update()
+    index_file = tmp_path / "archivist" / "knowledge_index.json"
+    docs = tmp_path / "archivist" / "postings" / "CURRENT"
+
+    index_file.write_text('{"scrolls": []}')
+    docs.unlink()
+    _, changes = archivist_tree.update()
+    assert changes["added"] == [] and changes["changed"] == []
+    assert json.loads(index_file.read_text()) == index
+    assert docs.exists()
+
+    stamp = index_file.stat().st_mtime_ns
+    archivist_tree.update()
+    assert index_file.stat().st_mtime_ns == stamp
+
+
+def test_atomic_writes_keep_files_readable(tmp_path, archivist_tree):
+    target = tmp_path / "out.json"
+    indexer.write_json_atomic(target, {"a": 1})
+    assert target.stat().st_mode & 0o777 == 0o644
+    target.chmod(0o640)
+    indexer.write_json_atomic(target, {"a": 2})
+    assert target.stat().st_mode & 0o777 == 0o640
+
+    archivist_tree.write(TREE)
+    archivist_tree.update()
+    archivist_dir = tmp_path / "archivist"
+    matrix = (archivist_dir / "vectors" / (archivist_dir / "vectors" / "CURRENT").read_text()
+              / "matrix.f32").relative_to(archivist_dir)
+    for name in ("knowledge_index.json", "knowledge_index.sqlite", "postings/CURRENT",
+                 "vectors/CURRENT", matrix):
+        assert (archivist_dir / name).stat().st_mode & 0o777 == 0o644, name
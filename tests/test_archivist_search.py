@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+import avot_engine
+from archivist import search_index
+from convergence import engine as convergence_engine
+
+
+@pytest.fixture
+def corpus(archivist_tree):
+    archivist_tree.write({
+        "docs/guardian.md": (
+            "# Guardian Veto\n\nThe Guardian vetoes incoherent output.\n\n## Thresholds\n\nScores below 0.7 fail.\n"
+        ),
+        "docs/archivist.md": "# Archivist\n\nIndexes scrolls and TIPs for retrieval.\n",
+        "core/bridge.py": '"""Model bridge."""\n\ndef run_chat_async():\n    pass\n',
+    })
+    archivist_tree.update()
+    return archivist_tree.root
+
+
+def _search(root, query, k=10):
+    return search_index.search(query, k, root=root, search_dir=root / "archivist" / "postings")
+
+
+def test_tokenizer_splits_compounds_and_camel_case():
+    terms = search_index.tokenize("TIP-002 run_chatAsync and the HTTPPool")
+    assert "tip-002" in terms and "tip" in terms and "002" in terms
+    assert {"run_chatasync", "run", "chat", "async", "httppool", "http", "pool"} <= set(terms)
+    assert "the" not in terms and "and" not in terms
+
+
+def test_bm25_ranks_and_snippets(corpus):
+    hits = _search(corpus, "guardian veto thresholds")
+    assert hits[0]["path"] == "docs/guardian.md"
+    assert hits[0]["title"] == "guardian"
+    assert "Guardian" in hits[0]["snippet"]
+    assert all(h["path"] != "docs/archivist.md" for h in hits)
+
+    hits = _search(corpus, "run chat async")
+    assert [h["path"] for h in hits] == ["core/bridge.py"]
+    assert _search(corpus, "nonexistentword") == []
+
+
+def test_postings_are_memory_mapped_and_reloaded_on_rebuild(corpus, archivist_tree):
+    postings_dir = corpus / "archivist" / "postings"
+    first = search_index.load(postings_dir)
+    assert first is search_index.load(postings_dir)
+    assert first.postings("guardian").obj is not None  # a view, not a copy
+
+    (corpus / "docs" / "new.md").write_text("# New\n\nA quasar appears.\n")
+    archivist_tree.update()
+    assert search_index.load(postings_dir) is not first
+    assert _search(corpus, "quasar")[0]["path"] == "docs/new.md"
+    # Unchanged files reuse their cached term counts
+    cached = json.loads((search_index.current_generation(postings_dir) / "terms.json").read_text())["files"]
+    assert set(cached) == {"docs/guardian.md", "docs/archivist.md", "core/bridge.py", "docs/new.md"}
+
+
+def test_missing_index_returns_no_hits(tmp_path):
+    assert search_index.search("anything", root=tmp_path, search_dir=tmp_path / "none") == []
+
+
+def test_snippets_feed_converge_and_retrieval_prompts(corpus, monkeypatch):
+    monkeypatch.setattr(search_index, "SEARCH_DIR", corpus / "archivist" / "postings")
+    monkeypatch.setattr(search_index, "ROOT", corpus)
+
+    seen = []
+    monkeypatch.setattr(convergence_engine, "run_chat", lambda **kw: seen.append(kw) or '{"synthesis": "ok"}')
+    convergence_engine.converge({"task": {}, "agent_outputs": [], "archival_query": "guardian veto"})
+    sent = json.loads(seen[0]["messages"][1]["content"])
+    assert "archival_query" not in sent
+    assert sent["archival_context"][0]["source"] == "docs/guardian.md"
+
+    cfg = {"system_prompt": "You are the Archivist."}
+    messages = avot_engine.build_messages(cfg, {"intent": "retrieve_context", "payload": "guardian veto"})
+    assert "ARCHIVAL CONTEXT" in messages[1]["content"]
+    messages = avot_engine.build_messages(cfg, {"intent": "analysis", "payload": "guardian veto"})
+    assert messages[1]["content"] == "guardian veto"
+
+
+def test_rebuild_publishes_whole_generations(corpus, archivist_tree):
+    postings_dir = corpus / "archivist" / "postings"
+    first = search_index.load(postings_dir)
+    for i in range(3):
+        (corpus / "docs" / f"gen{i}.md").write_text(f"# Gen {i}\n\nnebula {i}\n")
+        archivist_tree.update()
+    generations = sorted(p.name for p in postings_dir.iterdir() if p.is_dir())
+    assert len(generations) == search_index.KEEP_GENERATIONS
+    assert (postings_dir / "CURRENT").read_text() == generations[-1]
+    assert not (postings_dir / "docs.json").exists()
+    # A reader holding a pruned generation keeps working off its mapping
+    assert first.search("guardian", 1)
+    assert len(_search(corpus, "nebula")) == 3
+
+
+def test_async_messages_match_sync(corpus, monkeypatch):
+    import asyncio
+
+    monkeypatch.setattr(search_index, "SEARCH_DIR", corpus / "archivist" / "postings")
+    monkeypatch.setattr(search_index, "ROOT", corpus)
+    cfg = {"system_prompt": "You are a test agent.", "model": "m"}
+    task = {"intent": "retrieve_context", "payload": "guardian veto"}
+    messages = asyncio.run(avot_engine.build_messages_async(cfg, task))
+    assert "ARCHIVAL CONTEXT" in messages[1]["content"]
+    assert messages == avot_engine.build_messages(cfg, task)
@@ -0,0 +1,56 @@
+import json
+
+from archivist import index_store, indexer
+
+
+TREE = {
+    "docs/SCROLL.md": "# Scroll\n\nBody.\n",
+    "core/a.py": '"""A."""\n',
+    "core/b.py": '"""B."""\n',
+}
+
+
+def test_store_matches_json_export(tmp_path, archivist_tree):
+    archivist_tree.write(TREE)
+    index, _ = archivist_tree.update()
+    store_file = tmp_path / "archivist" / "knowledge_index.sqlite"
+
+    with index_store.open_index(store_file) as store:
+        assert store.keys() == list(indexer.INDEX_KINDS)
+        assert store.to_dict() == index
+        assert store.counts() == {"scrolls": 1, "repo_files": 2, "decision_logs": 0, "tips": 0}
+        assert store.get("core/b.py")["summary"] == "B."
+        assert store.get("missing.py") is None
+        assert [e["path"] for e in store.iter("repo_files")] == ["core/a.py", "core/b.py"]
+
+        exported = tmp_path / "export.json"
+        store.export_json(exported)
+        assert json.loads(exported.read_text()) == index
+
+
+def test_store_applies_row_changes(tmp_path, archivist_tree):
+    archivist_tree.write(TREE)
+    archivist_tree.update()
+    (tmp_path / "core" / "a.py").write_text('"""Edited."""\n')
+    (tmp_path / "core" / "b.py").unlink()
+    (tmp_path / "core" / "c.py").write_text('"""C."""\n')
+    index, _ = archivist_tree.update(export_json=False)
+
+    with index_store.open_index(tmp_path / "archivist" / "knowledge_index.sqlite") as store:
+        assert store.to_dict() == index
+        assert store.get("core/a.py")["summary"] == "Edited."
+        assert store.get("core/b.py") is None
+    # The JSON export was skipped, so it still shows the first scan
+    stale = json.loads((tmp_path / "archivist" / "knowledge_index.json").read_text())
+    assert [e["path"] for e in stale["repo_files"]] == ["core/a.py", "core/b.py"]
+
+
+def test_missing_store_is_rebuilt(tmp_path, archivist_tree):
+    archivist_tree.write(TREE)
+    archivist_tree.update()
+    store_file = tmp_path / "archivist" / "knowledge_index.sqlite"
+    store_file.unlink()
+    assert index_store.store_version(store_file) is None
+    index, _ = archivist_tree.update()
+    with index_store.open_index(store_file) as store:
+        assert store.to_dict() == index
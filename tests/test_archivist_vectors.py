@@ -0,0 +1,99 @@
+import pytest
+
+from archivist import vector_index
+
+
+@pytest.fixture
+def corpus(archivist_tree):
+    return archivist_tree.write({
+        "docs/guardian.md": (
+            "# Guardian\n\nThe Guardian scores coherence and vetoes unsafe output.\n\n"
+            "## Thresholds\n\nScores below the threshold are rejected.\n"
+        ),
+        "docs/archivist.md": "# Archivist\n\nThe Archivist indexes scrolls and retrieves archival context.\n",
+        "TIPs/TIP-001.md": "# TIP-001\n\nStreaming partial agent output.\n",
+        "core.py": '"""Code is not embedded."""\n',
+    })
+
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    embedder = vector_index.HashingEmbedder(dim=64)
+    a, b = embedder.embed(["guardian coherence veto", "guardian coherence veto"])
+    assert a == b and len(a) == 64
+    assert abs(sum(x * x for x in a) - 1.0) < 1e-9
+    assert embedder.embed([""])[0] == [0.0] * 64
+
+
+def test_chunks_break_at_headings_and_size():
+    text = "# A\n\nintro\n\n## B\n\n" + "\n\n".join(["word " * 40] * 3)
+    chunks = vector_index.chunk_text(text, size=300)
+    assert chunks[0] == "# A\n\nintro"
+    assert chunks[1].startswith("## B")
+    assert len(chunks) == 4  # "## B" + one paragraph, then one paragraph each
+    assert all(len(c) <= 300 for c in chunks)
+
+
+def test_semantic_search_ranks_related_chunks(corpus, archivist_tree):
+    archivist_tree.update()
+    vector_dir = corpus / "archivist" / "vectors"
+    hits = vector_index.search("guardian coherence veto", k=3, vector_dir=vector_dir)
+    assert hits[0]["path"] == "docs/guardian.md"
+    assert {h["path"] for h in hits} <= {"docs/guardian.md", "docs/archivist.md", "TIPs/TIP-001.md"}
+
+    batched = vector_index.search_many(["archival context retrieval", "streaming agent output"],
+                                       k=1, vector_dir=vector_dir)
+    assert [hits[0]["path"] for hits in batched] == ["docs/archivist.md", "TIPs/TIP-001.md"]
+
+
+def test_rebuild_reembeds_only_changed_files(corpus, monkeypatch, archivist_tree):
+    archivist_tree.update()
+    embedded = []
+    real = vector_index.HashingEmbedder.embed
+    monkeypatch.setattr(vector_index.HashingEmbedder, "embed",
+                        lambda self, texts: embedded.extend(texts) or real(self, texts))
+
+    (corpus / "docs" / "archivist.md").write_text("# Archivist\n\nNow about quasars.\n")
+    archivist_tree.update()
+    assert len(embedded) == 1 and "quasars" in embedded[0]
+    hits = vector_index.search("guardian coherence", k=1, vector_dir=corpus / "archivist" / "vectors")
+    assert hits[0]["path"] == "docs/guardian.md"  # reused rows still searchable
+
+
+def test_ivf_matches_exact_search_when_probing_every_list(tmp_path):
+    words = ["alpha", "beta", "gamma", "delta", "omega", "sigma", "kappa", "theta"]
+    files = {}
+    for i, word in enumerate(words):
+        (tmp_path / f"{word}.md").write_text(f"# {word}\n\n{word} {word} notes {i}\n")
+        files[f"{word}.md"] = {"sha256": str(i), "kind": "scrolls", "entry": {"title": word}}
+    vector_dir = tmp_path / "vectors"
+    vector_index.build_vector_index(files, root=tmp_path, vector_dir=vector_dir, nlist=3)
+
+    index = vector_index.load(vector_dir)
+    assert index.ivf["nlist"] == 3 and index.ivf["offsets"][-1] == len(words)
+    query = vector_index.get_embedder().embed(["gamma notes"])
+    exact = index.search_vectors(query, k=3, approximate=False)
+    approx = index.search_vectors(query, k=3, nprobe=3)
+    assert approx == exact
+    assert index.chunks[exact[0][0][1]]["path"] == "gamma.md"
+
+
+def test_unknown_embedder_rejected():
+    with pytest.raises(ValueError):
+        vector_index.get_embedder("nope")
+
+
+def test_rebuild_publishes_whole_generations(corpus, archivist_tree):
+    archivist_tree.update()
+    vector_dir = corpus / "archivist" / "vectors"
+    first = vector_index.load(vector_dir)
+    (corpus / "docs" / "nebula.md").write_text("# Nebula\n\nNebula dust and gas.\n")
+    archivist_tree.update()
+
+    generations = sorted(p.name for p in vector_dir.iterdir() if p.is_dir())
+    assert (vector_dir / "CURRENT").read_text() == generations[-1]
+    assert not (vector_dir / "chunks.json").exists()
+    reloaded = vector_index.load(vector_dir)
+    assert reloaded is not first and len(reloaded.chunks) == reloaded.matrix.rows
+    # A reader of the previous generation keeps its own matching files
+    assert len(first.chunks) == first.matrix.rows < reloaded.matrix.rows
+    assert vector_index.search("nebula dust", k=1, vector_dir=vector_dir)[0]["path"] == "docs/nebula.md"
@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+import avot_engine
+from avot_engine import build_guardian_batch_task, parse_guardian_batch_output
+
+ROUTING = {"write": ["A"]}
+
+
+class _Recorder:
+    def __init__(self):
+        self.agent_calls = 0
+        self.guardian_calls = 0
+
+    async def __call__(self, model, messages, **_kwargs):
+        payload = messages[1]["content"]
+        if messages[0]["content"] == "g":
+            self.guardian_calls += 1
+            items = [int(line.split()[1]) for line in payload.splitlines() if line.strip().startswith("ITEM ")]
+            return json.dumps([
+                {"item": i, "coherence_score": 0.9, "ethics_ok": True, "summary": "ok"}
+                for i in items
+            ])
+        self.agent_calls += 1
+        await asyncio.sleep(0.01)
+        return f"out:{payload}"
+
+
+def test_handle_tasks_dedupes_and_batches_guardian(monkeypatch, fake_registry):
+    recorder = _Recorder()
+    fake_registry(ROUTING)
+    monkeypatch.setattr(avot_engine, "run_chat_async", recorder)
+
+    tasks = [{"intent": "write", "payload": str(i % 3)} for i in range(6)]
+    tasks.append({"intent": "missing", "payload": "x"})
+    results = avot_engine.handle_tasks(tasks, guardian_batch_size=4)
+
+    assert [r["content"] for r in results[:6]] == [f"out:{i % 3}" for i in range(6)]
+    assert "No agents registered" in results[6]["content"]
+    assert recorder.agent_calls == 3
+    assert recorder.guardian_calls == 1
+
+
+def test_batch_parse_falls_back_for_missing_items(monkeypatch, fake_registry):
+    async def guardian_drops_items(model, messages, **_kwargs):
+        payload = messages[1]["content"]
+        if messages[0]["content"] != "g":
+            return "out"
+        if "ITEM" in payload:
+            return json.dumps([{"item": 1, "coherence_score": 0.9, "ethics_ok": True, "summary": "ok"}])
+        return json.dumps({"coherence_score": 0.2, "ethics_ok": True, "summary": "single"})
+
+    fake_registry(ROUTING)
+    monkeypatch.setattr(avot_engine, "run_chat_async", guardian_drops_items)
+
+    results = avot_engine.handle_tasks(
+        [{"intent": "write", "payload": "1"}, {"intent": "write", "payload": "2"}]
+    )
+    assert results[0]["guardian"]["summary"] == "ok"
+    assert results[1]["guardian"]["summary"] == "single"
+
+
+def test_guardian_batch_prompt_round_trip():
+    task = build_guardian_batch_task([(1, "write", "alpha"), (2, "write", "beta")])
+    assert "ITEM 1" in task["payload"] and "ITEM 2" in task["payload"]
+
+    assert parse_guardian_batch_output("not json", [1, 2]) == {}
+    evals = parse_guardian_batch_output('[{"item": 2, "coherence_score": 1, "ethics_ok": true}]', [1, 2])
+    assert list(evals) == [2]
+    assert evals[2]["coherence_score"] == 1.0
+
+
+def test_guardian_batch_output_tolerates_fences_and_normalizes_items():
+    raw = (
+        "Here are the reviews:\n```json\n"
+        '[{"item": "1", "coherence_score": 0.5, "ethics_ok": true, "summary": "ok"},\n'
+        ' {"item": true, "coherence_score": 0.1, "ethics_ok": false, "summary": "bool id"}]\n'
+        "```\nLet me know if you need more."
+    )
+    evals = parse_guardian_batch_output(raw, [1, 2])
+    assert list(evals) == [1]
+    assert evals[1]["coherence_score"] == 0.5
+
+    wrapped = 'Result: {"items": [{"item": 2, "coherence_score": 1, "ethics_ok": true}]}'
+    assert list(parse_guardian_batch_output(wrapped, [1, 2])) == [2]
+
+
+def test_batch_cli_reports_bad_lines_in_their_slots(monkeypatch, tmp_path, capsys, fake_registry):
+    import importlib.util
+    from pathlib import Path
+
+    spec = importlib.util.spec_from_file_location(
+        "avot_cli", Path(__file__).resolve().parents[1] / "scripts" / "avot_cli.py"
+    )
+    avot_cli = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(avot_cli)
+    fake_registry(ROUTING)
+    recorder = _Recorder()
+    monkeypatch.setattr(avot_engine, "run_chat_async", recorder)
+
+    tasks = tmp_path / "tasks.jsonl"
+    tasks.write_text(
+        '{"intent": "write", "payload": "a"}\n'
+        '{"intent": "write", \n'
+        '\n'
+        '{"payload": "a", "intent": "write"}\n'
+        '[1, 2]\n'
+    )
+    avot_cli.main(["batch", str(tasks)])
+
+    out, err = capsys.readouterr()
+    results = [json.loads(line) for line in out.splitlines()]
+    assert [r.get("status") for r in results] == [None, "invalid_task", None, "invalid_task"]
+    assert [r.get("line") for r in results] == [None, 2, None, 5]
+    assert results[0] == results[2] and recorder.agent_calls == 1
+    assert f"{tasks}:2: invalid JSON" in err
+    assert "2 tasks (1 unique, 2 invalid)" in err
@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+import pytest
+
+import avot_engine
+
+ROUTING = {"multi": ["A", "B", "C"]}
+
+
+def _fake_run_chat(delays):
+    async def run_chat_async(model, messages, **_kwargs):
+        system = messages[0]["content"]
+        if system == "g":
+            return '{"coherence_score": 0.9, "ethics_ok": true, "summary": "ok"}'
+        await asyncio.sleep(delays[system])
+        return f"out-{system}"
+    return run_chat_async
+
+
+def test_parallel_fanout_keeps_order_and_reports_latency(monkeypatch, fake_registry):
+    fake_registry(ROUTING)
+    monkeypatch.setattr(avot_engine, "run_chat_async", _fake_run_chat({"a": 0.2, "b": 0.1, "c": 0.05}))
+
+    started = time.perf_counter()
+    result = avot_engine.handle_task({"intent": "multi", "payload": "x"})
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.3
+    assert result["content"] == "### A\nout-a\n\n### B\nout-b\n\n### C\nout-c"
+    assert set(result["latency"]["agents"]) == {"A", "B", "C"}
+    assert result["latency"]["agents"]["A"] >= 0.2
+
+
+def test_parallel_fanout_respects_concurrency_cap(monkeypatch):
+    active = []
+    peak = []
+
+    async def slow_call(_cfg, _task):
+        active.append(1)
+        peak.append(len(active))
+        await asyncio.sleep(0.05)
+        active.pop()
+        return "done"
+
+    monkeypatch.setattr(avot_engine, "call_agent_async", slow_call)
+    configs = [(str(i), {}) for i in range(6)]
+    responses, _ = avot_engine.call_agents(configs, {}, mode="parallel", max_workers=2)
+
+    assert [name for name, _ in responses] == [str(i) for i in range(6)]
+    assert max(peak) <= 2
+
+
+def test_agent_timeout_produces_error_output(monkeypatch):
+    monkeypatch.setattr(avot_engine, "run_chat_async", _fake_run_chat({"a": 0.5, "b": 0.0}))
+    configs = [("A", {"model": "m", "system_prompt": "a"}), ("B", {"model": "m", "system_prompt": "b"})]
+
+    responses, latency = avot_engine.call_agents(configs, {"payload": "x"}, timeout=0.1)
+
+    assert '"status": "timeout"' in responses[0][1]
+    assert responses[1] == ("B", "out-b")
+    assert latency["A"] < 0.5
+
+
+def test_handle_task_async_deadline_cancels(monkeypatch, fake_registry):
+    fake_registry(ROUTING)
+    monkeypatch.setattr(avot_engine, "run_chat_async", _fake_run_chat({"a": 5, "b": 5, "c": 5}))
+
+    started = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        asyncio.run(avot_engine.handle_task_async({"intent": "multi", "payload": "x"}, deadline=0.1))
+    assert time.perf_counter() - started < 1
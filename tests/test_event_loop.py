@@ -0,0 +1,28 @@
+import asyncio
+
+import pytest
+
+from core.event_loop import get_loop, run_sync
+
+
+async def _answer():
+    return 42
+
+
+def test_run_sync_from_plain_and_foreign_loop_threads():
+    assert run_sync(_answer()) == 42
+
+    async def inside_other_loop():
+        return run_sync(_answer())
+
+    assert asyncio.run(inside_other_loop()) == 42
+
+
+def test_run_sync_on_the_shared_loop_raises_instead_of_hanging():
+    async def nested():
+        with pytest.raises(RuntimeError, match="await the coroutine"):
+            run_sync(_answer())
+        return "raised"
+
+    future = asyncio.run_coroutine_threadsafe(nested(), get_loop())
+    assert future.result(timeout=5) == "raised"
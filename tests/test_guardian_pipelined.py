@@ -0,0 +1,63 @@
+import asyncio
+import json
+import time
+
+import avot_engine
+from avot_engine import combine_guardian_evals
+
+ROUTING = {"multi": ["Slow", "Fast"]}
+
+
+async def _fake_run_chat(model, messages, **_kwargs):
+    system, payload = messages[0]["content"], messages[1]["content"]
+    if system == "g":
+        await asyncio.sleep(0.2)
+        score = 0.4 if "slow-out" in payload else 0.9
+        return json.dumps({"coherence_score": score, "ethics_ok": True, "summary": "s"})
+    await asyncio.sleep(0.2 if system == "slow" else 0.0)
+    return f"{system}-out"
+
+
+def test_combine_guardian_evals_is_as_strict_as_weakest():
+    combined = combine_guardian_evals([
+        ("A", {"coherence_score": 0.9, "ethics_ok": True, "summary": "fine"}),
+        ("B", {"coherence_score": 0.6, "ethics_ok": False, "summary": "unsafe"}),
+    ])
+    assert combined["coherence_score"] == 0.6
+    assert combined["ethics_ok"] is False
+    assert combined["summary"] == "A: fine\nB: unsafe"
+
+    single = {"coherence_score": 0.7, "ethics_ok": True, "summary": "ok"}
+    assert combine_guardian_evals([("A", single)]) == single
+
+
+def test_pipelined_review_overlaps_generation(monkeypatch, fake_registry):
+    fake_registry(ROUTING)
+    monkeypatch.setattr(avot_engine, "run_chat_async", _fake_run_chat)
+
+    started = time.perf_counter()
+    result = avot_engine.handle_task({"intent": "multi"}, guardian_mode="pipelined")
+    elapsed = time.perf_counter() - started
+
+    # Fast's review runs while Slow is still generating: ~0.4s instead of 0.6s
+    assert elapsed < 0.55
+    assert result["guardian"]["coherence_score"] == 0.4
+    assert "Suppressed" in result["content"]
+    assert set(result["latency"]["guardian"]) == {"Slow", "Fast"}
+
+
+def test_pipelined_stream_emits_per_agent_reviews(monkeypatch, fake_registry):
+    async def stream(cfg, _task):
+        yield f"{cfg['system_prompt']}-out"
+
+    fake_registry(ROUTING)
+    monkeypatch.setattr(avot_engine, "run_chat_async", _fake_run_chat)
+    monkeypatch.setattr(avot_engine, "call_agent_stream_async", stream)
+
+    events = list(avot_engine.handle_task_stream(
+        {"intent": "multi"}, policy="release", guardian_mode="pipelined"
+    ))
+    reviews = [e["agent"] for e in events if e["event"] == "agent_review"]
+
+    assert sorted(reviews) == ["Fast", "Slow"]
+    assert events[-1]["result"]["guardian"]["coherence_score"] == 0.4
@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import avot_engine
+from core.guardian_verdict import VerdictExtractor, extract_verdict
+
+CORPUS = Path(__file__).resolve().parents[1] / "benchmarks" / "data" / "guardian_outputs.jsonl"
+
+
+def _corpus():
+    return [json.loads(line) for line in CORPUS.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.mark.parametrize("entry", _corpus(), ids=lambda e: e["name"])
+def test_corpus_verdicts(entry):
+    verdict = extract_verdict(entry["raw"])
+    expected = entry["coherence_score"]
+    assert (verdict["coherence_score"] if verdict else None) == expected
+
+
+@pytest.mark.parametrize("size", [1, 3, 8])
+def test_chunked_feed_matches_one_shot(size):
+    raw = 'Verdict: ```json\n{"summary": "keeps \\"{x}\\" \\\\ intact", "coherence_score": 0.7, "ethics_ok": true}\n``` trailing'
+    extractor = VerdictExtractor()
+    for start in range(0, len(raw), size):
+        if extractor.feed(raw[start:start + size]):
+            break
+    assert extractor.verdict == extract_verdict(raw)
+    assert extractor.verdict["summary"] == 'keeps "{x}" \\ intact'
+    # Nothing after the closing brace was needed
+    assert start < raw.index("```", 10)
+
+
+def test_parse_guardian_output_accepts_fenced_json():
+    raw = 'Here you go:\n```json\n{"coherence_score": 0.9, "ethics_ok": true, "summary": "ok"}\n```'
+    assert avot_engine.parse_guardian_output(raw)["coherence_score"] == 0.9
+
+    error = json.dumps({"error": True, "status": 429, "content": "slow down"})
+    assert avot_engine.parse_guardian_output(error)["summary"] == "Guardian error 429: slow down"
+
+
+def test_streamed_verdict_closes_stream_early(monkeypatch, fake_registry):
+    fake_registry({"write": ["Scribe"]})
+    state = {"sent": 0, "closed": False}
+
+    async def fake_run_chat(model, messages, **_kwargs):
+        return "scroll"
+
+    async def fake_stream(cfg, _task):
+        chunks = ["Sure. ", '{"coherence_score": 0.8, ', '"ethics_ok": true, "summary": "ok"}']
+        chunks += [" more prose"] * 50
+        try:
+            for chunk in chunks:
+                state["sent"] += 1
+                yield chunk
+        finally:
+            state["closed"] = True
+
+    monkeypatch.setattr(avot_engine, "GUARDIAN_STREAM_VERDICT", True)
+    monkeypatch.setattr(avot_engine, "run_chat_async", fake_run_chat)
+    monkeypatch.setattr(avot_engine, "call_agent_stream_async", fake_stream)
+
+    result = avot_engine.handle_task({"intent": "write", "payload": "hi"})
+
+    assert result["content"] == "scroll"
+    assert result["guardian"]["coherence_score"] == 0.8
+    assert state == {"sent": 3, "closed": True}
@@ -0,0 +1,69 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import clients.local_openai_client as local_client
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        out = json.dumps({"choices": [{"message": {"content": body["model"]}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture
+def echo_url(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(
+        local_client,
+        "CHAT_COMPLETIONS_URL",
+        f"http://127.0.0.1:{server.server_port}/v1/chat/completions",
+    )
+    yield
+    server.shutdown()
+    server.server_close()
+
+
+def test_sync_client_reuses_connections(echo_url):
+    client = local_client.LocalOpenAIClient(pool_size=2)
+    for i in range(5):
+        resp = client.chat(model=f"m{i}")
+        assert resp["choices"][0]["message"]["content"] == f"m{i}"
+
+    stats = client.pool_stats()
+    assert stats["opened"] == 1
+    assert stats["reused"] == 4
+    client.close()
+
+
+def test_async_client_reuses_connections(echo_url):
+    client = local_client.AsyncLocalOpenAIClient(pool_size=2)
+
+    async def run():
+        for i in range(5):
+            resp = await client.chat(model=f"m{i}")
+            assert resp["choices"][0]["message"]["content"] == f"m{i}"
+
+    asyncio.run(run())
+
+    stats = client.pool_stats()
+    assert stats["opened"] == 1
+    assert stats["reused"] == 4
+
+
+def test_get_client_is_process_wide():
+    assert local_client.get_client() is local_client.get_client()
+    assert local_client.get_async_client() is local_client.get_async_client()
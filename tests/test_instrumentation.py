@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+import avot_engine
+from core import instrumentation, openai_bridge
+
+
+class _UsageClient:
+    async def chat(self, model, messages, **_kwargs):
+        if messages[0]["content"] == "g":
+            content = json.dumps({"coherence_score": 0.9, "ethics_ok": True, "summary": "ok"})
+            usage = {"prompt_tokens": 50, "completion_tokens": 5}
+        else:
+            content = "scroll"
+            usage = {"prompt_tokens": 10, "completion_tokens": 20}
+        return {"choices": [{"message": {"content": content}}], "usage": usage}
+
+
+@pytest.fixture
+def recorder():
+    recorder = instrumentation.MetricsRecorder()
+    previous = instrumentation.set_hook(recorder)
+    yield recorder
+    instrumentation.set_hook(previous)
+
+
+def test_noop_hook_is_shared_null_span():
+    hook = instrumentation.Instrumentation()
+    assert hook.span("a") is hook.span("b", agent="x")
+    assert not instrumentation.get_hook().enabled
+
+
+def test_pipeline_records_stages_and_tokens(monkeypatch, recorder, fake_registry):
+    fake_registry({"write": ["Scribe"]}, cache=False)
+    monkeypatch.setattr(openai_bridge, "get_async_client", lambda: _UsageClient())
+
+    result = avot_engine.handle_task({"intent": "write", "payload": "hi"})
+    assert result["content"] == "scroll"
+
+    snap = recorder.snapshot()
+    stages = {dict(labels)["stage"] for name, labels in snap["histograms"]}
+    assert {
+        "task", "registry_load", "build_messages", "agent_call",
+        "merge", "guardian_call", "guardian_parse", "decide",
+    } <= stages
+    assert ("avot_stage_seconds", (("agent", "Scribe"), ("stage", "build_messages"))) in snap["histograms"]
+
+    counters = snap["counters"]
+    assert counters[("avot_tokens_total", (("agent", "Scribe"), ("kind", "completion"), ("model", "m")))] == 20
+    assert counters[("avot_tokens_total", (("agent", "AVOT-Guardian"), ("kind", "prompt"), ("model", "m")))] == 50
+
+    # Every span belongs to the task's trace
+    spans = list(recorder.spans)
+    assert len({s["trace_id"] for s in spans}) == 1
+    root = [s for s in spans if s["parent_id"] is None]
+    assert [s["name"] for s in root] == ["task"]
+
+
+def test_prometheus_and_otlp_exports(recorder, tmp_path, capsys):
+    with instrumentation.span("merge", agent="A"):
+        pass
+    recorder.count("avot_tokens_total", 7, agent="A", kind="prompt", model="m")
+
+    text = recorder.to_prometheus()
+    assert "# TYPE avot_stage_seconds histogram" in text
+    assert 'avot_stage_seconds_bucket{agent="A",stage="merge",le="+Inf"} 1' in text
+    assert 'avot_tokens_total{agent="A",kind="prompt",model="m"} 7' in text
+
+    path = tmp_path / "spans.json"
+    recorder.export(str(path), fmt="otlp")
+    spans = json.loads(path.read_text())["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert spans[0]["name"] == "merge"
+    assert {"key": "agent", "value": {"stringValue": "A"}} in spans[0]["attributes"]
+
+    recorder.export("-")
+    assert "avot_tokens_total" in capsys.readouterr().out
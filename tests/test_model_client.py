@@ -0,0 +1,47 @@
+import pytest
+
+from clients import model_client
+from clients.openai_client import run_chat_completion
+from convergence.engine import converge
+from core import openai_bridge
+
+
+@pytest.fixture
+def transport():
+    yield model_client.set_transport
+    model_client.set_transport("http")
+
+
+def test_sdk_transport_reuses_one_client(transport):
+    transport("sdk")
+    messages = [{"role": "user", "content": "hi"}]
+
+    assert openai_bridge.run_chat("m", messages) == "Mock completion"
+    assert run_chat_completion("m", messages) == "Mock completion"
+    client = model_client.get_client()
+    assert isinstance(client, model_client.SDKClient)
+    assert client._sdk() is client._sdk()
+
+
+def test_standin_transport_serves_every_subsystem(transport):
+    transport("standin")
+    messages = [{"role": "user", "content": "hi"}]
+
+    sync_out = openai_bridge.run_chat("m", messages)
+    assert isinstance(sync_out, str) and sync_out
+
+    out = converge({
+        "task": {"intent": "synthesize", "payload": "Test."},
+        "agent_outputs": ["A", "B"],
+        "archival_context": [],
+        "guardian_context": {"coherence_score": 1.0},
+    })
+    assert "error" not in out["synthesis"]
+
+    # Sync and async callers share the same in-process stand-in
+    assert model_client.get_client().base_url == model_client.get_async_client().base_url
+
+
+def test_unknown_transport_rejected():
+    with pytest.raises(ValueError):
+        model_client.set_transport("carrier-pigeon")
@@ -0,0 +1,35 @@
+import os
+
+from avot_engine import build_messages
+from core.prompts import PromptStore, resolve_prompt
+
+
+def test_use_file_directive_resolves_to_prompt_text():
+    messages = build_messages(
+        {"system_prompt": "<USE_FILE:prompts/guardian_prompt.txt>"}, {"payload": "x"}
+    )
+    assert messages[0]["content"].startswith("You are AVOT-Guardian.")
+    assert resolve_prompt("Inline prompt.") == "Inline prompt."
+
+
+def test_prompt_store_invalidates_on_change(tmp_path):
+    path = tmp_path / "p.txt"
+    path.write_text("one")
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+
+    store = PromptStore(root=tmp_path, check_interval=0)
+    assert store.resolve("<USE_FILE:p.txt>") == "one"
+
+    path.write_text("two")
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+    assert store.read("p.txt") == "two"
+
+
+def test_prompt_store_skips_disk_within_check_interval(tmp_path):
+    path = tmp_path / "p.txt"
+    path.write_text("one")
+
+    store = PromptStore(root=tmp_path, check_interval=60)
+    assert store.read("p.txt") == "one"
+    path.unlink()
+    assert store.read("p.txt") == "one"
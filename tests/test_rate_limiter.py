@@ -0,0 +1,173 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import clients.local_openai_client as local_client
+import clients.rate_limiter as rl
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    """Answers 429 (with retry-after) for the first ``failures`` requests."""
+
+    protocol_version = "HTTP/1.1"
+    failures = 2
+    calls = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        type(self).calls += 1
+        if type(self).calls <= self.failures:
+            out = b'{"error": "rate limited"}'
+            self.send_response(429)
+            self.send_header("retry-after-ms", "10")
+        else:
+            out = json.dumps({"choices": [{"message": {"content": "ok"}}]}).encode()
+            self.send_response(200)
+            self.send_header("x-ratelimit-limit-requests", "600")
+            self.send_header("x-ratelimit-remaining-requests", "599")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    monkeypatch.setattr(rl, "BACKOFF_BASE", 0.01)
+    fresh = rl.RateLimiter()
+    monkeypatch.setattr(local_client, "rate_limiter", fresh)
+    return fresh
+
+
+@pytest.fixture
+def flaky_url(monkeypatch):
+    _FlakyHandler.calls = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(
+        local_client,
+        "CHAT_COMPLETIONS_URL",
+        f"http://127.0.0.1:{server.server_port}/v1/chat/completions",
+    )
+    yield
+    server.shutdown()
+    server.server_close()
+
+
+def test_sync_client_retries_after_429(flaky_url, limiter):
+    client = local_client.LocalOpenAIClient(pool_size=1)
+    resp = client.chat(model="m")
+
+    assert resp["choices"][0]["message"]["content"] == "ok"
+    assert _FlakyHandler.calls == 3
+    assert limiter.stats()["retried"] == 2
+    client.close()
+
+
+def test_async_client_retries_after_429(flaky_url, limiter):
+    client = local_client.AsyncLocalOpenAIClient(pool_size=1)
+    resp = asyncio.run(client.chat(model="m"))
+
+    assert resp["choices"][0]["message"]["content"] == "ok"
+    assert limiter.stats()["retried"] == 2
+
+
+def test_retries_stop_at_deadline_budget(flaky_url, limiter, monkeypatch):
+    monkeypatch.setattr(local_client, "backoff_delay", lambda attempt, retry_after: 5.0)
+    client = local_client.LocalOpenAIClient(pool_size=1)
+
+    with rl.deadline_scope(1.0):
+        resp = client.chat(model="m")
+
+    assert resp["error"] is True and resp["status"] == 429
+    assert _FlakyHandler.calls == 1
+    assert limiter.stats()["exhausted"] == 1
+    client.close()
+
+
+def test_limiter_learns_from_headers():
+    limiter = rl.RateLimiter()
+    limiter.observe(
+        "m",
+        200,
+        {
+            "x-ratelimit-limit-requests": "60",
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "2s",
+        },
+    )
+    delay = limiter.reserve("m", 10)
+    assert 2.0 <= delay <= 3.1
+    assert limiter.stats()["throttled"] == 1
+
+    # Unknown models are not throttled until they report limits
+    assert limiter.reserve("other", 10) == 0.0
+
+
+def test_retry_after_pauses_model():
+    limiter = rl.RateLimiter()
+    assert limiter.observe("m", 429, {"retry-after": "3"}) == 3.0
+    assert limiter.reserve("m", 1) > 2.5
+
+
+def test_parse_duration():
+    assert rl.parse_duration("6m0s") == 360.0
+    assert rl.parse_duration("20ms") == pytest.approx(0.02)
+    assert rl.parse_duration("1.5") == 1.5
+    assert rl.parse_duration("soon") is None
+
+
+def test_reservation_beyond_max_delay_is_not_debited():
+    limiter = rl.RateLimiter()
+    limiter.observe("m", 200, {
+        "x-ratelimit-limit-requests": "60",
+        "x-ratelimit-remaining-requests": "1",
+    })
+    assert limiter.reserve("m", 0, max_delay=0.1) == 0.0  # takes the last request
+    # Callers that give up do not push the queue further back
+    waits = [limiter.reserve("m", 0, max_delay=0.1) for _ in range(3)]
+    assert all(w == pytest.approx(waits[0], abs=0.05) for w in waits)
+    assert 0.9 <= waits[0] <= 1.1
+    assert limiter.stats()["throttled"] == 0
+
+
+def _paused(limiter, seconds):
+    limiter.observe("m", 429, {"retry-after": str(seconds)})
+    return limiter.stats()["exhausted"]
+
+
+def test_stream_beyond_deadline_is_not_debited(limiter):
+    client = local_client.AsyncLocalOpenAIClient(pool_size=1, api_key="k")
+    exhausted = _paused(limiter, 3)
+
+    async def run():
+        with rl.deadline_scope(0.1):
+            return [event async for event in client.chat_stream(model="m")]
+
+    events = asyncio.run(run())
+    assert events[0]["status"] == "rate_limited"
+    assert limiter.stats()["exhausted"] == exhausted + 1
+    assert limiter.stats()["throttled"] == 0
+
+
+def test_sdk_client_checks_deadline_before_reserving(limiter, monkeypatch):
+    from clients import model_client
+
+    monkeypatch.setattr(model_client, "rate_limiter", limiter)
+    seen = []
+    monkeypatch.setattr(limiter, "reserve", lambda model, tokens, max_delay=None: seen.append(
+        (tokens, max_delay)) or 3.0)
+    client = model_client.SDKClient(api_key="k")
+    messages = [{"role": "user", "content": "hello " * 40}]
+
+    with rl.deadline_scope(0.1):
+        resp = client.chat("m", messages, max_tokens=50)
+    assert resp["status"] == "rate_limited"
+    tokens, max_delay = seen[0]
+    assert tokens == rl.estimate_tokens(messages, 50) > 0
+    assert max_delay <= 0.1
@@ -0,0 +1,47 @@
+import json
+import os
+
+import pytest
+
+from core.registry import RegistryCache, get_registry
+
+
+def _write(path, data, mtime_ns):
+    path.write_text(json.dumps(data))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_routes_index_follows_routing_order():
+    registry = get_registry()
+    names = [name for name, _ in registry.agents_for("write_scroll")]
+    assert names == ["AVOT-Quill"]
+    assert registry.agents_for("unknown") == ()
+    assert registry.agent("AVOT-Guardian")["temperature"] == 0.0
+
+
+def test_compiled_registry_is_immutable():
+    cfg = get_registry().agent("AVOT-Guardian")
+    with pytest.raises(TypeError):
+        cfg["model"] = "other"
+
+
+def test_cache_recompiles_only_on_change(tmp_path):
+    path = tmp_path / "registry.json"
+    data = {"agents": [{"name": "A", "model": "m"}], "routing": {"x": ["A"]}}
+    _write(path, data, 1_000_000_000)
+
+    cache = RegistryCache(path)
+    first = cache.get()
+    assert cache.get() is first
+
+    # Touched but unchanged content keeps the compiled object
+    _write(path, data, 2_000_000_000)
+    assert cache.get() is first
+
+    data["routing"]["y"] = ["A"]
+    _write(path, data, 3_000_000_000)
+    second = cache.get()
+    assert second is not first
+    assert second.agents_for("y")[0][0] == "A"
+
+    assert cache.reload() is not second
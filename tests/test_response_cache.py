@@ -0,0 +1,77 @@
+import pytest
+
+from core import openai_bridge
+from core import response_cache as cache_module
+from core.response_cache import ResponseCache
+
+
+class _CountingClient:
+    def __init__(self, response=None):
+        self.calls = 0
+        self.response = response or {"choices": [{"message": {"content": "hi"}}]}
+
+    def chat(self, **_kwargs):
+        self.calls += 1
+        return self.response
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake = _CountingClient()
+    monkeypatch.setattr(openai_bridge, "get_client", lambda: fake)
+    monkeypatch.setattr(cache_module, "response_cache", ResponseCache(max_entries=8, ttl=60))
+    return fake
+
+
+MESSAGES = [{"role": "user", "content": "same"}]
+
+
+def test_deterministic_calls_are_cached(client):
+    assert openai_bridge.run_chat("m", MESSAGES, temperature=0.0) == "hi"
+    assert openai_bridge.run_chat("m", MESSAGES, temperature=0.0) == "hi"
+    assert client.calls == 1
+    assert cache_module.cache_stats()["hits"] == 1
+
+
+def test_sampled_calls_skip_cache_unless_opted_in(client):
+    openai_bridge.run_chat("m", MESSAGES, temperature=0.2)
+    openai_bridge.run_chat("m", MESSAGES, temperature=0.2)
+    assert client.calls == 2
+
+    openai_bridge.run_chat("m", MESSAGES, temperature=0.2, cache=True)
+    openai_bridge.run_chat("m", MESSAGES, temperature=0.2, cache=True)
+    assert client.calls == 3
+
+
+def test_cache_bypass_and_errors_not_stored(client):
+    openai_bridge.run_chat("m", MESSAGES, temperature=0.0, cache=False)
+    openai_bridge.run_chat("m", MESSAGES, temperature=0.0, cache=False)
+    assert client.calls == 2
+
+    client.response = {"error": True, "status": 500, "content": "boom"}
+    openai_bridge.run_chat("m", MESSAGES, temperature=0.0, max_tokens=5)
+    openai_bridge.run_chat("m", MESSAGES, temperature=0.0, max_tokens=5)
+    assert client.calls == 4
+
+
+def test_lru_eviction_and_ttl():
+    cache = ResponseCache(max_entries=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+
+    expired = ResponseCache(ttl=-1)
+    expired.put("a", 1)
+    assert expired.get("a") == (False, None)
+
+
+def test_sqlite_tier_survives_new_instance(tmp_path):
+    db = tmp_path / "cache.sqlite"
+    ResponseCache(ttl=60, db_path=db).put("k", "value")
+
+    fresh = ResponseCache(ttl=60, db_path=db)
+    assert fresh.get("k") == (True, "value")
+    assert fresh.stats()["disk_hits"] == 1
@@ -0,0 +1,141 @@
+import importlib.util
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+ADAPTERS = REPO_ROOT / "avot-core" / "adapters"
+sys.path.insert(0, str(ADAPTERS))
+
+from signal_aggregates import SignalAggregates  # noqa: E402
+from signal_ledger import SignalLedger  # noqa: E402
+
+HEADER = """signal_ledger:
+  ledger_id: SIGNAL-LEDGER-TEST
+  status: active
+  signals:
+    - signal_id: SIG-LEGACY-1
+      avot_id: AVOT-ARCHIVIST
+      signal_type: scope_refusal
+      severity: low
+"""
+
+NOW = datetime(2026, 1, 1, 12, 30, tzinfo=timezone.utc).timestamp()
+
+
+def _signal(avot_id, signal_type, minutes_ago, severity="low"):
+    stamp = datetime.fromtimestamp(NOW - minutes_ago * 60, timezone.utc)
+    return {"avot_id": avot_id, "signal_type": signal_type, "severity": severity,
+            "timestamp": stamp.isoformat().replace("+00:00", "Z")}
+
+
+def test_sliding_tumbling_and_severity_windows():
+    agg = SignalAggregates()
+    for minutes_ago, severity in [(1, "high"), (3, "low"), (20, "low"), (70, "medium"), (200, "low")]:
+        agg.observe(_signal("AVOT-GUARDIAN", "scope_refusal", minutes_ago, severity))
+    agg.observe(_signal("AVOT-QUILL", "tick", 2))
+    agg.observe({"avot_id": "AVOT-QUILL", "signal_type": "tick"})  # untimed: totals only
+
+    assert agg.sliding(300, now=NOW) == {("AVOT-GUARDIAN", "scope_refusal"): 2, ("AVOT-QUILL", "tick"): 1}
+    assert agg.sliding(3600, by=("avot_id",), now=NOW, signal_type="scope_refusal") == {"AVOT-GUARDIAN": 3}
+    assert agg.severity_histogram(3600, now=NOW) == {"high": 1, "low": 3}
+    assert agg.severity_histogram(avot_id="AVOT-GUARDIAN") == {"high": 1, "low": 3, "medium": 1}
+    assert agg.totals() == {("AVOT-GUARDIAN", "scope_refusal"): 5, ("AVOT-QUILL", "tick"): 2}
+
+    hours = agg.tumbling(3600, periods=4, now=NOW, avot_id="AVOT-GUARDIAN")
+    assert [h["start"] for h in hours] == [f"2026-01-01T{h:02d}:00:00Z" for h in (9, 10, 11, 12)]
+    assert [h["count"] for h in hours] == [1, 0, 1, 3]
+    with pytest.raises(ValueError):
+        agg.tumbling(90)
+
+    summary = agg.summary(now=NOW)
+    guardian = summary["recent"][0]
+    assert (guardian["avot_id"], guardian["last_300s"], guardian["last_3600s"]) == ("AVOT-GUARDIAN", 2, 3)
+    assert (guardian["previous_3600s"], guardian["trend"]) == (1, "rising")
+    assert summary["signals_total"] == 7
+
+
+def test_old_buckets_expire():
+    agg = SignalAggregates(bucket_seconds=60, retention=600)
+    agg.observe(_signal("AVOT-A", "tick", 30))
+    agg.observe(_signal("AVOT-A", "tick", 0))
+    assert agg.sliding(3600, now=NOW) == {("AVOT-A", "tick"): 1}
+    agg.observe(_signal("AVOT-A", "tick", 40))  # already past retention
+    assert agg.sliding(3600, now=NOW) == {("AVOT-A", "tick"): 1}
+    assert agg.totals() == {("AVOT-A", "tick"): 3}
+
+
+def test_ledger_refresh_and_snapshot_resume(tmp_path):
+    ledger_path = tmp_path / "signal_ledger.yaml"
+    ledger_path.write_text(HEADER)
+    ledger = SignalLedger(str(ledger_path), fsync="never")
+    ledger.append_signal("AVOT-GUARDIAN", "scope_refusal", "one", severity="high")
+
+    snapshot = tmp_path / "aggregates.json"
+    agg = SignalAggregates(ledger, snapshot_path=str(snapshot)).refresh()
+    assert agg.totals() == {("AVOT-ARCHIVIST", "scope_refusal"): 1, ("AVOT-GUARDIAN", "scope_refusal"): 1}
+    assert agg.sliding(300) == {("AVOT-GUARDIAN", "scope_refusal"): 1}  # legacy signal is untimed
+
+    ledger.append_signal("AVOT-GUARDIAN", "scope_refusal", "two")
+    assert agg.refresh().totals(by=("avot_id",)) == {"AVOT-ARCHIVIST": 1, "AVOT-GUARDIAN": 2}
+    agg.snapshot()
+
+    ledger.append_signal("AVOT-QUILL", "tick", "three")
+    resumed = SignalAggregates(SignalLedger(str(ledger_path)), snapshot_path=str(snapshot))
+    assert resumed.totals(by=("avot_id",)) == {"AVOT-ARCHIVIST": 1, "AVOT-GUARDIAN": 2}
+    assert resumed.refresh().totals(by=("avot_id",)) == agg.refresh().totals(by=("avot_id",))
+    assert resumed.severity_histogram() == {"low": 3, "high": 1}
+
+    # A snapshot that no longer matches the ledger is recounted from scratch
+    other = tmp_path / "other.yaml"
+    other.write_text(HEADER)
+    recount = SignalAggregates(SignalLedger(str(other)), snapshot_path=str(snapshot)).refresh()
+    assert recount.totals() == {("AVOT-ARCHIVIST", "scope_refusal"): 1}
+
+
+def test_module_imports_on_its_own():
+    code = (
+        "import importlib.util, sys\n"
+        f"spec = importlib.util.spec_from_file_location('signal_aggregates', {str(ADAPTERS / 'signal_aggregates.py')!r})\n"
+        "module = importlib.util.module_from_spec(spec)\n"
+        "spec.loader.exec_module(module)\n"
+        "assert module.SignalLedger is sys.modules['signal_ledger'].SignalLedger\n"
+        "assert module.epoch_seconds('1970-01-01T00:01:00Z') == 60.0\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=str(REPO_ROOT.parent))
+
+
+def test_emit_signal_feeds_aggregates():
+    spec = importlib.util.spec_from_file_location("avot_base", REPO_ROOT / "AVOT-core" / "avot_base.py")
+    avot_base = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(avot_base)
+
+    agg = SignalAggregates()
+    avot = avot_base.AvotBase("AVOT-GUARDIAN", {}, {}, aggregates=agg)
+    avot.emit_signal("scope_refusal", {"severity": "medium"})
+    avot.emit_signal("scope_refusal")
+    assert agg.sliding(300) == {("AVOT-GUARDIAN", "scope_refusal"): 2}
+    assert agg.severity_histogram() == {"medium": 1, None: 1}
+
+
+def test_cycle_report_includes_signal_trends(tmp_path, monkeypatch):
+    from core import tcop
+
+    ledger_path = tmp_path / "signal_ledger.yaml"
+    ledger_path.write_text(HEADER)
+    SignalLedger(str(ledger_path)).append_signal("AVOT-GUARDIAN", "scope_refusal", "now")
+    monkeypatch.setattr(tcop, "LEDGER_PATH", ledger_path)
+    monkeypatch.setattr(tcop, "generate_snapshot", lambda: {})
+    sent = []
+    monkeypatch.setattr(tcop, "run_chat", lambda **kw: sent.append(kw) or '{"summary": "ok"}')
+
+    path_before = list(sys.path)
+    report = tcop.generate_cycle_report()
+    assert report["summary"] == "ok"
+    assert sys.path == path_before
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["signal_ledger.segments", "signal_ledger.yaml"]
+    assert report["signal_trends"]["recent"][0]["avot_id"] == "AVOT-GUARDIAN"
+    assert '"signal_trends"' in sent[0]["messages"][1]["content"]
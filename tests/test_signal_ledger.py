@@ -0,0 +1,322 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "avot-core" / "adapters"))
+
+from signal_ledger import SignalLedger, SignalLedgerError  # noqa: E402
+
+HEADER = """signal_ledger:
+  ledger_id: SIGNAL-LEDGER-TEST
+  status: active
+  governed_by:
+    - kernel.md
+  signals:
+    - signal_id: SIG-LEGACY-1
+      avot_id: AVOT-ARCHIVIST
+      signal_type: scope_refusal
+      severity: low
+"""
+
+
+@pytest.fixture
+def ledger_path(tmp_path):
+    path = tmp_path / "signal_ledger.yaml"
+    path.write_text(HEADER)
+    return path
+
+
+def test_append_keeps_yaml_header_and_legacy_signals(ledger_path):
+    with SignalLedger(str(ledger_path)) as ledger:
+        signal = ledger.append_signal("AVOT-GUARDIAN", "scope_refusal", "Refused.", severity="medium")
+
+    assert ledger_path.read_text() == HEADER  # never rewritten
+    reopened = SignalLedger(str(ledger_path))
+    signals = reopened.read_signals()
+    assert [s["signal_id"] for s in signals] == ["SIG-LEGACY-1", signal["signal_id"]]
+    assert signals[1]["severity"] == "medium"
+    assert reopened.header() == {
+        "ledger_id": "SIGNAL-LEDGER-TEST", "status": "active", "governed_by": ["kernel.md"],
+    }
+
+
+def test_segments_rotate(ledger_path):
+    with SignalLedger(str(ledger_path), fsync="never", segment_max_bytes=600) as ledger:
+        ids = [ledger.append_signal("AVOT-X", "tick", f"n={i}")["signal_id"] for i in range(10)]
+
+    segments = sorted((ledger_path.parent / "signal_ledger.segments").iterdir())
+    assert len(segments) > 1
+    assert all(p.stat().st_size <= 600 for p in segments)
+    assert [s["signal_id"] for s in SignalLedger(str(ledger_path)).read_signals()[1:]] == ids
+
+
+def test_torn_tail_is_skipped_and_sealed(ledger_path):
+    with SignalLedger(str(ledger_path)) as ledger:
+        first = ledger.append_signal("AVOT-X", "tick", "one")
+    segment = ledger_path.parent / "signal_ledger.segments" / "segment-000001.jsonl"
+    with segment.open("ab") as f:
+        f.write(b'{"signal_id": "SIG-TORN", "avot')  # crash mid-append
+
+    ledger = SignalLedger(str(ledger_path))
+    assert [s["signal_id"] for s in ledger.read_signals()][1:] == [first["signal_id"]]
+    second = ledger.append_signal("AVOT-X", "tick", "two")
+    ledger.close()
+    ids = [s["signal_id"] for s in SignalLedger(str(ledger_path)).read_signals()]
+    assert ids[1:] == [first["signal_id"], second["signal_id"]]
+
+
+def test_invalid_ledger_and_policy(tmp_path, ledger_path):
+    bad = tmp_path / "bad.yaml"
+    bad.write_text("something_else: {}\n")
+    with pytest.raises(SignalLedgerError):
+        SignalLedger(str(bad)).append_signal("AVOT-X", "tick", "x")
+    with pytest.raises(SignalLedgerError):
+        SignalLedger(str(ledger_path), fsync="sometimes")
+    with pytest.raises(SignalLedgerError):
+        SignalLedger(str(tmp_path / "missing.yaml"))
+
+
+def _hammer(path, writer, count, threads=1, segment_max_bytes=None):
+    import threading
+
+    ledger = SignalLedger(path, fsync="never", segment_max_bytes=segment_max_bytes)
+
+    def run(thread):
+        for i in range(count):
+            ledger.append_signal("AVOT-X", "tick", f"{writer}:{thread}:{i}")
+
+    workers = [threading.Thread(target=run, args=(t,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    ledger.close()
+
+
+def _assert_complete(ledger_path, expected):
+    signals = SignalLedger(str(ledger_path)).read_signals()[1:]
+    assert len(signals) == expected
+    assert len({s["signal_id"] for s in signals}) == expected
+    last = {}
+    for s in signals:  # each writer's appends stay in order
+        writer, i = s["description"].rsplit(":", 1)
+        assert int(i) == last.get(writer, -1) + 1
+        last[writer] = int(i)
+
+
+def test_threads_share_group_commits(ledger_path, monkeypatch):
+    import threading
+
+    ledger = SignalLedger(str(ledger_path), fsync="always")
+    writes = []
+    real = ledger._write_records
+    gate = threading.Event()
+
+    def slow_write(data):
+        writes.append(data.count(b"\n"))
+        gate.wait(1)  # hold the first write so the others queue behind it
+        real(data)
+
+    monkeypatch.setattr(ledger, "_write_records", slow_write)
+    threads = [
+        threading.Thread(target=ledger.append_signal, args=("AVOT-X", "tick", f"t{i}:0"))
+        for i in range(20)
+    ]
+    for t in threads:
+        t.start()
+    while not writes:
+        time.sleep(0.001)
+    gate.set()
+    for t in threads:
+        t.join()
+    ledger.close()
+
+    assert sum(writes) == 20
+    assert len(writes) < 20  # queued appends were committed together
+    _assert_complete(ledger_path, 20)
+
+
+def test_processes_and_threads_lose_nothing(ledger_path):
+    import multiprocessing
+
+    ctx = multiprocessing.get_context("fork")
+    procs = [
+        ctx.Process(target=_hammer, args=(str(ledger_path), w, 50, 4, 2048)) for w in range(4)
+    ]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+        assert p.exitcode == 0
+    _assert_complete(ledger_path, 4 * 4 * 50)
+    segments = list((ledger_path.parent / "signal_ledger.segments").glob("segment-*.jsonl"))
+    assert len(segments) > 1
+
+
+def test_append_signals_commits_a_batch(ledger_path):
+    with SignalLedger(str(ledger_path)) as ledger:
+        created = ledger.append_signals(
+            {"avot_id": "AVOT-X", "signal_type": "tick", "description": f"b:{i}"} for i in range(5)
+        )
+    assert [s["signal_id"] for s in SignalLedger(str(ledger_path)).read_signals()[1:]] == [
+        s["signal_id"] for s in created
+    ]
+
+
+def _seed(ledger_path):
+    ledger = SignalLedger(str(ledger_path), fsync="never", segment_max_bytes=1500)
+    rows = []
+    for i in range(30):
+        rows.append({
+            "avot_id": f"AVOT-{'ABC'[i % 3]}",
+            "signal_type": "scope_refusal" if i % 2 else "tick",
+            "severity": ["low", "medium", "high"][i % 3 == 0 and 2 or i % 2],
+            "description": f"q:{i}",
+            "metadata": {"i": i},
+        })
+    ledger.append_signals(rows[:10])
+    for row in rows[10:]:
+        ledger.append_signal(**row)
+    return ledger
+
+
+def test_query_filters_and_paginates(ledger_path):
+    ledger = _seed(ledger_path)
+    expected = [s for s in ledger.read_signals()
+                if s["avot_id"] == "AVOT-B" and s["signal_type"] == "scope_refusal"]
+    assert expected
+
+    pages, cursor = [], None
+    while True:
+        page = ledger.query(avot_id="AVOT-B", signal_type="scope_refusal", limit=2, cursor=cursor)
+        pages.append(page["signals"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert [s for p in pages for s in p] == expected
+    assert all(len(p) == 2 for p in pages[:-1])
+
+    assert ledger.count(avot_id="AVOT-B", signal_type="scope_refusal") == len(expected)
+    assert ledger.count(signal_type="scope_refusal") == 15 + 1  # plus the legacy signal
+    assert ledger.count(severity=["high", "medium"]) == sum(
+        1 for s in ledger.read_signals() if s.get("severity") in ("high", "medium"))
+    assert ledger.query(avot_id="AVOT-NOBODY")["signals"] == []
+
+    newest = ledger.query(avot_id="AVOT-A", limit=3, newest_first=True)["signals"]
+    assert [s["metadata"]["i"] for s in newest] == [27, 24, 21]
+    with pytest.raises(SignalLedgerError):
+        ledger.query(cursor="SIG-missing")
+
+
+def test_query_time_range_and_streaming(ledger_path):
+    ledger = _seed(ledger_path)
+    signals = ledger.read_signals()[1:]
+    middle = signals[15]["timestamp"]
+    after = list(ledger.iter_query(since=middle, page_size=4))
+    assert after == [s for s in signals if s["timestamp"] >= middle]
+    assert ledger.count(until=middle) == sum(1 for s in signals if s["timestamp"] < middle)
+
+
+def test_index_catches_up_with_other_writers(ledger_path):
+    reader = _seed(ledger_path)
+    assert reader.count(avot_id="AVOT-C") == 10
+    scanned = len(reader.index())
+
+    with SignalLedger(str(ledger_path), fsync="never") as other:
+        other.append_signal("AVOT-C", "scope_refusal", "from another writer")
+    assert reader.count(avot_id="AVOT-C") == 11
+    assert len(reader.index()) == scanned + 1
+    last = reader.query(avot_id="AVOT-C", newest_first=True, limit=1)["signals"][0]
+    assert last["description"] == "from another writer"
+
+
+def test_missing_fields_do_not_match_the_string_none(tmp_path):
+    path = tmp_path / "signal_ledger.yaml"
+    path.write_text(HEADER + "    - signal_id: SIG-LEGACY-2\n      signal_type: tick\n")
+    ledger = SignalLedger(str(path), fsync="never")
+    ledger.append_signal("None", "tick", "a real 'None' value", severity="None")
+
+    assert [s["description"] for s in ledger.query(avot_id="None")["signals"]] == ["a real 'None' value"]
+    assert ledger.count(avot_id="None") == ledger.count(severity="None") == 1
+    assert ledger.count(signal_type="tick") == 2
+    assert None in ledger.index().values["avot_id"]
+
+
+def _append_later(ledger_path, rows, delay=0.05):
+    def run():
+        with SignalLedger(str(ledger_path), fsync="never") as writer:
+            for row in rows:
+                time.sleep(delay)
+                writer.append_signal(**row)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+@pytest.mark.parametrize("watch", ["auto", "poll"])
+def test_follow_streams_new_matching_signals(ledger_path, watch):
+    reader = SignalLedger(str(ledger_path))
+    reader.append_signal("AVOT-A", "scope_refusal", "before follow")
+    follower = reader.follow(signal_type="scope_refusal", watch=watch,
+                             poll_interval=0.05, idle_timeout=2)
+    assert follower.uses_inotify == (watch == "auto" and sys.platform.startswith("linux"))
+
+    rows = [{"avot_id": "AVOT-A", "signal_type": kind, "description": f"live:{i}"}
+            for i, kind in enumerate(["tick", "scope_refusal", "tick", "scope_refusal"])]
+    writer = _append_later(ledger_path, rows)
+    seen = []
+    for signal in follower:
+        seen.append(signal["description"])
+        if len(seen) == 2:
+            follower.stop()
+    writer.join()
+    assert seen == ["live:1", "live:3"]
+
+
+def test_follow_resumes_from_cursor_and_ends_when_idle(ledger_path):
+    ledger = SignalLedger(str(ledger_path), fsync="never")
+    first = ledger.append_signal("AVOT-A", "tick", "one")
+    ledger.append_signal("AVOT-B", "tick", "two")
+    ledger.append_signal("AVOT-A", "tick", "three")
+
+    follower = ledger.follow(avot_id="AVOT-A", cursor=first["signal_id"], idle_timeout=0.1)
+    assert [s["description"] for s in follower] == ["three"]
+    assert follower.cursor == ledger.read_signals()[-1]["signal_id"]
+
+    everything = ledger.follow(from_start=True, idle_timeout=0)
+    assert [s["signal_id"] for s in everything] == [s["signal_id"] for s in ledger.read_signals()]
+    with pytest.raises(SignalLedgerError):
+        ledger.follow(cursor="SIG-missing")
+
+
+def test_follow_async(ledger_path):
+    ledger = SignalLedger(str(ledger_path))
+
+    async def consume():
+        follower = ledger.follow(severity="high", poll_interval=0.05, idle_timeout=2)
+        rows = [{"avot_id": "AVOT-G", "signal_type": "alert", "severity": sev, "description": sev}
+                for sev in ("low", "high")]
+        writer = _append_later(ledger_path, rows)
+        async for signal in follower:
+            follower.stop()
+            await asyncio.to_thread(writer.join)
+            return signal["description"]
+
+    assert asyncio.run(consume()) == "high"
+
+
+def test_open_writer_seals_tail_torn_by_another_writer(ledger_path):
+    ledger = SignalLedger(str(ledger_path), fsync="never")
+    first = ledger.append_signal("AVOT-A", "tick", "before")
+    segment = ledger._segment
+
+    with open(segment, "ab") as f:  # another process crashed mid-append
+        f.write(b'{"signal_id": "SIG-TORN", "avot_')
+    second = ledger.append_signal("AVOT-A", "tick", "after")
+
+    ids = [s["signal_id"] for s in SignalLedger(str(ledger_path)).read_signals()]
+    assert ids == ["SIG-LEGACY-1", first["signal_id"], second["signal_id"]]
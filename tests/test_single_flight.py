@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core import openai_bridge
+from core import single_flight as flight_module
+from core.single_flight import SingleFlight
+
+
+class _SlowClient:
+    def __init__(self):
+        self.calls = 0
+
+    def chat(self, **_kwargs):
+        self.calls += 1
+        time.sleep(0.1)
+        return {"choices": [{"message": {"content": "shared"}}]}
+
+
+class _SlowAsyncClient:
+    def __init__(self):
+        self.calls = 0
+
+    async def chat(self, **_kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.1)
+        return {"choices": [{"message": {"content": "shared"}}]}
+
+
+MESSAGES = [{"role": "user", "content": "describe_system"}]
+
+
+@pytest.fixture
+def flight(monkeypatch):
+    group = SingleFlight()
+    monkeypatch.setattr(flight_module, "single_flight", group)
+    return group
+
+
+def test_concurrent_identical_threads_share_one_call(monkeypatch, flight):
+    client = _SlowClient()
+    monkeypatch.setattr(openai_bridge, "get_client", lambda: client)
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(openai_bridge.run_chat("m", MESSAGES, temperature=0.7))
+        )
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ["shared"] * 5
+    assert client.calls == 1
+    assert flight.stats()["coalesced"] == 4
+
+
+def test_concurrent_identical_tasks_share_one_call(monkeypatch, flight):
+    client = _SlowAsyncClient()
+    monkeypatch.setattr(openai_bridge, "get_async_client", lambda: client)
+
+    async def run():
+        return await asyncio.gather(
+            *(openai_bridge.run_chat_async("m", MESSAGES, temperature=0.7) for _ in range(5))
+        )
+
+    assert asyncio.run(run()) == ["shared"] * 5
+    assert client.calls == 1
+    assert flight.stats() == {"executed": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_cancelling_one_waiter_keeps_shared_call_alive(flight):
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def run():
+        first = asyncio.ensure_future(flight.do_async("k", slow))
+        second = asyncio.ensure_future(flight.do_async("k", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "done"
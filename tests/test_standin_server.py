@@ -0,0 +1,98 @@
+import asyncio
+import json
+import random
+
+import pytest
+
+import avot_engine
+import clients.local_openai_client as local_client
+from clients.http_pool import SyncConnectionPool
+from clients.standin_server import StandinServer, latency_sampler
+
+
+def _post(server, body):
+    pool = SyncConnectionPool(1)
+    try:
+        status, text, headers = pool.post(
+            server.base_url + "/chat/completions",
+            {"Content-Type": "application/json"},
+            json.dumps(body),
+        )
+    finally:
+        pool.close()
+    return status, text, headers
+
+
+def test_latency_sampler_specs():
+    rng = random.Random(1)
+    assert latency_sampler(None)() == 0.0
+    assert latency_sampler("0.25")() == 0.25
+    samples = [latency_sampler("uniform:0.1,0.2", rng)() for _ in range(50)]
+    assert all(0.1 <= s <= 0.2 for s in samples)
+    assert latency_sampler("normal:-5,0.1", rng)() == 0.0
+    with pytest.raises(ValueError):
+        latency_sampler("pareto:1")
+
+
+def test_error_injection():
+    with StandinServer(rate_429=1.0) as server:
+        status, _, headers = _post(server, {"model": "m", "messages": []})
+    assert status == 429
+    assert headers["retry-after-ms"] == "50"
+    assert server.stats["injected_429"] == 1
+
+
+def test_record_then_replay(tmp_path):
+    fixtures = tmp_path / "fixtures.jsonl"
+    body = {"model": "m", "messages": [{"role": "user", "content": "hi"}], "temperature": 0}
+
+    with StandinServer(words=5) as upstream:
+        with StandinServer(upstream=upstream.base_url, record=str(fixtures)) as recorder:
+            _, recorded, _ = _post(recorder, body)
+    assert recorder.stats["recorded"] == 1
+
+    with StandinServer(replay=str(fixtures), words=50) as replayer:
+        _, replayed, _ = _post(replayer, body)
+    assert replayer.stats["replayed"] == 1
+    assert json.loads(replayed)["choices"] == json.loads(recorded)["choices"]
+
+
+def test_upstream_errors_pass_through_unrecorded(tmp_path):
+    fixtures = tmp_path / "fixtures.jsonl"
+    body = {"model": "m", "messages": [{"role": "user", "content": "hi"}], "temperature": 0}
+
+    with StandinServer(rate_500=1.0) as upstream:
+        with StandinServer(upstream=upstream.base_url, record=str(fixtures)) as recorder:
+            status, text, _ = _post(recorder, body)
+            stream_status, _, _ = _post(recorder, {**body, "stream": True})
+    assert (status, stream_status) == (500, 500)
+    assert json.loads(text) == {"error": {"message": "server error (injected)"}}
+    assert recorder.stats["recorded"] == 0 and not fixtures.exists()
+
+
+def test_streaming_with_usage(monkeypatch):
+    with StandinServer(words=9, chunk_words=2) as server:
+        monkeypatch.setattr(local_client, "CHAT_COMPLETIONS_URL", server.base_url + "/chat/completions")
+        client = local_client.AsyncLocalOpenAIClient(pool_size=1)
+
+        async def collect():
+            return [e async for e in client.chat_stream(model="m", messages=[{"role": "user", "content": "x"}])]
+
+        events = asyncio.run(collect())
+
+    text = "".join(e["choices"][0]["delta"]["content"] for e in events if e["choices"])
+    assert len(text.split(" ")) == 9
+    assert events[-1]["usage"]["completion_tokens"] == 9
+
+
+def test_handle_task_end_to_end(monkeypatch, fake_registry):
+    fake_registry({"write": ["Scribe"]})
+
+    with StandinServer(latency="uniform:0.001,0.01", guardian_score=0.8) as server:
+        monkeypatch.setattr(local_client, "CHAT_COMPLETIONS_URL", server.base_url + "/chat/completions")
+        monkeypatch.setattr(local_client, "_async_client", None)
+        result = avot_engine.handle_task({"intent": "write", "payload": "stand-in run"})
+
+    assert result["guardian"]["coherence_score"] == 0.8
+    assert "Suppressed" not in result["content"]
+    assert server.stats["requests"] == 2
@@ -0,0 +1,105 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import avot_engine
+import clients.local_openai_client as local_client
+from core import openai_bridge
+
+
+class _SSEHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        assert body["stream"] is True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for word in ["Hello", " ", "world"]:
+            event = {"choices": [{"delta": {"content": word}}]}
+            self._chunk(f"data: {json.dumps(event)}\n\n".encode())
+        self._chunk(b"data: [DONE]\n\n")
+        self._chunk(b"")
+
+    def _chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    def log_message(self, *_args):
+        pass
+
+
+def test_client_streams_sse_deltas(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SSEHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(
+        local_client,
+        "CHAT_COMPLETIONS_URL",
+        f"http://127.0.0.1:{server.server_port}/v1/chat/completions",
+    )
+    client = local_client.AsyncLocalOpenAIClient()
+    monkeypatch.setattr(openai_bridge, "get_async_client", lambda: client)
+
+    async def collect():
+        chunks = []
+        for _ in range(2):
+            async for chunk in openai_bridge.run_chat_stream_async("m", [], temperature=0.3):
+                chunks.append(chunk)
+        return chunks
+
+    try:
+        assert asyncio.run(collect()) == ["Hello", " ", "world"] * 2
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert client.pool_stats()["reused"] == 1
+
+
+def _patch_agents(monkeypatch, fake_registry, verdict):
+    async def stream(_cfg, _task):
+        for chunk in ["part1 ", "part2"]:
+            yield chunk
+
+    async def guardian(**_kwargs):
+        return json.dumps(verdict)
+
+    fake_registry({"single": ["A"]})
+    monkeypatch.setattr(avot_engine, "call_agent_stream_async", stream)
+    monkeypatch.setattr(avot_engine, "run_chat_async", guardian)
+
+
+APPROVE = {"coherence_score": 0.9, "ethics_ok": True, "summary": "ok"}
+VETO = {"coherence_score": 0.1, "ethics_ok": True, "summary": "incoherent"}
+
+
+def test_release_policy_streams_before_verdict(monkeypatch, fake_registry):
+    _patch_agents(monkeypatch, fake_registry, APPROVE)
+    events = list(avot_engine.handle_task_stream({"intent": "single"}, policy="release"))
+    kinds = [e["event"] for e in events]
+
+    assert kinds == ["chunk", "chunk", "agent_done", "merged", "guardian", "result"]
+    assert events[-1]["result"]["content"] == "part1 part2"
+
+
+def test_hold_policy_releases_after_approval(monkeypatch, fake_registry):
+    _patch_agents(monkeypatch, fake_registry, APPROVE)
+    kinds = [e["event"] for e in avot_engine.handle_task_stream({"intent": "single"})]
+
+    assert kinds == ["agent_done", "guardian", "chunk", "chunk", "merged", "result"]
+
+
+def test_hold_policy_drops_content_on_veto(monkeypatch, fake_registry):
+    _patch_agents(monkeypatch, fake_registry, VETO)
+    events = list(avot_engine.handle_task_stream({"intent": "single"}, policy="hold"))
+
+    assert [e["event"] for e in events] == ["agent_done", "guardian", "result"]
+    assert "part1" not in events[-1]["result"]["content"]
+
+
+def test_unknown_policy_rejected():
+    with pytest.raises(ValueError):
+        list(avot_engine.handle_task_stream({"intent": "single"}, policy="maybe"))